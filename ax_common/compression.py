@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import zlib
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+
+_ENCODERS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+}
+_DECODERS: dict[str, Callable[[bytes, int], bytes]] = {}
+# Raised for malformed, truncated or oversized request bodies.
+_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError, OSError, EOFError, zlib.error)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if zstandard is not None:
+    _ENCODERS["zstd"] = lambda data: zstandard.ZstdCompressor(level=3).compress(data)
+
+    def _zstd_decode(data: bytes, limit: int) -> bytes:
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            out = reader.read(limit + 1)
+        if len(out) > limit:
+            raise ValueError("Decompressed body exceeds limit")
+        return out
+
+    _DECODERS["zstd"] = _zstd_decode
+    _DECODE_ERRORS += (zstandard.ZstdError,)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+if brotli is not None:
+    _ENCODERS["br"] = lambda data: brotli.compress(data, quality=4)
+
+    def _brotli_decode(data: bytes, limit: int) -> bytes:
+        # Output is produced in bounded steps, so a small bomb stops near the
+        # limit instead of being expanded in full first.
+        decoder = brotli.Decompressor()
+        out = bytearray(decoder.process(data, output_buffer_limit=limit + 1))
+        while len(out) <= limit and not decoder.can_accept_more_data():
+            out += decoder.process(b"", output_buffer_limit=limit + 1 - len(out))
+        if len(out) > limit:
+            raise ValueError("Decompressed body exceeds limit")
+        if not decoder.is_finished():
+            raise ValueError("Truncated brotli body")
+        return bytes(out)
+
+    _DECODERS["br"] = _brotli_decode
+    _DECODE_ERRORS += (brotli.error,)
+
+
+def _gzip_decode(data: bytes, limit: int) -> bytes:
+    # Concatenated members decode to one body, as with gzip -d.
+    out = bytearray()
+    while True:
+        decoder = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        out += decoder.decompress(data, limit + 1 - len(out))
+        if len(out) > limit or decoder.unconsumed_tail:
+            raise ValueError("Decompressed body exceeds limit")
+        if not decoder.eof:
+            raise ValueError("Truncated gzip body")
+        data = decoder.unused_data
+        if not data:
+            return bytes(out)
+
+
+_DECODERS["gzip"] = _gzip_decode
+
+# Cheaper codecs first when the client accepts several with equal weight.
+_PREFERENCE = ("zstd", "br", "gzip")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    weights: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.strip().partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name] = weight
+    candidates = [
+        name for name in _PREFERENCE if name in _ENCODERS and weights.get(name, weights.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda name: weights.get(name, weights.get("*", 0.0)))
+
+
+def supported_encodings() -> list[str]:
+    return [name for name in _PREFERENCE if name in _ENCODERS]
+
+
+async def _run_codec(func: Callable, data: bytes, offload_bytes: int, *args) -> bytes:
+    if len(data) >= offload_bytes:
+        return await asyncio.to_thread(func, data, *args)
+    return func(data, *args)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int | None = None,
+        offload_size: int | None = None,
+        max_request_bytes: int | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size or int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+        self.offload_size = offload_size or int(os.getenv("COMPRESSION_OFFLOAD_BYTES", str(256 * 1024)))
+        self.max_request_bytes = max_request_bytes or int(
+            os.getenv("COMPRESSION_MAX_REQUEST_BYTES", str(16 * 1024 * 1024))
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "").strip().lower()
+        if content_encoding and content_encoding != "identity":
+            decoder = _DECODERS.get(content_encoding)
+            if decoder is None:
+                await _plain_response(send, 415, b'{"detail":"Unsupported Content-Encoding"}')
+                return
+            # A compressed body larger than the decompressed cap is refused
+            # before it is buffered in full.
+            compressed = await _read_body(receive, self.max_request_bytes)
+            if compressed is None:
+                await _plain_response(send, 413, b'{"detail":"Request body too large"}')
+                return
+            try:
+                body = await _run_codec(decoder, compressed, self.offload_size, self.max_request_bytes)
+            except _DECODE_ERRORS:
+                await _plain_response(send, 400, b'{"detail":"Request body could not be decompressed"}')
+                return
+            receive = _replay_receive(body, receive)
+
+        encoding = choose_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            response_headers = MutableHeaders(raw=start_message["headers"])
+            # Streaming bodies are forwarded untouched.
+            if message.get("more_body", False):
+                passthrough = True
+            elif len(body) >= self.minimum_size and "content-encoding" not in response_headers:
+                body = await _run_codec(_ENCODERS[encoding], body, self.offload_size)
+                response_headers["Content-Encoding"] = encoding
+                response_headers["Content-Length"] = str(len(body))
+                response_headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+async def _read_body(receive: Receive, max_bytes: int) -> bytes | None:
+    chunks: list[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_bytes:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, original: Receive) -> Receive:
+    sent = False
+
+    async def receive() -> Message:
+        nonlocal sent
+        if sent:
+            return await original()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return receive
+
+
+async def _plain_response(send: Send, status: int, body: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
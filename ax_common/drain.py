@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import itertools
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+DRAIN_RETRY_AFTER_MS = 1000
+
+
+class RunRegistry:
+    # In-flight runs of this process. Draining stops new runs from being
+    # admitted and takes the process out of rotation via /readyz, while the
+    # runs already started are left to finish for up to `grace_sec`.
+    def __init__(self, grace_sec: float = 30.0) -> None:
+        self.grace_sec = grace_sec
+        self.draining = False
+        self.drain_started_ms: int | None = None
+        self._ids = itertools.count()
+        self._runs: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    @contextmanager
+    def track(self, **fields: Any) -> Iterator[dict[str, Any]]:
+        # Callers may fill in fields on the yielded entry once they know them.
+        key = next(self._ids)
+        entry = {**fields, "_started": time.monotonic(), "started_ms": int(time.time() * 1000)}
+        self._runs[key] = entry
+        try:
+            yield entry
+        finally:
+            del self._runs[key]
+
+    def drain(self) -> None:
+        if not self.draining:
+            self.draining = True
+            self.drain_started_ms = int(time.time() * 1000)
+
+    def resume(self) -> None:
+        self.draining = False
+        self.drain_started_ms = None
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        runs = [
+            {
+                **{name: value for name, value in entry.items() if name != "_started"},
+                "elapsed_ms": int((now - entry["_started"]) * 1000),
+            }
+            for entry in list(self._runs.values())
+        ]
+        runs.sort(key=lambda run: run["elapsed_ms"], reverse=True)
+        return {
+            "draining": self.draining,
+            "drain_started_ms": self.drain_started_ms,
+            "grace_sec": self.grace_sec,
+            "inflight": len(runs),
+            "runs": runs,
+        }
+
+
+def drain_on_signal(registry: RunRegistry, signals: tuple[int, ...] = (signal.SIGTERM, signal.SIGINT)) -> None:
+    # uvicorn installs its exit handlers before running startup hooks. Chaining
+    # onto them drains the moment shutdown begins; the lifespan shutdown only
+    # runs once open connections have finished or the graceful timeout expired.
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in signals:
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+
+        def _handler(signum, frame, previous=previous) -> None:
+            registry.drain()
+            previous(signum, frame)
+
+        signal.signal(sig, _handler)
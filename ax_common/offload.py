@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from fastapi.responses import Response
+
+T = TypeVar("T")
+
+OFFLOAD_MIN_BYTES = int(os.getenv("OFFLOAD_MIN_BYTES", str(256 * 1024)))
+OFFLOAD_PROCESSES = int(os.getenv("OFFLOAD_PROCESSES", str(min(4, os.cpu_count() or 1))))
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+# Already-encoded JSON value that `render_json` splices in as is.
+class RawJSON(bytes):
+    pass
+
+
+def dump_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def render_json(content: Any) -> bytes:
+    if not isinstance(content, dict):
+        return dump_bytes(content)
+    parts = [
+        dump_bytes(key) + b":" + (value if isinstance(value, RawJSON) else dump_bytes(value))
+        for key, value in content.items()
+    ]
+    return b"{" + b",".join(parts) + b"}"
+
+
+# One pool per process, kept for the process lifetime; concurrent.futures
+# joins it at interpreter exit.
+def _pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(1, OFFLOAD_PROCESSES), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def _warm() -> None:
+    pool = _pool()
+    # Calling into this module makes each child import it now, not on first use.
+    for future in [pool.submit(render_json, {}) for _ in range(max(1, OFFLOAD_PROCESSES))]:
+        future.result()
+
+
+async def warm_pool() -> None:
+    # Spawning pool processes blocks the caller, so do it off the loop before
+    # the first large payload needs them. OFFLOAD_PROCESSES=0 disables the pool.
+    if OFFLOAD_PROCESSES < 1:
+        return
+    await asyncio.to_thread(_warm)
+
+
+# Threads suit pure-Python work (schema validation, building items) because the
+# GIL switches every few ms. json.loads/json.dumps hold the GIL for the whole
+# call, so large JSON work goes to the process pool instead.
+async def run_sized(size: int, func: Callable[..., T], *args: Any) -> T:
+    if size < OFFLOAD_MIN_BYTES:
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+async def run_cpu(size: int, func: Callable[..., T], *args: Any) -> T:
+    if size < OFFLOAD_MIN_BYTES or OFFLOAD_PROCESSES < 1:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(_pool(), func, *args)
+
+
+def estimate_size(value: Any, limit: int = OFFLOAD_MIN_BYTES) -> int:
+    # Rough JSON size, walked only until `limit` is reached so the estimate
+    # stays cheap for huge payloads.
+    total = 0
+    stack = [value]
+    while stack and total < limit:
+        item = stack.pop()
+        if isinstance(item, RawJSON):
+            # Spliced without re-encoding, so it costs a copy, not a dump.
+            total += 8
+        elif isinstance(item, (str, bytes)):
+            total += len(item) + 2
+        elif isinstance(item, dict):
+            total += 2 + 4 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            total += 2 + len(item)
+            stack.extend(item)
+        else:
+            total += 8
+    return total
+
+
+async def loads_sized(data: bytes) -> Any:
+    return await run_cpu(len(data), json.loads, data)
+
+
+async def json_response(content: Any, status_code: int = 200) -> Response:
+    body = await run_cpu(estimate_size(content), render_json, content)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+class LoopLagMonitor:
+    def __init__(self, interval_sec: float = 0.05, window: int = 1200) -> None:
+        self.interval_sec = interval_sec
+        self._samples: deque[float] = deque(maxlen=window)
+        self._max_ms = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_sec
+            await asyncio.sleep(self.interval_sec)
+            lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self._samples.append(lag_ms)
+            self._max_ms = max(self._max_ms, lag_ms)
+
+    def snapshot(self) -> dict[str, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "last_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(samples),
+            "last_ms": round(self._samples[-1], 2),
+            "p50_ms": round(samples[len(samples) // 2], 2),
+            "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2),
+            "max_ms": round(self._max_ms, 2),
+        }
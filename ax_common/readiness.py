@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+WarmupStep = Callable[[], Awaitable[str]]
+
+
+class Readiness:
+    # Liveness (/healthz) says the process is up; readiness (/readyz) says the
+    # warm-up finished and the process can take traffic without cold-start
+    # latency. Steps are retried until they pass or the deadline runs out; past
+    # the deadline the process reports ready anyway with the failing checks
+    # listed, so one dead dependency cannot keep the whole service out of
+    # rotation.
+    def __init__(self, timeout_sec: float = 30.0, retry_interval_sec: float = 0.5) -> None:
+        self.timeout_sec = timeout_sec
+        self.retry_interval_sec = retry_interval_sec
+        self.ready = False
+        self.checks: dict[str, dict[str, Any]] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self, steps: dict[str, WarmupStep]) -> None:
+        if self._task is None:
+            self.ready = False
+            self.checks = {name: {"ok": False, "detail": "pending", "attempts": 0} for name in steps}
+            self._task = asyncio.get_running_loop().create_task(self._run(steps))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _run(self, steps: dict[str, WarmupStep]) -> None:
+        deadline = time.monotonic() + self.timeout_sec
+        await asyncio.gather(*(self._run_step(name, step, deadline) for name, step in steps.items()))
+        self.ready = True
+
+    async def _run_step(self, name: str, step: WarmupStep, deadline: float) -> None:
+        started = time.perf_counter()
+        check = self.checks[name]
+        while True:
+            check["attempts"] += 1
+            try:
+                check["detail"] = await asyncio.wait_for(step(), timeout=max(0.1, deadline - time.monotonic()))
+                check["ok"] = True
+            except Exception as exc:
+                check["detail"] = f"{type(exc).__name__}: {exc}"
+            check["duration_ms"] = int((time.perf_counter() - started) * 1000)
+            if check["ok"] or time.monotonic() + self.retry_interval_sec >= deadline:
+                return
+            await asyncio.sleep(self.retry_interval_sec)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"ready": self.ready, "checks": {name: dict(check) for name, check in self.checks.items()}}
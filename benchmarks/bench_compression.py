@@ -0,0 +1,109 @@
+"""CPU cost vs. bytes saved for response compression on crawl-shaped outputs.
+
+Usage:
+    python benchmarks/bench_compression.py [--pages 200] [--page-bytes 20000]
+
+Codecs that are not installed (zstandard, brotli) are skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import time
+
+
+def _markdown_page(rng: random.Random, size: int) -> str:
+    words = [
+        "crawl", "gateway", "worker", "domain", "policy", "schema", "latency", "markdown",
+        "request", "response", "timeout", "upstream", "catalog", "envelope", "retry", "cache",
+    ]
+    nav = "[Home](/) | [Docs](/docs) | [Blog](/blog) | [Pricing](/pricing)\n\n"
+    parts = [nav, f"# {' '.join(rng.choices(words, k=4)).title()}\n\n"]
+    length = sum(len(p) for p in parts)
+    while length < size:
+        paragraph = " ".join(rng.choices(words, k=rng.randint(20, 60))) + f" {rng.randrange(10**6)}.\n\n"
+        parts.append(paragraph)
+        length += len(paragraph)
+    parts.append("\n---\n(c) Example Inc. All rights reserved.\n")
+    return "".join(parts)[:size]
+
+
+def _crawl_output(pages: int, page_bytes: int) -> bytes:
+    rng = random.Random(0)
+    output = {
+        "source_url": "https://example.com",
+        "items": [
+            {
+                "url": f"https://example.com/docs/{i}",
+                "title": f"Doc {i}",
+                "content": _markdown_page(rng, page_bytes),
+                "format": "markdown",
+            }
+            for i in range(pages)
+        ],
+        "stats": {"pages": pages},
+    }
+    return json.dumps({"ok": True, "meta": {"trace_id": "t", "tool_run_id": "r"}, "output": output}).encode("utf-8")
+
+
+def _codecs() -> list[tuple[str, callable, callable]]:
+    codecs = [
+        (f"gzip-{level}", lambda d, level=level: gzip.compress(d, compresslevel=level), gzip.decompress)
+        for level in (1, 6, 9)
+    ]
+    try:
+        import zstandard
+
+        for level in (1, 3, 10):
+            codecs.append(
+                (
+                    f"zstd-{level}",
+                    lambda d, level=level: zstandard.ZstdCompressor(level=level).compress(d),
+                    zstandard.ZstdDecompressor().decompress,
+                )
+            )
+    except ImportError:
+        pass
+    try:
+        import brotli
+
+        for quality in (1, 4, 9):
+            codecs.append((f"br-{quality}", lambda d, q=quality: brotli.compress(d, quality=q), brotli.decompress))
+    except ImportError:
+        pass
+    return codecs
+
+
+def _timed(func, data: bytes, repeat: int) -> tuple[bytes, float]:
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(data)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-bytes", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    body = _crawl_output(args.pages, args.page_bytes)
+    print(f"body: {len(body) / 1e6:.2f} MB ({args.pages} pages)")
+    print(f"{'codec':>8} {'ratio':>7} {'out MB':>8} {'comp ms':>9} {'decomp ms':>10} {'MB/s':>8}")
+    for name, compress, decompress in _codecs():
+        compressed, comp_s = _timed(compress, body, args.repeat)
+        _, decomp_s = _timed(decompress, compressed, args.repeat)
+        print(
+            f"{name:>8} {len(body) / len(compressed):>7.2f} {len(compressed) / 1e6:>8.2f} "
+            f"{comp_s * 1000:>9.1f} {decomp_s * 1000:>10.1f} {len(body) / comp_s / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
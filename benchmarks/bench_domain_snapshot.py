@@ -0,0 +1,99 @@
+"""Domain config load time: YAML, config cache and precompiled snapshot.
+
+Usage:
+    python benchmarks/bench_domain_snapshot.py [--tools 2000] [--runs 5] [--shared-schemas]
+
+Generates a domain with --tools tools by repeating the example tool, each
+with its own input schema file (identical contents with --shared-schemas), then times load_domain_config() three ways:
+parsing YAML (cache and snapshot off), a config cache hit, and loading a
+snapshot built with `python -m src.snapshot build`. Reports the median, for
+the config alone and including reading every schema, as warm-up does.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "gateway"))
+
+from src.manifest import build_domain_snapshot, load_domain_config, resolve_domain_paths  # noqa: E402
+from src.schemas import load_schema  # noqa: E402
+from src.snapshot import schema_refs  # noqa: E402
+
+EXAMPLE = ROOT / "domain" / "example_domain"
+
+
+def make_domain(path: Path, tools: int, shared_schemas: bool = False) -> None:
+    manifest = yaml.safe_load((EXAMPLE / "manifest.yaml").read_text(encoding="utf-8"))
+    template = manifest["tools"][0]
+    schema = json.loads((EXAMPLE / template["input_schema_ref"]).read_text(encoding="utf-8"))
+    (path / "schemas").mkdir(parents=True)
+    manifest["tools"] = []
+    for i in range(tools):
+        tool = dict(template, tool_id=f"firecrawl.crawl{i}", input_schema_ref=f"schemas/tool{i}_input.json")
+        tool.pop("output_schema_ref", None)
+        tool_schema = schema if shared_schemas else dict(schema, title=tool["tool_id"])
+        (path / tool["input_schema_ref"]).write_text(json.dumps(tool_schema), encoding="utf-8")
+        manifest["tools"].append(tool)
+    (path / "manifest.yaml").write_text(yaml.safe_dump(manifest, sort_keys=False), encoding="utf-8")
+    shutil.copy(EXAMPLE / "policies.yaml", path / "policies.yaml")
+
+
+def timed(runs: int) -> tuple[float, float]:
+    config, total = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        manifest, _policies = load_domain_config()
+        config.append((time.perf_counter() - started) * 1000)
+        domain_dir = resolve_domain_paths()[1].parent
+        for ref in schema_refs(manifest):
+            load_schema(domain_dir, ref)
+        total.append((time.perf_counter() - started) * 1000)
+    return statistics.median(config), statistics.median(total)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--shared-schemas", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        domain = Path(tmp) / "domain"
+        make_domain(domain, args.tools, args.shared_schemas)
+        snapshot = domain / "domain.snapshot"
+        os.environ["DOMAIN_MANIFEST_PATH"] = str(domain / "manifest.yaml")
+        os.environ["DOMAIN_POLICIES_PATH"] = str(domain / "policies.yaml")
+
+        os.environ["GATEWAY_DOMAIN_SNAPSHOT"] = "off"
+        os.environ["GATEWAY_CONFIG_CACHE_DIR"] = "off"
+        yaml_ms = timed(args.runs)
+
+        os.environ["GATEWAY_CONFIG_CACHE_DIR"] = str(Path(tmp) / "cache")
+        load_domain_config()
+        cache_ms = timed(args.runs)
+
+        os.environ["GATEWAY_CONFIG_CACHE_DIR"] = "off"
+        os.environ["GATEWAY_DOMAIN_SNAPSHOT"] = str(snapshot)
+        build_domain_snapshot(domain / "manifest.yaml", domain / "policies.yaml", snapshot)
+        snapshot_ms = timed(args.runs)
+
+        print(f"{args.tools} tools, snapshot {snapshot.stat().st_size / 1024:.0f} KiB")
+        print(f"{'source':<10} {'config ms':>10} {'with schemas ms':>16}")
+        for label, (config_ms, total_ms) in (("yaml", yaml_ms), ("cache", cache_ms), ("snapshot", snapshot_ms)):
+            print(f"{label:<10} {config_ms:>10.1f} {total_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Event-loop lag in the gateway while it handles multi-megabyte tool outputs.
+
+Usage:
+    python benchmarks/bench_event_loop_lag.py [--runs 20] [--pages 400]
+
+Runs the gateway app in-process against a fake worker whose response body has
+to be parsed, re-serialized and returned, once with everything inline and once
+with the size-aware offload enabled, and reports loop lag for each.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "gateway"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import src.main as gateway_main  # noqa: E402
+import ax_common.offload as shared_offload  # noqa: E402
+import src.offload as offload  # noqa: E402
+from fake_worker import fake_output  # noqa: E402
+
+
+async def _scenario(body: bytes, runs: int) -> tuple[dict[str, float], float]:
+    async def fake_call_worker(tool, payload, timeout_sec):
+        return 200, await offload.loads_envelope(body)
+
+    gateway_main.call_worker = fake_call_worker
+    await shared_offload.warm_pool()
+    monitor = shared_offload.LoopLagMonitor(interval_sec=0.005)
+    monitor.start()
+    transport = httpx.ASGITransport(app=gateway_main.app)
+    start = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway", timeout=120) as client:
+        await asyncio.gather(
+            *(
+                client.post(
+                    "/v1/tools/firecrawl.crawl:run",
+                    json={"input": {"url": "https://example.com"}},
+                    headers={"Accept-Encoding": "identity"},
+                )
+                for _ in range(runs)
+            )
+        )
+    elapsed = time.perf_counter() - start
+    # Let the monitor record the stall that ends with the last request.
+    await asyncio.sleep(monitor.interval_sec * 4)
+    await monitor.stop()
+    return monitor.snapshot(), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--page-bytes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    gateway_main.startup_load_domain()
+    gateway_main.app.state.policy.tool_limiters["firecrawl.crawl"] = asyncio.Semaphore(args.runs)
+    body = json.dumps(
+        {"ok": True, "meta": {}, "output": fake_output("https://example.com", args.pages, args.page_bytes)}
+    ).encode("utf-8")
+    print(f"worker body: {len(body) / 1e6:.1f} MB, runs: {args.runs}")
+    print(f"{'mode':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'total s':>8}")
+
+    threshold = shared_offload.OFFLOAD_MIN_BYTES
+    for mode, min_bytes in (("inline", 1 << 62), ("offload", threshold)):
+        shared_offload.OFFLOAD_MIN_BYTES = min_bytes
+        lag, elapsed = asyncio.run(_scenario(body, args.runs))
+        print(f"{mode:>8} {lag['p50_ms']:>8.1f} {lag['p99_ms']:>8.1f} {lag['max_ms']:>8.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Gateway throughput vs. number of gateway processes.
+
+Usage:
+    python benchmarks/bench_multiprocess_gateway.py [--processes 1,2,4] [--duration 10]
+
+Starts a fake worker and, for each process count, a gateway via `src.serve`
+with GATEWAY_WORKERS set. Concurrency limits are shared across processes by the
+limiter coordinator, so per_tool_max_inflight is set high enough not to be the
+bottleneck here.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Service did not become healthy: {url}")
+
+
+def _write_domain(tmp: Path, worker_port: int, inflight: int) -> tuple[Path, Path]:
+    manifest = tmp / "manifest.yaml"
+    policies = tmp / "policies.yaml"
+    manifest.write_text(
+        f"""domain_id: "bench_domain"
+version: "0.1"
+tools:
+  - tool_id: "fake.crawl"
+    kind: "service_worker"
+    display_name: "Fake Crawl"
+    description: "Fake crawl worker"
+    transport:
+      type: "http"
+      base_url: "http://127.0.0.1:{worker_port}"
+      endpoint: "/run"
+    timeout_sec: 30
+""",
+        encoding="utf-8",
+    )
+    policies.write_text(
+        f"""concurrency:
+  max_inflight: {inflight}
+  per_tool_max_inflight:
+    fake.crawl: {inflight}
+""",
+        encoding="utf-8",
+    )
+    return manifest, policies
+
+
+async def _load(base_url: str, duration: float, concurrency: int) -> tuple[int, int]:
+    done = 0
+    failed = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+
+        async def loop() -> None:
+            nonlocal done, failed
+            while time.monotonic() < stop_at:
+                resp = await client.post(
+                    "/v1/tools/fake.crawl:run", json={"input": {"url": "https://example.com"}}
+                )
+                if resp.status_code == 200 and resp.json().get("ok"):
+                    done += 1
+                else:
+                    failed += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return done, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", default="1,2,4")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    worker_port = _free_port()
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "fake_worker:app", "--app-dir", str(ROOT / "benchmarks"),
+         "--port", str(worker_port), "--workers", "4", "--log-level", "warning"],
+    )
+    try:
+        _wait_healthy(f"http://127.0.0.1:{worker_port}/healthz")
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest, policies = _write_domain(Path(tmp), worker_port, args.concurrency)
+            print(f"{'processes':>9} {'req/s':>10} {'failed':>7}")
+            for count in [int(p) for p in args.processes.split(",")]:
+                port = _free_port()
+                env = dict(
+                    os.environ,
+                    GATEWAY_HOST="127.0.0.1",
+                    GATEWAY_PORT=str(port),
+                    GATEWAY_WORKERS=str(count),
+                    PYTHONPATH=str(ROOT),
+                    DOMAIN_MANIFEST_PATH=str(manifest),
+                    DOMAIN_POLICIES_PATH=str(policies),
+                )
+                env.pop("GATEWAY_COORDINATOR_SOCKET", None)
+                gateway = subprocess.Popen(
+                    [sys.executable, "-m", "src.serve"], cwd=ROOT / "gateway", env=env,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+                try:
+                    _wait_healthy(f"http://127.0.0.1:{port}/healthz")
+                    done, failed = asyncio.run(_load(f"http://127.0.0.1:{port}", args.duration, args.concurrency))
+                    print(f"{count:>9} {done / args.duration:>10.1f} {failed:>7}")
+                finally:
+                    gateway.terminate()
+                    gateway.wait(timeout=30)
+    finally:
+        worker.terminate()
+        worker.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
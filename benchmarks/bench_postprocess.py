@@ -0,0 +1,110 @@
+"""Cost and payload savings of the Firecrawl worker's post-processing stage.
+
+Usage:
+    python benchmarks/bench_postprocess.py [--pages 1000,5000] [--page-bytes 6000] [--dup-ratio 0.2]
+
+Builds a synthetic crawl response (shared nav and footer blocks on every page,
+--dup-ratio of pages near-duplicates of an earlier one with a small edit) and
+runs `_parse_output` on it without post-processing, with each stage alone and
+with all of them. Reports wall time, output bytes, duplicates found against the
+known ones, and peak Python memory (tracemalloc, measured in a separate run).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tools.firecrawl.src.firecrawl_client import _parse_output  # noqa: E402
+from tools.firecrawl.src.postprocess import PostProcessConfig  # noqa: E402
+
+VOCABULARY = [f"term{i}" for i in range(3000)]
+NAV = "[Home](/) | [Docs](/docs) | [Blog](/blog) | [Pricing](/pricing) | [Sign in](/login)"
+SIDEBAR = "\n".join(f"- [Section {i}](/docs/section-{i})" for i in range(12))
+FOOTER = "---\n(c) Example Inc. All rights reserved. [Privacy](/privacy) | [Terms](/terms)"
+
+
+def _page(rng: random.Random, size: int) -> str:
+    parts = [NAV, SIDEBAR, f"# {' '.join(rng.choices(VOCABULARY, k=4))}"]
+    length = sum(len(part) for part in parts)
+    while length < size:
+        paragraph = " ".join(rng.choices(VOCABULARY, k=rng.randint(30, 90))) + "."
+        parts.append(paragraph)
+        length += len(paragraph)
+    parts.append(FOOTER)
+    return "\n\n".join(parts)
+
+
+def make_crawl(pages: int, page_bytes: int, dup_ratio: float) -> tuple[bytes, int]:
+    rng = random.Random(0)
+    contents: list[str] = []
+    duplicates = 0
+    for _ in range(pages):
+        if contents and rng.random() < dup_ratio:
+            base = rng.choice(contents)
+            words = base.split(" ")
+            position = rng.randrange(len(words))
+            words[position] = words[position] + " (updated)"
+            contents.append(" ".join(words))
+            duplicates += 1
+        else:
+            contents.append(_page(rng, page_bytes))
+    data = [
+        {"url": f"https://example.com/docs/{i}", "title": f"Doc {i}", "markdown": content}
+        for i, content in enumerate(contents)
+    ]
+    return json.dumps({"data": data}).encode("utf-8"), duplicates
+
+
+def measure(raw: bytes, config: PostProcessConfig | None) -> tuple[float, int, dict, int]:
+    started = time.perf_counter()
+    output = _parse_output(raw, "crawl", "https://example.com", None, config)
+    elapsed = time.perf_counter() - started
+    size = len(json.dumps(output).encode("utf-8"))
+    stats = output["stats"].get("postprocess", {})
+    # tracemalloc slows allocation-heavy code a lot, so memory is measured in
+    # a second, untimed run.
+    del output
+    tracemalloc.start()
+    _parse_output(raw, "crawl", "https://example.com", None, config)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, size, stats, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", default="1000,5000")
+    parser.add_argument("--page-bytes", type=int, default=6000)
+    parser.add_argument("--dup-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    cases = [
+        ("none", None),
+        ("boilerplate", PostProcessConfig(strip_boilerplate=True)),
+        ("dedup", PostProcessConfig(dedup=True)),
+        ("chunk 2000", PostProcessConfig(chunk_bytes=2000)),
+        ("all", PostProcessConfig(dedup=True, strip_boilerplate=True, chunk_bytes=2000)),
+    ]
+    for pages in (int(value) for value in args.pages.split(",")):
+        raw, duplicates = make_crawl(pages, args.page_bytes, args.dup_ratio)
+        print(f"\n{pages} pages, {len(raw) / 1e6:.1f} MB response, {duplicates} near-duplicates")
+        print(f"{'stage':<12} {'ms':>8} {'output MB':>10} {'found dups':>11} {'items':>7} {'peak MB':>8}")
+        for label, config in cases:
+            elapsed_ms, size, stats, peak = measure(raw, config)
+            found = stats.get("duplicates", "-")
+            items = stats.get("chunks", pages - (found if isinstance(found, int) else 0))
+            print(
+                f"{label:<12} {elapsed_ms:>8.0f} {size / 1e6:>10.2f} {found!s:>11} {items:>7} {peak / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
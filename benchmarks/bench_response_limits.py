@@ -0,0 +1,101 @@
+"""Gateway memory while reading large worker responses.
+
+Usage:
+    python benchmarks/bench_response_limits.py [--mb 16,64] [--concurrency 4] [--spill-mb 8]
+
+Streams a synthetic worker envelope of each size to the gateway's HTTP
+transport (in 64 KiB chunks, no Content-Length) from --concurrency runs at
+once, then splits it with `loads_envelope` as `call_worker` does. It compares
+an in-memory read with reads that spill past --spill-mb, plus a limit set at
+half the size. Reports wall time and peak Python memory in the gateway process
+(tracemalloc; the offload pool that parses the JSON is not counted).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "gateway"))
+
+from ax_common.offload import warm_pool  # noqa: E402
+from src.offload import loads_envelope  # noqa: E402
+from src.transports import HttpTransport, ResponseTooLarge  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+def make_envelope(size: int) -> bytes:
+    item = {"url": "https://example.com/page", "title": "Page", "content": "lorem ipsum " * 400}
+    count = max(1, size // len(json.dumps(item)))
+    return json.dumps({"ok": True, "meta": {"tool_run_id": "bench"}, "output": {"items": [item] * count}}).encode()
+
+
+def _transport(body: bytes) -> HttpTransport:
+    async def stream():
+        for start in range(0, len(body), CHUNK):
+            yield body[start : start + CHUNK]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=stream())
+
+    return HttpTransport(httpx.AsyncClient(transport=httpx.MockTransport(handler)), "http://worker", owns_client=True)
+
+
+async def _call(transport: HttpTransport, max_bytes: int | None, spill_bytes: int | None) -> str:
+    try:
+        _, content = await transport.request("POST", "/run", b"{}", 60, max_bytes, spill_bytes)
+    except ResponseTooLarge:
+        return "too large"
+    envelope = await loads_envelope(content)
+    return "ok" if envelope["ok"] else "error"
+
+
+async def measure(body: bytes, concurrency: int, max_bytes: int | None, spill_bytes: int | None):
+    transport = _transport(body)
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(_call(transport, max_bytes, spill_bytes) for _ in range(concurrency)))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        await transport.aclose()
+    return elapsed_ms, peak, outcomes[0]
+
+
+async def run(args: argparse.Namespace) -> None:
+    await warm_pool()
+    spill = int(args.spill_mb * 1024 * 1024)
+    print(f"{'MB':>5} {'case':<16} {'ms':>8} {'peak MB':>8} {'result':>10}")
+    for mb in (float(value) for value in args.mb.split(",")):
+        body = make_envelope(int(mb * 1024 * 1024))
+        cases = [
+            ("in memory", None, None),
+            (f"spill > {args.spill_mb:g} MB", None, spill),
+            ("limit at half", len(body) // 2, spill),
+        ]
+        for label, max_bytes, spill_bytes in cases:
+            elapsed_ms, peak, outcome = await measure(body, args.concurrency, max_bytes, spill_bytes)
+            print(f"{mb:>5g} {label:<16} {elapsed_ms:>8.0f} {peak / 1e6:>8.1f} {outcome:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", default="16,64")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--spill-mb", type=float, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
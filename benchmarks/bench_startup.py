@@ -0,0 +1,126 @@
+"""Cold-start cost of the gateway and the Firecrawl worker.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+
+For each service reports, as the median over --runs fresh interpreters:
+- import time of `src.main` (from `python -X importtime`), plus the slowest
+  top-level imports;
+- time from process spawn to the first 200 from /healthz (time to first
+  request) and from /readyz (warm-up done).
+The gateway is measured with a cold and a warm domain config cache.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+SERVICES = {"gateway": ROOT / "gateway", "worker": ROOT / "tools" / "firecrawl"}
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _env(cache_dir: str) -> dict[str, str]:
+    return dict(
+        os.environ,
+        PYTHONPATH=str(ROOT),
+        DOMAIN_MANIFEST_PATH=str(ROOT / "domain" / "example_domain" / "manifest.yaml"),
+        DOMAIN_POLICIES_PATH=str(ROOT / "domain" / "example_domain" / "policies.yaml"),
+        GATEWAY_CONFIG_CACHE_DIR=cache_dir,
+        GATEWAY_WARMUP_TIMEOUT_SEC="2",
+        FIRECRAWL_WARMUP_TIMEOUT_SEC="2",
+    )
+
+
+def import_profile(cwd: Path) -> tuple[float, list[tuple[float, str]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=cwd, env=dict(os.environ, PYTHONPATH=str(ROOT)), capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    top: list[tuple[float, str]] = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3)) // 2
+        name = match.group(4)
+        if name == "src.main":
+            total = cumulative_ms
+        elif depth <= 1:
+            top.append((cumulative_ms, name))
+    return total, sorted(top, reverse=True)[:6]
+
+
+def time_to_ready(cwd: Path, env: dict[str, str]) -> tuple[float, float]:
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    first = ready = None
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() - started < 60 and ready is None:
+                try:
+                    if first is None and client.get("/healthz").status_code == 200:
+                        first = time.perf_counter() - started
+                    if first is not None and client.get("/readyz").status_code == 200:
+                        ready = time.perf_counter() - started
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.005)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return (first or float("nan")) * 1000, (ready or float("nan")) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, cwd in SERVICES.items():
+        profiles = [import_profile(cwd) for _ in range(args.runs)]
+        print(f"{name}: import src.main {statistics.median(p[0] for p in profiles):.0f} ms (median)")
+        for cumulative_ms, module in profiles[-1][1]:
+            print(f"    {module:<28} {cumulative_ms:>7.1f} ms")
+
+    print(f"\n{'service':<16} {'first request ms':>17} {'ready ms':>9}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cases = [
+            ("gateway (cold)", SERVICES["gateway"], lambda: _env(tempfile.mkdtemp(dir=cache_dir))),
+            ("gateway (warm)", SERVICES["gateway"], lambda: _env(cache_dir)),
+            ("worker", SERVICES["worker"], lambda: _env(cache_dir)),
+        ]
+        # Prime the warm cache once.
+        time_to_ready(SERVICES["gateway"], _env(cache_dir))
+        for label, cwd, env in cases:
+            samples = [time_to_ready(cwd, env()) for _ in range(args.runs)]
+            print(
+                f"{label:<16} {statistics.median(s[0] for s in samples):>17.0f} "
+                f"{statistics.median(s[1] for s in samples):>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
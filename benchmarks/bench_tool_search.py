@@ -0,0 +1,111 @@
+"""Tool search index: build time, query latency and payload size.
+
+Usage:
+    python benchmarks/bench_tool_search.py [--tools 1000,5000,20000] [--queries 2000]
+
+Generates synthetic catalogs whose names, descriptions and capabilities draw
+words from a Zipf-like vocabulary, then reports per catalog size:
+- time to build the ToolIndex (done once per config load);
+- p50/p99 latency of ToolIndex.search for 1-3 word queries (limit 10);
+- the same queries as a client-side scan of the full catalog, which is what
+  an agent does without the endpoint;
+- bytes of the full /v1/tools catalog versus a 10-hit search response.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "gateway"))
+
+from src.models import ToolConfig  # noqa: E402
+from src.search import ToolIndex, tokenize  # noqa: E402
+
+VOCABULARY = [f"w{i}" for i in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def _words(rng: random.Random, count: int) -> list[str]:
+    return rng.choices(VOCABULARY, weights=WEIGHTS, k=count)
+
+
+def make_tools(count: int, seed: int = 1) -> list[ToolConfig]:
+    rng = random.Random(seed)
+    return [
+        ToolConfig(
+            tool_id=f"svc{i % 50}.tool{i}",
+            kind="service_worker",
+            display_name=" ".join(_words(rng, 3)),
+            description=" ".join(_words(rng, 30)),
+            capabilities=["_".join(_words(rng, 2)) for _ in range(3)],
+            transport={"type": "http", "base_url": f"http://svc{i % 50}:8080", "endpoint": "/run"},
+        )
+        for i in range(count)
+    ]
+
+
+def scan(tools: list[ToolConfig], query: str, limit: int = 10) -> list[ToolConfig]:
+    terms = set(tokenize(query))
+    scored = []
+    for tool in tools:
+        text = tokenize(" ".join([tool.tool_id, tool.display_name, tool.description, *tool.capabilities]))
+        score = sum(text.count(term) for term in terms)
+        if score:
+            scored.append((score, tool))
+    scored.sort(key=lambda item: -item[0])
+    return [tool for _score, tool in scored[:limit]]
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.99) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", default="1000,5000,20000")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(
+        f"{'tools':>7} {'build ms':>9} {'search p50 us':>14} {'p99 us':>8} "
+        f"{'scan p50 ms':>12} {'catalog KiB':>12} {'response KiB':>13}"
+    )
+    for count in (int(value) for value in args.tools.split(",")):
+        tools = make_tools(count)
+        started = time.perf_counter()
+        index = ToolIndex(tools)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        queries = [" ".join(_words(rng, rng.randint(1, 3))) for _ in range(args.queries)]
+        samples = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, 10)
+            samples.append((time.perf_counter() - started) * 1e6)
+        search_p50, search_p99 = _percentiles(samples)
+
+        scan_samples = []
+        for query in queries[:20]:
+            started = time.perf_counter()
+            scan(tools, query)
+            scan_samples.append((time.perf_counter() - started) * 1000)
+
+        catalog = json.dumps([tool.model_dump(mode="json") for tool in tools]).encode()
+        _total, hits = index.search(queries[0], 10)
+        response = json.dumps([tool.model_dump(mode="json") for tool, _score in hits]).encode()
+        print(
+            f"{count:>7} {build_ms:>9.1f} {search_p50:>14.1f} {search_p99:>8.1f} "
+            f"{statistics.median(scan_samples):>12.1f} {len(catalog) / 1024:>12.0f} {len(response) / 1024:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
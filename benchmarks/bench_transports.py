@@ -0,0 +1,140 @@
+"""Per-call overhead of each worker transport.
+
+Usage:
+    python benchmarks/bench_transports.py [--calls 2000] [--concurrency 1,16]
+
+Runs the fake worker with a tiny output and calls its /run through the
+gateway's transports: "http" (uvicorn over loopback TCP), "uds" (uvicorn on
+a Unix socket) and "local" (the ASGI app in a child process pool). The
+envelope is identical for all three, so the difference is transport cost.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "gateway"))
+
+from src.models import TransportConfig  # noqa: E402
+from src.transports import TransportRegistry  # noqa: E402
+
+ENVELOPE = json.dumps(
+    {"meta": {"trace_id": "bench", "tool_run_id": "bench"}, "input": {"url": "https://example.com"}}
+).encode()
+WORKER_ENV = dict(os.environ, FAKE_WORKER_ITEMS="1", FAKE_WORKER_CONTENT_BYTES="200")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_worker(*bind: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "fake_worker:app", "--app-dir", str(ROOT / "benchmarks"),
+         "--log-level", "warning", *bind],
+        env=WORKER_ENV,
+    )
+
+
+async def _measure(transports: TransportRegistry, config: TransportConfig, calls: int, concurrency: int) -> list[float]:
+    # Warm connections / child processes first.
+    for _ in range(max(concurrency, 20)):
+        await transports.request(config, "GET", "/healthz", None, 30)
+
+    latencies: list[float] = []
+    remaining = calls
+
+    async def loop() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            status_code, _ = await transports.request(config, "POST", "/run", ENVELOPE, 30)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert status_code == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    latencies.append(time.perf_counter() - started)  # total seconds, popped by caller
+    return latencies
+
+
+async def _run(configs: dict[str, TransportConfig], calls: int, concurrencies: list[int]) -> None:
+    print(f"{'transport':>9} {'conc':>5} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=None, max_keepalive_connections=64)) as client:
+        transports = TransportRegistry(client)
+        try:
+            for concurrency in concurrencies:
+                for name, config in configs.items():
+                    latencies = await _measure(transports, config, calls, concurrency)
+                    total = latencies.pop()
+                    latencies.sort()
+                    print(
+                        f"{name:>9} {concurrency:>5} {calls / total:>9.0f} "
+                        f"{latencies[len(latencies) // 2]:>8.2f} {latencies[int(len(latencies) * 0.99)]:>8.2f}"
+                    )
+        finally:
+            await transports.aclose()
+
+
+def _wait_ready(client: httpx.Client, url: str) -> None:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if client.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Worker did not start: {url}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,16")
+    parser.add_argument("--local-processes", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = str(Path(tmp) / "worker.sock")
+        workers = [_start_worker("--port", str(port)), _start_worker("--uds", socket_path)]
+        try:
+            _wait_ready(httpx.Client(), f"http://127.0.0.1:{port}/healthz")
+            _wait_ready(httpx.Client(transport=httpx.HTTPTransport(uds=socket_path)), "http://worker/healthz")
+            os.environ.update(FAKE_WORKER_ITEMS="1", FAKE_WORKER_CONTENT_BYTES="200")
+            configs = {
+                "http": TransportConfig(type="http", base_url=f"http://127.0.0.1:{port}", endpoint="/run"),
+                "uds": TransportConfig(type="uds", socket_path=socket_path, endpoint="/run"),
+                "local": TransportConfig(
+                    type="local",
+                    app="fake_worker:app",
+                    pythonpath=[str(ROOT / "benchmarks")],
+                    processes=args.local_processes,
+                    endpoint="/run",
+                ),
+            }
+            asyncio.run(_run(configs, args.calls, [int(c) for c in args.concurrency.split(",")]))
+        finally:
+            for worker in workers:
+                worker.terminate()
+                worker.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
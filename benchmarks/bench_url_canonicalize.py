@@ -0,0 +1,47 @@
+"""Throughput of the Firecrawl worker's URL canonicalization.
+
+Usage:
+    python benchmarks/bench_url_canonicalize.py [--count 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.firecrawl.src.urls import canonicalize_url  # noqa: E402
+
+
+def _urls(count: int) -> list[str]:
+    rng = random.Random(0)
+    hosts = ["Example.com", "docs.example.com", "news.example.org:443", "blog.example.net:8080"]
+    queries = ["", "?utm_source=x&utm_medium=y", "?page=2&sort=desc", "?b=2&a=1&gclid=abc", "?q=a%20b&fbclid=z"]
+    return [
+        f"https://{rng.choice(hosts)}/path/{rng.randrange(10_000)}{rng.choice(queries)}{rng.choice(['', '#top'])}"
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    urls = _urls(args.count)
+    start = time.perf_counter()
+    canonical = {canonicalize_url(url) for url in urls}
+    elapsed = time.perf_counter() - start
+
+    print(f"urls:            {len(urls)}")
+    print(f"distinct raw:    {len(set(urls))}")
+    print(f"distinct canon:  {len(canonical)}")
+    print(f"total:           {elapsed * 1000:.1f} ms")
+    print(f"per url:         {elapsed / len(urls) * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+from fastapi import FastAPI, Request
+
+# Stand-in for a tool worker that follows the envelope contract without any
+# upstream calls. Output shape mirrors firecrawl.crawl.
+ITEMS = int(os.getenv("FAKE_WORKER_ITEMS", "5"))
+CONTENT_BYTES = int(os.getenv("FAKE_WORKER_CONTENT_BYTES", "2000"))
+DELAY_MS = int(os.getenv("FAKE_WORKER_DELAY_MS", "0"))
+
+app = FastAPI(title="AX Fake Worker", version="0.1")
+
+
+def fake_output(url: str, items: int = ITEMS, content_bytes: int = CONTENT_BYTES) -> dict:
+    line = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+    content = (line * (content_bytes // len(line) + 1))[:content_bytes]
+    return {
+        "source_url": url,
+        "items": [
+            {"url": f"{url.rstrip('/')}/page-{i}", "title": f"Page {i}", "content": content, "format": "markdown"}
+            for i in range(items)
+        ],
+        "stats": {"pages": items},
+    }
+
+
+@app.get("/healthz")
+def healthz() -> dict[str, bool]:
+    return {"ok": True}
+
+
+@app.post("/run")
+async def run(request: Request):
+    start_ms = int(time.time() * 1000)
+    body = await request.json()
+    meta = body.get("meta", {})
+    if DELAY_MS:
+        await asyncio.sleep(DELAY_MS / 1000)
+    return {
+        "ok": True,
+        "meta": {
+            "trace_id": meta.get("trace_id", ""),
+            "tool_run_id": meta.get("tool_run_id", ""),
+            "duration_ms": max(0, int(time.time() * 1000) - start_ms),
+        },
+        "output": fake_output(body.get("input", {}).get("url", "https://example.com")),
+    }
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+COORDINATOR_SOCKET_ENV = "GATEWAY_COORDINATOR_SOCKET"
+
+
+# A client holds a tool token until it sends RELEASE or its connection closes,
+# so a crashed gateway process gives its tokens back when the kernel closes
+# the socket. Clients reuse a connection for later ACQUIREs.
+class LimiterCoordinator:
+    def __init__(self, socket_path: str | Path) -> None:
+        self.socket_path = str(socket_path)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._inflight: dict[str, int] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        Path(self.socket_path).unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Idle client connections would otherwise keep their handlers open.
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        Path(self.socket_path).unlink(missing_ok=True)
+
+    def inflight(self, tool_id: str) -> int:
+        return self._inflight.get(tool_id, 0)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while await self._serve_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _serve_one(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        # One ACQUIRE ... RELEASE exchange; False ends the connection.
+        parts = (await reader.readline()).decode("utf-8").split()
+        if len(parts) != 3 or parts[0] != "ACQUIRE" or not parts[2].isdigit():
+            return False
+        tool_id, limit = parts[1], max(1, int(parts[2]))
+        semaphore = self._semaphores.setdefault(tool_id, asyncio.Semaphore(limit))
+
+        acquire = asyncio.ensure_future(semaphore.acquire())
+        line = asyncio.ensure_future(reader.readline())
+        try:
+            await asyncio.wait({acquire, line}, return_when=asyncio.FIRST_COMPLETED)
+            if not acquire.done():
+                # Client went away while queued.
+                acquire.cancel()
+                return False
+            self._inflight[tool_id] = self._inflight.get(tool_id, 0) + 1
+            try:
+                if not line.done():
+                    writer.write(b"OK\n")
+                    await writer.drain()
+                return await line == b"RELEASE\n"
+            finally:
+                self._inflight[tool_id] -= 1
+                semaphore.release()
+        finally:
+            line.cancel()
+
+
+class LimiterUnavailable(Exception):
+    pass
+
+
+class SharedLimiter:
+    def __init__(self, socket_path: str, tool_id: str, limit: int) -> None:
+        self.socket_path = socket_path
+        self.tool_id = tool_id
+        self.limit = max(1, limit)
+        self._leases: dict[asyncio.Task, tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def __aenter__(self) -> None:
+        try:
+            await self._enter()
+        except OSError as exc:
+            raise LimiterUnavailable(f"Limiter coordinator unavailable: {exc}") from exc
+
+    async def _enter(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Streams belong to the loop that opened them.
+            self._idle, self._loop = [], loop
+        while self._idle:
+            reader, writer = self._idle.pop()
+            try:
+                await self._acquire(reader, writer)
+                return
+            except ConnectionError:
+                # The coordinator dropped an idle connection; try the next.
+                continue
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        await self._acquire(reader, writer)
+
+    async def _acquire(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            writer.write(f"ACQUIRE {self.tool_id} {self.limit}\n".encode("utf-8"))
+            await writer.drain()
+            if await reader.readline() != b"OK\n":
+                raise ConnectionError("Limiter coordinator refused token request")
+        except BaseException:
+            writer.close()
+            raise
+        self._leases[asyncio.current_task()] = (reader, writer)
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        lease = self._leases.pop(asyncio.current_task(), None)
+        if lease is None:
+            return False
+        _reader, writer = lease
+        # Closing the connection releases the token as well, so a failed
+        # RELEASE only costs the connection.
+        try:
+            writer.write(b"RELEASE\n")
+            await writer.drain()
+        except ConnectionError:
+            writer.close()
+            return False
+        except BaseException:
+            writer.close()
+            raise
+        if len(self._idle) < self.limit:
+            self._idle.append(lease)
+        else:
+            writer.close()
+        return False
+
+
+def start_coordinator_thread(socket_path: str | Path) -> LimiterCoordinator:
+    coordinator = LimiterCoordinator(socket_path)
+    ready = threading.Event()
+
+    def _run() -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(coordinator.start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=_run, name="limiter-coordinator", daemon=True).start()
+    if not ready.wait(timeout=10):
+        raise RuntimeError("Limiter coordinator failed to start")
+    return coordinator
+
+
+def coordinator_socket() -> str | None:
+    return os.getenv(COORDINATOR_SOCKET_ENV) or None
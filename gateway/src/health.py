@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from src.models import HealthConfig, ToolConfig
+from src.transports import TransportRegistry, close_body, transport_key
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+UNKNOWN = "unknown"
+
+
+@dataclass
+class TargetHealth:
+    status: str = UNKNOWN
+    checked_at_ms: int | None = None
+    latency_ms: int | None = None
+    consecutive_failures: int = 0
+    consecutive_successes: int = 0
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class HealthChecker:
+    # One probe loop per worker (see transport_key); tools served by the same
+    # worker share its status. Status flips only after `unhealthy_after`
+    # failures or `healthy_after` successes in a row, so a single slow probe
+    # does not make requests fail fast.
+    def __init__(
+        self,
+        config: HealthConfig,
+        tools: list[ToolConfig],
+        transports: Callable[[], TransportRegistry | None],
+    ) -> None:
+        self.config = config
+        self._transports = transports
+        self._target_for = {tool.tool_id: transport_key(tool.transport) for tool in tools}
+        self._transport_for = {transport_key(tool.transport): tool.transport for tool in tools}
+        self.targets: dict[str, TargetHealth] = {key: TargetHealth() for key in self._transport_for}
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._run(key)) for key in self.targets]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def status_for(self, tool_id: str) -> TargetHealth:
+        key = self._target_for.get(tool_id)
+        return self.targets[key] if key is not None else TargetHealth()
+
+    def is_unhealthy(self, tool_id: str) -> bool:
+        return self.config.fail_fast and self.status_for(tool_id).status == UNHEALTHY
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {key: health.as_dict() for key, health in self.targets.items()}
+
+    async def _run(self, key: str) -> None:
+        # Start at a random point of the jitter window so processes and
+        # workers do not all probe in lockstep.
+        await asyncio.sleep(random.uniform(0, self.config.jitter_sec))
+        while True:
+            await self.check(key)
+            await asyncio.sleep(self.config.interval_sec + random.uniform(0, self.config.jitter_sec))
+
+    async def check(self, key: str) -> TargetHealth:
+        health = self.targets[key]
+        started = time.perf_counter()
+        error = None
+        transports = self._transports()
+        try:
+            if transports is None:
+                raise RuntimeError("Transports not started")
+            status_code, content = await transports.request(
+                self._transport_for[key], "GET", "/healthz", None, self.config.timeout_sec
+            )
+            close_body(content)
+            if status_code != 200:
+                error = f"HTTP {status_code}"
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+
+        health.checked_at_ms = int(time.time() * 1000)
+        health.latency_ms = int((time.perf_counter() - started) * 1000)
+        health.error = error
+        if error is None:
+            health.consecutive_failures = 0
+            health.consecutive_successes += 1
+            if health.consecutive_successes >= self.config.healthy_after:
+                health.status = HEALTHY
+        else:
+            health.consecutive_successes = 0
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.config.unhealthy_after:
+                health.status = UNHEALTHY
+        return health
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from src.models import HedgePolicy, HedgingConfig, ToolConfig
+
+WorkerCall = Callable[[ToolConfig, float], Awaitable[tuple[int, Any]]]
+
+
+@dataclass
+class _ToolState:
+    policy: HedgePolicy
+    latencies_ms: deque[float] = field(default_factory=deque)
+    tokens: float = 0.0
+    calls: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    _sorted: list[float] | None = None
+
+    def delay_ms(self) -> float | None:
+        if len(self.latencies_ms) < self.policy.min_samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self.latencies_ms)
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * self.policy.percentile / 100))
+        return max(float(self.policy.min_delay_ms), self._sorted[index])
+
+    def record(self, latency_ms: float) -> None:
+        if len(self.latencies_ms) >= self.policy.window:
+            self.latencies_ms.popleft()
+        self.latencies_ms.append(latency_ms)
+        self._sorted = None
+
+
+def _succeeded(task: asyncio.Task) -> bool:
+    # Workers report errors as HTTP 200 envelopes, so only ok=true wins.
+    if task.cancelled() or task.exception() is not None:
+        return False
+    status_code, body = task.result()
+    return status_code == 200 and isinstance(body, dict) and body.get("ok") is True
+
+
+class Hedger:
+    # Sends a second copy of a worker call once the first has run past the
+    # tool's latency percentile, and keeps whichever succeeds first. Each call
+    # earns `budget_ratio` hedge tokens and each hedge spends one, so hedges
+    # stay under that fraction of traffic even when the worker is slow.
+    def __init__(self, config: HedgingConfig) -> None:
+        self._tools = {tool_id: _ToolState(policy) for tool_id, policy in config.per_tool.items()}
+
+    def enabled_for(self, tool_id: str) -> bool:
+        return tool_id in self._tools
+
+    async def call(self, tool: ToolConfig, timeout_sec: float, call: WorkerCall) -> tuple[int, Any]:
+        state = self._tools.get(tool.tool_id)
+        if state is None:
+            return await call(tool, timeout_sec)
+
+        state.calls += 1
+        state.tokens = min(state.policy.max_burst, state.tokens + state.policy.budget_ratio)
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(call(tool, timeout_sec))
+        delay_ms = state.delay_ms()
+        if delay_ms is None:
+            result = await primary
+            state.record((time.perf_counter() - started) * 1000)
+            return result
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay_ms / 1000)
+        except BaseException:
+            # asyncio.wait does not cancel what it waits on.
+            primary.cancel()
+            raise
+        if done or state.tokens < 1:
+            result = await primary
+            state.record((time.perf_counter() - started) * 1000)
+            return result
+
+        state.tokens -= 1
+        state.hedges += 1
+        remaining = max(0.001, timeout_sec - (time.perf_counter() - started))
+        hedge = asyncio.ensure_future(call(_alternate(tool), remaining))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if _succeeded(task)), None)
+                if winner is not None:
+                    if winner is hedge:
+                        state.hedge_wins += 1
+                    state.record((time.perf_counter() - started) * 1000)
+                    return winner.result()
+            # Neither succeeded: surface the primary's outcome as if unhedged.
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            tool_id: {
+                "calls": state.calls,
+                "hedges": state.hedges,
+                "hedge_wins": state.hedge_wins,
+                "delay_ms": state.delay_ms(),
+                "samples": len(state.latencies_ms),
+            }
+            for tool_id, state in self._tools.items()
+        }
+
+
+def _alternate(tool: ToolConfig) -> ToolConfig:
+    # With replicas configured the hedge goes to the first one that is not the
+    # primary; otherwise it is a second request (and connection) to the same
+    # base_url.
+    replicas = [url for url in tool.transport.replicas if url.rstrip("/") != tool.transport.base_url.rstrip("/")]
+    if not replicas:
+        return tool
+    transport = tool.transport.model_copy(update={"base_url": replicas[0]})
+    return tool.model_copy(update={"transport": transport})
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fcntl
+import hashlib
+import itertools
+import os
+import struct
+import sys
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from fastapi import FastAPI, Request
+
+from src.private_dir import ensure_private_dir, state_dir
+
+# File layout: MAGIC, then records of <u32 length><payload>. The payload is a
+# fixed header followed by length-prefixed UTF-8 fields, so a record for a
+# typical run is well under 200 bytes.
+MAGIC = b"AXJ1"
+_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<QIHB")
+_SHORT = struct.Struct("<H")
+
+FLAG_OK = 1
+FLAG_RETRYABLE = 2
+
+
+@dataclass
+class RunRecord:
+    ts_ms: int
+    duration_ms: int
+    status_code: int
+    ok: bool
+    retryable: bool
+    tool_id: str
+    tool_run_id: str
+    error_code: str
+    worker: str
+    input_hash: str
+    request_body: bytes = b""
+
+    def encode(self) -> bytes:
+        flags = (FLAG_OK if self.ok else 0) | (FLAG_RETRYABLE if self.retryable else 0)
+        parts = [_HEADER.pack(self.ts_ms, min(self.duration_ms, 0xFFFFFFFF), self.status_code, flags)]
+        for value in (self.tool_id, self.tool_run_id, self.error_code, self.worker, self.input_hash):
+            data = value.encode("utf-8")[:0xFFFF]
+            parts.append(_SHORT.pack(len(data)) + data)
+        parts.append(_LENGTH.pack(len(self.request_body)) + self.request_body)
+        payload = b"".join(parts)
+        return _LENGTH.pack(len(payload)) + payload
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "RunRecord":
+        ts_ms, duration_ms, status_code, flags = _HEADER.unpack_from(payload, 0)
+        offset = _HEADER.size
+        fields = []
+        for _ in range(5):
+            (length,) = _SHORT.unpack_from(payload, offset)
+            offset += _SHORT.size
+            fields.append(payload[offset : offset + length].decode("utf-8"))
+            offset += length
+        (body_length,) = _LENGTH.unpack_from(payload, offset)
+        offset += _LENGTH.size
+        return cls(
+            ts_ms=ts_ms,
+            duration_ms=duration_ms,
+            status_code=status_code,
+            ok=bool(flags & FLAG_OK),
+            retryable=bool(flags & FLAG_RETRYABLE),
+            tool_id=fields[0],
+            tool_run_id=fields[1],
+            error_code=fields[2],
+            worker=fields[3],
+            input_hash=fields[4],
+            request_body=payload[offset : offset + body_length],
+        )
+
+
+def input_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def journal_files(path: str | Path) -> list[Path]:
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(path.glob("journal-*.axj"))
+
+
+def read_records(path: str | Path) -> Iterator[RunRecord]:
+    for file_path in journal_files(path):
+        with file_path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                continue
+            while True:
+                head = f.read(_LENGTH.size)
+                if len(head) < _LENGTH.size:
+                    break
+                (length,) = _LENGTH.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length:
+                    # Torn tail from a crash mid-write.
+                    break
+                yield RunRecord.decode(payload)
+
+
+class RunJournal:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_file_bytes: int = 64 * 1024 * 1024,
+        max_files: int = 10,
+        batch_size: int = 256,
+        flush_interval_sec: float = 0.5,
+        queue_size: int = 10_000,
+        include_request_body: bool = False,
+    ) -> None:
+        self.root = Path(root)
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max(1, max_files)
+        self.batch_size = batch_size
+        self.flush_interval_sec = flush_interval_sec
+        self.include_request_body = include_request_body
+        self.dropped = 0
+        self._queue: deque[RunRecord] = deque(maxlen=queue_size)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._current: Path | None = None
+        # Several gateway processes can share one directory. Each holds a
+        # writer slot and rotates only that slot's files; a restarted process
+        # takes over a free slot and prunes what its predecessor left.
+        self._writer: str | None = None
+        self._slot_lock = None
+
+    def record(self, record: RunRecord) -> None:
+        # Never blocks the request path: when the writer falls behind, the
+        # oldest queued records are dropped and counted.
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        if not self.include_request_body:
+            record.request_body = b""
+        self._queue.append(record)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._slot_lock is not None:
+            self._slot_lock.close()
+            self._slot_lock = None
+            self._writer = None
+            self._current = None
+
+    async def flush(self) -> None:
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            data = b"".join(record.encode() for record in batch)
+            await asyncio.to_thread(self._write, data)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except OSError:
+                # Journal is best effort; keep serving if the disk is unhappy.
+                self._queue.clear()
+
+    def _write(self, data: bytes) -> None:
+        try:
+            size = self._current.stat().st_size if self._current is not None else None
+        except FileNotFoundError:
+            # Removed from under us, e.g. by an operator; start a new file
+            # instead of failing.
+            size = None
+        if size is None or size + len(data) > self.max_file_bytes:
+            self._rotate()
+        with self._current.open("ab") as f:
+            f.write(data)
+
+    def _claim_slot(self) -> str:
+        # flock is released by the kernel when the holder exits, so a slot
+        # is free again as soon as its process is gone.
+        for slot in itertools.count():
+            handle = open(self.root / f"writer-{slot}.lock", "ab")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                continue
+            self._slot_lock = handle
+            return f"w{slot}"
+
+    def _rotate(self) -> None:
+        # Journals may hold request bodies.
+        ensure_private_dir(self.root)
+        if self._writer is None:
+            self._writer = self._claim_slot()
+        self._current = self.root / f"journal-{time.time_ns()}-{self._writer}.axj"
+        fd = os.open(self._current, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+        files = sorted(self.root.glob(f"journal-*-{self._writer}.axj"))
+        for old in files[: max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+
+def default_journal_dir() -> str:
+    return os.getenv("GATEWAY_JOURNAL_DIR") or str(state_dir("journal"))
+
+
+def _percentile(values: list[int], pct: float) -> int:
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def summarize(path: str | Path) -> str:
+    durations: dict[str, list[int]] = defaultdict(list)
+    errors: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for record in read_records(path):
+        durations[record.tool_id].append(record.duration_ms)
+        if not record.ok:
+            errors[record.tool_id][record.error_code or "UNKNOWN"] += 1
+
+    lines = [f"{'tool_id':<32} {'runs':>7} {'errors':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+    for tool_id in sorted(durations):
+        values = sorted(durations[tool_id])
+        lines.append(
+            f"{tool_id:<32} {len(values):>7} {sum(errors[tool_id].values()):>7} "
+            f"{_percentile(values, 0.5):>7} {_percentile(values, 0.95):>7} "
+            f"{_percentile(values, 0.99):>7} {values[-1]:>7}"
+        )
+        for code, count in sorted(errors[tool_id].items(), key=lambda item: -item[1]):
+            lines.append(f"  {code:<30} {count:>7}")
+    return "\n".join(lines)
+
+
+async def replay(
+    path: str | Path, target_url: str, concurrency: int, speed: float, direct: bool = False
+) -> dict[str, int]:
+    import json
+
+    import httpx
+
+    records = [record for record in read_records(path) if record.request_body]
+    results: dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    first_ts = records[0].ts_ms if records else 0
+    start = time.monotonic()
+
+    async with httpx.AsyncClient(base_url=target_url.rstrip("/"), timeout=300) as client:
+
+        async def send(record: RunRecord) -> None:
+            # speed=0 replays as fast as the concurrency allows; otherwise
+            # the recorded spacing is kept, scaled by speed.
+            if speed > 0:
+                delay = (record.ts_ms - first_ts) / 1000 / speed - (time.monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if direct:
+                # Straight to a worker's /run: wrap the recorded body the way
+                # the gateway would.
+                body = json.loads(record.request_body)
+                payload = {"meta": {"trace_id": record.tool_run_id, "tool_run_id": record.tool_run_id}}
+                payload.update({key: body[key] for key in ("input", "options") if key in body})
+                path, content = "/run", json.dumps(payload).encode("utf-8")
+            else:
+                path, content = f"/v1/tools/{record.tool_id}:run", record.request_body
+            async with semaphore:
+                try:
+                    response = await client.post(
+                        path, content=content, headers={"Content-Type": "application/json"}
+                    )
+                    results[str(response.status_code)] += 1
+                except httpx.HTTPError:
+                    results["transport_error"] += 1
+
+        await asyncio.gather(*(send(record) for record in records))
+    return dict(results)
+
+
+def fake_worker_app(delay_ms: int) -> FastAPI:
+    app = FastAPI(title="AX Journal Fake Worker", version="0.1")
+
+    @app.get("/healthz")
+    def healthz() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/run")
+    async def run(request: Request):
+        body = await request.json()
+        meta = body.get("meta", {}) if isinstance(body, dict) else {}
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return {
+            "ok": True,
+            "meta": {
+                "trace_id": meta.get("trace_id", ""),
+                "tool_run_id": meta.get("tool_run_id", ""),
+                "duration_ms": delay_ms,
+            },
+            "output": {"source_url": "", "items": [], "stats": {"pages": 0}},
+        }
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.journal", description="AX gateway run journal tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summarize", help="latency and errors by tool")
+    summary.add_argument("path", nargs="?", default=default_journal_dir())
+
+    replayer = commands.add_parser("replay", help="re-send recorded run requests to a gateway")
+    replayer.add_argument("path", nargs="?", default=default_journal_dir())
+    target = replayer.add_mutually_exclusive_group()
+    target.add_argument("--gateway", default="http://localhost:8000")
+    target.add_argument("--worker", help="post straight to a worker (e.g. fake-worker) instead")
+    replayer.add_argument("--concurrency", type=int, default=16)
+    replayer.add_argument("--speed", type=float, default=0.0, help="1.0 keeps recorded timing; 0 sends at once")
+
+    worker = commands.add_parser("fake-worker", help="serve a stub /run worker for load tests")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=18081)
+    worker.add_argument("--delay-ms", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "summarize":
+        print(summarize(args.path))
+    elif args.command == "replay":
+        target_url = args.worker or args.gateway
+        results = asyncio.run(
+            replay(args.path, target_url, args.concurrency, args.speed, direct=args.worker is not None)
+        )
+        for status, count in sorted(results.items()):
+            print(f"{status:>16} {count:>7}")
+    else:
+        import uvicorn
+
+        uvicorn.run(fake_worker_app(args.delay_ms), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,78 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import json
+import math
+import os
 import time
 import uuid
 
 import httpx
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from jsonschema import ValidationError
-
+from pydantic import ValidationError as OptionsValidationError
+
+from ax_common.compression import CompressionMiddleware
+from ax_common.drain import DRAIN_RETRY_AFTER_MS, RunRegistry, drain_on_signal
+from ax_common.offload import (
+    LoopLagMonitor,
+    RawJSON,
+    dump_bytes,
+    estimate_size,
+    json_response,
+    loads_sized,
+    render_json,
+    run_sized,
+    warm_pool,
+)
+from ax_common.readiness import Readiness
+from src.coordinator import LimiterUnavailable
+from src.health import HealthChecker
+from src.hedging import Hedger
+from src.journal import RunJournal, RunRecord, default_journal_dir, input_hash
 from src.manifest import load_domain_config, resolve_domain_paths
-from src.models import DomainIdentity, ToolCatalog, ToolCatalogItem, ToolConfig
+from src.models import (
+    DomainIdentity,
+    OutputOptions,
+    PipelineRequest,
+    PipelineStep,
+    ToolCatalog,
+    ToolCatalogItem,
+    ToolConfig,
+    ToolHealth,
+    ToolSearchHit,
+    ToolSearchResult,
+    TransportConfig,
+)
+from src.offload import loads_envelope
+from src.pipelines import PipelineError, StepResult, execute, plan
 from src.policy import PolicyEnforcer
-from src.schemas import validate_tool_input, validation_error_details
+from src.results import CursorError, ResultStore, decode_cursor
+from src.schemas import InputValidationError, compiled_validator, validate_tool_input
+from src.search import ToolIndex
+from src.transports import ResponseTooLarge, TransportRegistry, close_body, transport_key
 
 app = FastAPI(title="AX Gateway", version="0.1")
+app.add_middleware(CompressionMiddleware)
 
 app.state.manifest = None
 app.state.policies = None
 app.state.domain_dir = None
 app.state.policy = None
+app.state.results = None
+app.state.journal = None
+app.state.health = None
+app.state.hedger = None
+app.state.search = None
 app.state.load_error = None
+app.state.loop_lag = LoopLagMonitor()
+app.state.http = None
+app.state.transports = None
+app.state.readiness = Readiness(float(os.getenv("GATEWAY_WARMUP_TIMEOUT_SEC", "30")))
+app.state.runs = RunRegistry(float(os.getenv("GATEWAY_DRAIN_GRACE_SEC", "30")))
+
+WARMUP_CONNECTIONS = int(os.getenv("GATEWAY_WARMUP_CONNECTIONS", "2"))
 
 
 def _gateway_error(
@@ -34,9 +86,11 @@ def _gateway_error(
     message: str,
     retryable: bool,
     details: dict | None = None,
+    headers: dict[str, str] | None = None,
 ) -> JSONResponse:
     return JSONResponse(
         status_code=status_code,
+        headers=headers,
         content={
             "ok": False,
             "tool_id": tool_id,
@@ -59,6 +113,21 @@ def _tool_map() -> dict[str, ToolConfig]:
     return {tool.tool_id: tool for tool in app.state.manifest.tools}
 
 
+def _build_journal(policies) -> RunJournal | None:
+    config = policies.journal
+    if not config.enabled:
+        return None
+    return RunJournal(
+        config.dir or default_journal_dir(),
+        max_file_bytes=config.max_file_bytes,
+        max_files=config.max_files,
+        batch_size=config.batch_size,
+        flush_interval_sec=config.flush_interval_ms / 1000,
+        queue_size=config.queue_size,
+        include_request_body=policies.logging.include_request_body,
+    )
+
+
 @app.on_event("startup")
 def startup_load_domain() -> None:
     try:
@@ -68,20 +137,190 @@ def startup_load_domain() -> None:
         app.state.policies = policies
         app.state.domain_dir = manifest_path.parent
         app.state.policy = PolicyEnforcer.from_config(policies, manifest.tools)
+        app.state.results = ResultStore(policies.results.dir, policies.results.ttl_sec)
+        app.state.journal = _build_journal(policies)
+        app.state.hedger = Hedger(policies.hedging)
+        app.state.search = ToolIndex(manifest.tools) if policies.search.enabled else None
         app.state.load_error = None
     except Exception as exc:
         app.state.load_error = f"Failed to load domain manifest/policies: {exc}"
 
 
+@app.on_event("startup")
+def startup_drain() -> None:
+    app.state.runs.resume()
+    drain_on_signal(app.state.runs)
+
+
+@app.on_event("startup")
+async def startup_loop_lag() -> None:
+    app.state.loop_lag.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_loop_lag() -> None:
+    await app.state.loop_lag.stop()
+
+
+def _compile_schemas() -> str:
+    refs = {ref for tool in app.state.manifest.tools for ref in (tool.input_schema_ref, tool.output_schema_ref) if ref}
+    for ref in refs:
+        compiled_validator(app.state.domain_dir, ref)
+    return f"{len(refs)} schemas"
+
+
+def _worker_probe(transport: TransportConfig, connections: int):
+    async def probe() -> str:
+        # Concurrent probes open that many pooled keep-alive connections (or
+        # start that many local worker processes).
+        results = await asyncio.gather(
+            *(app.state.transports.request(transport, "GET", "/healthz", None, 5.0) for _ in range(connections))
+        )
+        for _status_code, content in results:
+            close_body(content)
+        for status_code, _content in results:
+            if status_code != 200:
+                raise RuntimeError(f"/healthz returned {status_code}")
+        return f"{connections} connections"
+
+    return probe
+
+
+async def _warm_offload_pool() -> str:
+    await warm_pool()
+    return "started"
+
+
+@app.on_event("startup")
+async def startup_warmup() -> None:
+    # No pool limit here: the policy limiters already bound concurrency. Idle
+    # connections are kept long enough to survive the gap after warm-up.
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=64, keepalive_expiry=60.0)
+    )
+    app.state.transports = TransportRegistry(app.state.http)
+    if app.state.load_error:
+        return
+    steps = {"schemas": lambda: asyncio.to_thread(_compile_schemas), "offload_pool": _warm_offload_pool}
+    for tool in app.state.manifest.tools:
+        tool_limit = app.state.policies.concurrency.per_tool_max_inflight.get(tool.tool_id, 1)
+        steps.setdefault(
+            f"worker:{transport_key(tool.transport)}",
+            _worker_probe(tool.transport, max(1, min(WARMUP_CONNECTIONS, tool_limit))),
+        )
+    app.state.readiness.start(steps)
+
+
+@app.on_event("shutdown")
+async def shutdown_warmup() -> None:
+    await app.state.readiness.stop()
+    if app.state.transports is not None:
+        await app.state.transports.aclose()
+        app.state.transports = None
+    if app.state.http is not None:
+        await app.state.http.aclose()
+        app.state.http = None
+
+
+@app.on_event("startup")
+async def startup_health() -> None:
+    if app.state.load_error or not app.state.policies.health.enabled:
+        return
+    app.state.health = HealthChecker(app.state.policies.health, app.state.manifest.tools, lambda: app.state.transports)
+    app.state.health.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_health() -> None:
+    if app.state.health is not None:
+        await app.state.health.stop()
+        app.state.health = None
+
+
+@app.on_event("startup")
+async def startup_journal() -> None:
+    if app.state.journal is not None:
+        app.state.journal.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_journal() -> None:
+    if app.state.journal is not None:
+        await app.state.journal.stop()
+
+
+def _draining_error(tool_id: str, tool_run_id: str, trace_id: str, start_ms: int) -> JSONResponse:
+    return _gateway_error(
+        status_code=503,
+        tool_id=tool_id,
+        tool_run_id=tool_run_id,
+        trace_id=trace_id,
+        start_ms=start_ms,
+        code="RATE_LIMITED",
+        message="Gateway is draining and not accepting new runs",
+        retryable=True,
+        details={"backpressure": True, "reason": "draining", "retry_after_ms": DRAIN_RETRY_AFTER_MS},
+        headers={"Retry-After": str(math.ceil(DRAIN_RETRY_AFTER_MS / 1000))},
+    )
+
+
+def _error_body(response: JSONResponse) -> dict:
+    # Error envelopes are small and built by _gateway_error.
+    return json.loads(response.body).get("error", {})
+
+
 def ensure_loaded() -> None:
     if app.state.load_error:
         raise HTTPException(status_code=500, detail=app.state.load_error)
 
 
 @app.get("/healthz")
-def healthz() -> dict[str, bool]:
+def healthz(deep: bool = False):
+    ensure_loaded()
+    if not deep:
+        return {"ok": True}
+    # Cached results from the background checker; never probes inline.
+    workers = app.state.health.snapshot() if app.state.health is not None else {}
+    ok = all(worker["status"] != "unhealthy" for worker in workers.values())
+    return JSONResponse(status_code=200 if ok else 503, content={"ok": ok, "workers": workers})
+
+
+@app.get("/readyz")
+def readyz() -> JSONResponse:
+    snapshot = app.state.readiness.snapshot()
+    if app.state.load_error:
+        snapshot = {**snapshot, "ready": False, "error": app.state.load_error}
+    if app.state.runs.draining:
+        snapshot = {**snapshot, "ready": False, "draining": True}
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
+@app.get("/admin/runs")
+def runs() -> dict:
+    return app.state.runs.snapshot()
+
+
+@app.post("/admin/drain")
+def drain() -> dict:
+    app.state.runs.drain()
+    return app.state.runs.snapshot()
+
+
+@app.delete("/admin/drain")
+def resume() -> dict:
+    app.state.runs.resume()
+    return app.state.runs.snapshot()
+
+
+@app.get("/admin/loop-lag")
+def loop_lag() -> dict[str, float]:
+    return app.state.loop_lag.snapshot()
+
+
+@app.get("/admin/hedging")
+def hedging() -> dict[str, dict]:
     ensure_loaded()
-    return {"ok": True}
+    return app.state.hedger.snapshot()
 
 
 @app.get("/v1/domain", response_model=DomainIdentity)
@@ -93,36 +332,134 @@ def domain_identity() -> DomainIdentity:
     )
 
 
+def _tool_health(tool_id: str) -> ToolHealth | None:
+    if app.state.health is None:
+        return None
+    health = app.state.health.status_for(tool_id)
+    return ToolHealth(
+        status=health.status,
+        checked_at_ms=health.checked_at_ms,
+        latency_ms=health.latency_ms,
+        error=health.error,
+    )
+
+
+def _catalog_fields(tool: ToolConfig) -> dict:
+    return dict(
+        tool_id=tool.tool_id,
+        kind=tool.kind,
+        display_name=tool.display_name,
+        description=tool.description,
+        capabilities=tool.capabilities,
+        timeout_sec=tool.timeout_sec,
+        egress_allowlist=tool.egress_allowlist,
+        transport_type=tool.transport.type,
+        transport_endpoint=tool.transport.endpoint,
+        input_schema_ref=tool.input_schema_ref,
+        output_schema_ref=tool.output_schema_ref,
+        health=_tool_health(tool.tool_id),
+    )
+
+
 @app.get("/v1/tools", response_model=ToolCatalog)
 def list_tools() -> ToolCatalog:
     ensure_loaded()
     return ToolCatalog(
         domain_id=app.state.manifest.domain_id,
         version=app.state.manifest.version,
-        tools=[
-            ToolCatalogItem(
-                tool_id=tool.tool_id,
-                kind=tool.kind,
-                display_name=tool.display_name,
-                description=tool.description,
-                capabilities=tool.capabilities,
-                timeout_sec=tool.timeout_sec,
-                egress_allowlist=tool.egress_allowlist,
-                transport_type=tool.transport.type,
-                transport_endpoint=tool.transport.endpoint,
-                input_schema_ref=tool.input_schema_ref,
-                output_schema_ref=tool.output_schema_ref,
-            )
-            for tool in app.state.manifest.tools
-        ],
+        tools=[ToolCatalogItem(**_catalog_fields(tool)) for tool in app.state.manifest.tools],
     )
 
 
-async def call_worker(tool: ToolConfig, payload: dict, timeout_sec: int) -> tuple[int, dict]:
-    async with httpx.AsyncClient(timeout=timeout_sec) as client:
-        url = f"{tool.transport.base_url.rstrip('/')}{tool.transport.endpoint}"
-        response = await client.post(url, json=payload)
-        return response.status_code, response.json()
+@app.get("/v1/tools:search", response_model=ToolSearchResult)
+def search_tools(q: str = "", limit: int | None = None):
+    ensure_loaded()
+    start_ms = int(time.time() * 1000)
+    if app.state.search is None:
+        return _gateway_error(
+            status_code=404,
+            tool_id="",
+            tool_run_id="",
+            trace_id=str(uuid.uuid4()),
+            start_ms=start_ms,
+            code="NOT_FOUND",
+            message="Tool search is disabled for this domain",
+            retryable=False,
+        )
+    if not q.strip() or (limit is not None and limit < 1):
+        return _gateway_error(
+            status_code=400,
+            tool_id="",
+            tool_run_id="",
+            trace_id=str(uuid.uuid4()),
+            start_ms=start_ms,
+            code="VALIDATION_ERROR",
+            message="Query parameter q is required and limit must be positive",
+            retryable=False,
+        )
+
+    config = app.state.policies.search
+    total, hits = app.state.search.search(q, min(limit or config.default_limit, config.max_limit))
+    return ToolSearchResult(
+        domain_id=app.state.manifest.domain_id,
+        version=app.state.manifest.version,
+        query=q,
+        total=total,
+        tools=[ToolSearchHit(**_catalog_fields(tool), score=round(score, 4)) for tool, score in hits],
+    )
+
+
+async def call_worker(
+    tool: ToolConfig, payload: dict, timeout_sec: float, page_size: int | None = None
+) -> tuple[int, dict]:
+    body = dump_bytes(payload)
+    limits = app.state.policies.responses
+    max_bytes = limits.per_tool_max_bytes.get(tool.tool_id, limits.max_bytes)
+    if app.state.transports is not None:
+        status_code, content = await app.state.transports.request(
+            tool.transport, "POST", tool.transport.endpoint, body, timeout_sec, max_bytes, limits.spill_bytes or None
+        )
+    else:
+        async with httpx.AsyncClient() as client:
+            transports = TransportRegistry(client)
+            try:
+                status_code, content = await transports.request(
+                    tool.transport, "POST", tool.transport.endpoint, body, timeout_sec, max_bytes, limits.spill_bytes or None
+                )
+            finally:
+                await transports.aclose()
+    if page_size is not None and app.state.results is not None:
+        # The envelope comes back with only the first page and a `page` object.
+        return status_code, await app.state.results.load_envelope(
+            content, tool.tool_id, payload["meta"]["tool_run_id"], page_size
+        )
+    return status_code, await loads_envelope(content)
+
+
+def _journal_run(
+    tool_id: str, tool_run_id: str, start_ms: int, raw_body: bytes, response
+) -> None:
+    ok = not isinstance(response, JSONResponse)
+    error_code, retryable = "", False
+    if not ok:
+        error = _error_body(response)
+        error_code, retryable = error.get("code", ""), bool(error.get("retryable"))
+    tool = _tool_map().get(tool_id)
+    app.state.journal.record(
+        RunRecord(
+            ts_ms=start_ms,
+            duration_ms=max(0, int(time.time() * 1000) - start_ms),
+            status_code=response.status_code,
+            ok=ok,
+            retryable=retryable,
+            tool_id=tool_id,
+            tool_run_id=tool_run_id,
+            error_code=error_code,
+            worker=transport_key(tool.transport) if tool is not None else "",
+            input_hash=input_hash(raw_body),
+            request_body=raw_body,
+        )
+    )
 
 
 @app.post("/v1/tools/{tool_id}:run")
@@ -131,7 +468,16 @@ async def run_tool(tool_id: str, request: Request):
     start_ms = int(time.time() * 1000)
     trace_id = str(uuid.uuid4())
     tool_run_id = str(uuid.uuid4())
+    if app.state.runs.draining:
+        return _draining_error(tool_id, tool_run_id, trace_id, start_ms)
+    with app.state.runs.track(tool_run_id=tool_run_id, tool_id=tool_id, trace_id=trace_id):
+        response = await _run_tool(tool_id, request, start_ms, trace_id, tool_run_id)
+    if app.state.journal is not None:
+        _journal_run(tool_id, tool_run_id, start_ms, await request.body(), response)
+    return response
 
+
+async def _run_tool(tool_id: str, request: Request, start_ms: int, trace_id: str, tool_run_id: str):
     tools = _tool_map()
     tool = tools.get(tool_id)
     if tool is None:
@@ -147,7 +493,8 @@ async def run_tool(tool_id: str, request: Request):
         )
 
     try:
-        body = await request.json()
+        raw_body = await request.body()
+        body = await loads_sized(raw_body)
     except Exception:
         return _gateway_error(
             status_code=400,
@@ -173,9 +520,30 @@ async def run_tool(tool_id: str, request: Request):
             retryable=False,
         )
 
+    result = await _invoke_tool(
+        tool, input_payload, body.get("options"), len(raw_body), start_ms, trace_id, tool_run_id
+    )
+    if isinstance(result, JSONResponse):
+        return result
+    return await json_response(result)
+
+
+async def _invoke_tool(
+    tool: ToolConfig,
+    input_payload: dict,
+    raw_options,
+    size_hint: int,
+    start_ms: int,
+    trace_id: str,
+    tool_run_id: str,
+):
+    # Everything a run does after the request body is parsed. Returns the
+    # success envelope as a dict (so pipelines can read the output without a
+    # round trip through bytes) or an error JSONResponse.
+    tool_id = tool.tool_id
     try:
-        validate_tool_input(app.state.domain_dir, tool, input_payload)
-    except ValidationError as exc:
+        await run_sized(size_hint, validate_tool_input, app.state.domain_dir, tool, input_payload)
+    except InputValidationError as exc:
         return _gateway_error(
             status_code=400,
             tool_id=tool_id,
@@ -185,9 +553,61 @@ async def run_tool(tool_id: str, request: Request):
             code="VALIDATION_ERROR",
             message="Input schema validation failed",
             retryable=False,
-            details=validation_error_details(exc),
+            details=exc.details,
+        )
+
+    options = None
+    if raw_options is not None:
+        try:
+            options = OutputOptions.model_validate(raw_options)
+        except OptionsValidationError as exc:
+            return _gateway_error(
+                status_code=400,
+                tool_id=tool_id,
+                tool_run_id=tool_run_id,
+                trace_id=trace_id,
+                start_ms=start_ms,
+                code="VALIDATION_ERROR",
+                message="Invalid output options",
+                retryable=False,
+                details={"errors": exc.errors(include_url=False, include_context=False)},
+            )
+
+    # Fail fast on a worker the health checker has marked down, before the
+    # request takes a limiter slot and waits out the full timeout.
+    if app.state.health is not None and app.state.health.is_unhealthy(tool_id):
+        health = app.state.health.status_for(tool_id)
+        return _gateway_error(
+            status_code=503,
+            tool_id=tool_id,
+            tool_run_id=tool_run_id,
+            trace_id=trace_id,
+            start_ms=start_ms,
+            code="UPSTREAM_ERROR",
+            message="Worker is unhealthy",
+            retryable=True,
+            details={"health": health.as_dict()},
         )
 
+    # A worker signalled backpressure recently: wait out a short backoff,
+    # answer a long one directly instead of adding to the worker's queue.
+    delay_sec = app.state.policy.admission_delay(tool_id)
+    if delay_sec > 0:
+        if delay_sec * 1000 > app.state.policies.backpressure.max_admission_wait_ms:
+            return _gateway_error(
+                status_code=429,
+                tool_id=tool_id,
+                tool_run_id=tool_run_id,
+                trace_id=trace_id,
+                start_ms=start_ms,
+                code="RATE_LIMITED",
+                message="Tool is backing off after worker backpressure",
+                retryable=True,
+                details={"backpressure": True, "reason": "gateway_backoff", "retry_after_ms": int(delay_sec * 1000)},
+                headers={"Retry-After": str(math.ceil(delay_sec))},
+            )
+        await asyncio.sleep(delay_sec)
+
     timeout_sec = app.state.policy.timeout_for(tool)
     deadline_ms = int(time.time() * 1000) + (timeout_sec * 1000)
     worker_payload = {
@@ -199,11 +619,34 @@ async def run_tool(tool_id: str, request: Request):
         },
         "input": input_payload,
     }
+    # Output controls are pushed down so the worker never builds what the
+    # caller did not ask for; paging is handled here.
+    worker_options = options.model_dump(exclude_none=True, exclude={"page_size"}) if options else {}
+    if worker_options:
+        worker_payload["options"] = worker_options
+    paging = {}
+    if options is not None and options.page_size is not None:
+        paging["page_size"] = min(options.page_size, app.state.policies.results.max_page_size)
 
     limiter = app.state.policy.limiter_for(tool_id)
-    async with limiter:
+    async with contextlib.AsyncExitStack() as held:
         try:
-            status_code, worker_json = await call_worker(tool, worker_payload, timeout_sec)
+            await held.enter_async_context(limiter)
+        except LimiterUnavailable as exc:
+            return _gateway_error(
+                status_code=503,
+                tool_id=tool_id,
+                tool_run_id=tool_run_id,
+                trace_id=trace_id,
+                start_ms=start_ms,
+                code="INTERNAL",
+                message=str(exc),
+                retryable=True,
+            )
+        try:
+            status_code, worker_json = await app.state.hedger.call(
+                tool, timeout_sec, lambda target, timeout: call_worker(target, worker_payload, timeout, **paging)
+            )
         except httpx.TimeoutException:
             return _gateway_error(
                 status_code=504,
@@ -215,6 +658,20 @@ async def run_tool(tool_id: str, request: Request):
                 message="Worker request timed out",
                 retryable=True,
             )
+        except ResponseTooLarge as exc:
+            # The same input produces the same output, so retrying is
+            # pointless; the caller has to ask for less.
+            return _gateway_error(
+                status_code=502,
+                tool_id=tool_id,
+                tool_run_id=tool_run_id,
+                trace_id=trace_id,
+                start_ms=start_ms,
+                code="OUTPUT_TOO_LARGE",
+                message=f"Worker output exceeds the {exc.limit} byte limit for this tool",
+                retryable=False,
+                details={"max_bytes": exc.limit, "received_bytes": exc.received},
+            )
         except Exception as exc:
             return _gateway_error(
                 status_code=502,
@@ -245,19 +702,27 @@ async def run_tool(tool_id: str, request: Request):
     worker_run = worker_meta.get("tool_run_id", tool_run_id)
 
     if worker_ok is True:
-        return {
+        output = worker_json.get("output", {})
+        page = worker_json.get("page") if paging else None
+        content = {
             "ok": True,
             "tool_id": tool_id,
             "tool_run_id": worker_run,
-            "output": worker_json.get("output", {}),
+            "output": output,
             "meta": {
                 "trace_id": worker_trace,
                 "duration_ms": max(0, int(time.time() * 1000) - start_ms),
             },
         }
+        if page is not None:
+            content["page"] = page
+        return content
 
     if worker_ok is False:
         worker_error = worker_json.get("error") if isinstance(worker_json.get("error"), dict) else {}
+        worker_details = worker_error.get("details") if isinstance(worker_error.get("details"), dict) else {}
+        if worker_details.get("backpressure") and isinstance(worker_details.get("retry_after_ms"), int):
+            app.state.policy.note_backpressure(tool_id, worker_details["retry_after_ms"])
         return _gateway_error(
             status_code=200,
             tool_id=tool_id,
@@ -267,7 +732,7 @@ async def run_tool(tool_id: str, request: Request):
             code=str(worker_error.get("code", "INTERNAL")),
             message=str(worker_error.get("message", "Worker returned error")),
             retryable=bool(worker_error.get("retryable", False)),
-            details=worker_error.get("details") if isinstance(worker_error.get("details"), dict) else {},
+            details=worker_details,
         )
 
     return _gateway_error(
@@ -280,3 +745,152 @@ async def run_tool(tool_id: str, request: Request):
         message="Worker returned invalid envelope",
         retryable=True,
     )
+
+
+@app.post("/v1/pipelines:run")
+async def run_pipeline(request: Request):
+    ensure_loaded()
+    start_ms = int(time.time() * 1000)
+    trace_id = str(uuid.uuid4())
+    pipeline_run_id = str(uuid.uuid4())
+    if app.state.runs.draining:
+        return _draining_error("", pipeline_run_id, trace_id, start_ms)
+    with app.state.runs.track(pipeline_run_id=pipeline_run_id, trace_id=trace_id):
+        return await _run_pipeline(request, start_ms, trace_id, pipeline_run_id)
+
+
+async def _run_pipeline(request: Request, start_ms: int, trace_id: str, pipeline_run_id: str):
+    def invalid(message: str, details: dict | None = None) -> JSONResponse:
+        return _gateway_error(
+            status_code=400,
+            tool_id="",
+            tool_run_id=pipeline_run_id,
+            trace_id=trace_id,
+            start_ms=start_ms,
+            code="VALIDATION_ERROR",
+            message=message,
+            retryable=False,
+            details=details,
+        )
+
+    if not app.state.policies.pipelines.enabled:
+        return _gateway_error(
+            status_code=404,
+            tool_id="",
+            tool_run_id=pipeline_run_id,
+            trace_id=trace_id,
+            start_ms=start_ms,
+            code="NOT_FOUND",
+            message="Pipelines are disabled for this domain",
+            retryable=False,
+        )
+    try:
+        raw_body = await request.body()
+        spec = PipelineRequest.model_validate(await loads_sized(raw_body))
+    except OptionsValidationError as exc:
+        return invalid("Invalid pipeline", {"errors": exc.errors(include_url=False, include_context=False)})
+    except ValueError:
+        return invalid("Request body must be valid JSON")
+    try:
+        order, outputs = plan(spec, set(_tool_map()), app.state.policies.pipelines.max_steps)
+    except PipelineError as exc:
+        return invalid(str(exc))
+
+    async def invoke(step: PipelineStep, input_payload: dict) -> StepResult:
+        # Each step is a normal run: schema validation, health, backpressure
+        # and the tool's limiter all apply, so independent steps run
+        # concurrently only as far as the limits allow.
+        step_start_ms = int(time.time() * 1000)
+        tool_run_id = str(uuid.uuid4())
+        with app.state.runs.track(
+            tool_run_id=tool_run_id, tool_id=step.tool_id, trace_id=trace_id, pipeline_run_id=pipeline_run_id
+        ):
+            result = await _invoke_tool(
+                _tool_map()[step.tool_id],
+                input_payload,
+                step.options,
+                estimate_size(input_payload),
+                step_start_ms,
+                trace_id,
+                tool_run_id,
+            )
+        duration_ms = max(0, int(time.time() * 1000) - step_start_ms)
+        if isinstance(result, JSONResponse):
+            return StepResult(ok=False, error=_error_body(result), tool_run_id=tool_run_id, duration_ms=duration_ms)
+        return StepResult(
+            ok=True,
+            output=result["output"],
+            tool_run_id=result["tool_run_id"],
+            duration_ms=duration_ms,
+            page=result.get("page"),
+        )
+
+    results = await execute(order, invoke)
+    # Only the requested outputs leave the gateway; worker outputs that are
+    # still pre-encoded bytes are spliced in without decoding.
+    step_outputs = {step_id: results[step_id].output for step_id in outputs if results[step_id].ok}
+    return await json_response(
+        {
+            "ok": all(result.ok for result in results.values()),
+            "pipeline_run_id": pipeline_run_id,
+            "outputs": RawJSON(render_json(step_outputs)),
+            "steps": {step_id: result.summary() for step_id, result in results.items()},
+            "meta": {
+                "trace_id": trace_id,
+                "duration_ms": max(0, int(time.time() * 1000) - start_ms),
+            },
+        }
+    )
+
+
+@app.get("/v1/runs/{tool_run_id}/items")
+async def run_items(tool_run_id: str, cursor: str):
+    ensure_loaded()
+    start_ms = int(time.time() * 1000)
+    trace_id = str(uuid.uuid4())
+
+    try:
+        cursor_run_id, offset, page_size = decode_cursor(cursor)
+    except CursorError:
+        cursor_run_id = None
+    if cursor_run_id != tool_run_id:
+        return _gateway_error(
+            status_code=400,
+            tool_id="",
+            tool_run_id=tool_run_id,
+            trace_id=trace_id,
+            start_ms=start_ms,
+            code="VALIDATION_ERROR",
+            message="Invalid cursor for this run",
+            retryable=False,
+        )
+
+    # Cursors are not signed, so the page size they carry is only a request.
+    page_size = min(page_size, app.state.policies.results.max_page_size)
+    page = await app.state.results.page(tool_run_id, offset, page_size)
+    if page is None:
+        return _gateway_error(
+            status_code=404,
+            tool_id="",
+            tool_run_id=tool_run_id,
+            trace_id=trace_id,
+            start_ms=start_ms,
+            code="NOT_FOUND",
+            message="Run results not found or expired",
+            retryable=False,
+        )
+
+    tool_id, items, page_info = page
+    return await json_response(
+        {
+            "ok": True,
+            "tool_id": tool_id,
+            "tool_run_id": tool_run_id,
+            "items": items,
+            "page": page_info,
+            "meta": {
+                "trace_id": trace_id,
+                "duration_ms": max(0, int(time.time() * 1000) - start_ms),
+            },
+        }
+    )
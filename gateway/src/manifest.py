@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 from src.models import DomainManifest, DomainPolicies
+from src.schemas import register_schemas
+from src.snapshot import (
+    DEFAULT_SNAPSHOT_NAME,
+    DomainSnapshot,
+    SnapshotError,
+    encode_snapshot,
+    read_header,
+    read_snapshot,
+    schema_refs,
+    source_changed,
+    source_stamp,
+    write_snapshot,
+)
 
+# Bump when the cache layout changes; old entries are then simply missed.
+CONFIG_CACHE_VERSION = 2
 
-def _load_yaml(path: Path) -> dict[str, Any]:
+
+def _read_bytes(path: Path) -> bytes:
     if not path.exists():
         raise FileNotFoundError(f"YAML file not found: {path}")
-    with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    if not isinstance(data, dict):
+    return path.read_bytes()
+
+
+def _parse_yaml(data: bytes, path: Path) -> dict[str, Any]:
+    # PyYAML is only needed on a cache miss; the C loader is several times
+    # faster than the pure-Python one when libyaml is available.
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    parsed = yaml.load(data, Loader=loader) or {}
+    if not isinstance(parsed, dict):
         raise ValueError(f"YAML root must be object: {path}")
-    return data
+    return parsed
+
+
+def _load_yaml(path: Path) -> dict[str, Any]:
+    return _parse_yaml(_read_bytes(path), path)
 
 
 def resolve_domain_paths() -> tuple[str, Path, Path]:
@@ -38,8 +66,150 @@ def load_policies(path: str | Path) -> DomainPolicies:
     return DomainPolicies.model_validate(_load_yaml(Path(path)))
 
 
+def config_cache_dir() -> Path | None:
+    value = os.getenv("GATEWAY_CONFIG_CACHE_DIR")
+    if value is None:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(base) / "ax-gateway" / "config"
+    if value.strip().lower() in {"", "0", "off", "false"}:
+        return None
+    return Path(value)
+
+
+def _private(path: Path) -> bool:
+    # Cache entries are trusted as validated config, so only files this user
+    # wrote, in a directory no one else can write to, are used.
+    try:
+        for st in (path.parent.stat(), path.lstat()):
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _cache_key(manifest_bytes: bytes, policies_bytes: bytes) -> str:
+    digest = hashlib.sha256(f"v{CONFIG_CACHE_VERSION}\0".encode())
+    for data in (manifest_bytes, policies_bytes):
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _read_cache(path: Path, key: str) -> tuple[DomainManifest, DomainPolicies] | None:
+    # The cache holds validated config as JSON, keyed by the YAML contents, so
+    # a hit skips YAML parsing. It is re-validated on load, which keeps it
+    # correct across model changes and still costs far less than YAML.
+    if not _private(path):
+        return None
+    try:
+        data = json.loads(path.read_bytes())
+        if data["key"] != key:
+            return None
+        return DomainManifest.model_validate(data["manifest"]), DomainPolicies.model_validate(data["policies"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cache(path: Path, key: str, manifest: DomainManifest, policies: DomainPolicies) -> None:
+    data = json.dumps(
+        {"key": key, "manifest": manifest.model_dump(mode="json"), "policies": policies.model_dump(mode="json")},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        if not _private(tmp):
+            tmp.unlink()
+            return
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def snapshot_path(manifest_path: Path) -> Path | None:
+    value = os.getenv("GATEWAY_DOMAIN_SNAPSHOT")
+    if value is None:
+        return manifest_path.parent / DEFAULT_SNAPSHOT_NAME
+    if value.strip().lower() in {"", "0", "off", "false"}:
+        return None
+    return Path(value)
+
+
+def build_domain_snapshot(manifest_path: Path, policies_path: Path, output: Path) -> dict[str, Any]:
+    manifest_bytes = _read_bytes(manifest_path)
+    policies_bytes = _read_bytes(policies_path)
+    manifest = DomainManifest.model_validate(_parse_yaml(manifest_bytes, manifest_path))
+    policies = DomainPolicies.model_validate(_parse_yaml(policies_bytes, policies_path))
+    sources = {
+        "manifest": source_stamp(manifest_path, manifest_bytes),
+        "policies": source_stamp(policies_path, policies_bytes),
+    }
+    schemas: dict[str, dict[str, Any]] = {}
+    for ref in schema_refs(manifest):
+        path = manifest_path.parent / ref
+        if not path.exists():
+            continue
+        data = path.read_bytes()
+        schema = json.loads(data)
+        from jsonschema import validators
+
+        validators.validator_for(schema).check_schema(schema)
+        schemas[ref] = schema
+        sources[f"schema:{ref}"] = source_stamp(path, data)
+    write_snapshot(output, encode_snapshot(manifest, policies, schemas, sources))
+    return read_header(output)
+
+
+def _snapshot_stale(snapshot: DomainSnapshot, manifest_path: Path, policies_path: Path) -> bool:
+    # A deploy may ship only the snapshot. Source files that are present must
+    # match what the snapshot was built from, so editing YAML or a schema
+    # without rebuilding falls back to the sources instead of serving old config.
+    sources = snapshot.header.get("sources") or {}
+    if source_changed(manifest_path, sources.get("manifest")) or source_changed(policies_path, sources.get("policies")):
+        return True
+    domain_dir = str(manifest_path.parent)
+    return any(source_changed(os.path.join(domain_dir, ref), sources.get(f"schema:{ref}")) for ref in snapshot.schemas)
+
+
+def _load_snapshot(manifest_path: Path, policies_path: Path) -> DomainSnapshot | None:
+    path = snapshot_path(manifest_path)
+    if path is None or not path.exists():
+        return None
+    try:
+        snapshot = read_snapshot(path)
+    except (OSError, ValueError) as exc:
+        if not manifest_path.exists():
+            raise SnapshotError(f"Failed to load domain snapshot {path}: {exc}") from exc
+        return None
+    if _snapshot_stale(snapshot, manifest_path, policies_path):
+        return None
+    return snapshot
+
+
 def load_domain_config() -> tuple[DomainManifest, DomainPolicies]:
     _domain_id, manifest_path, policies_path = resolve_domain_paths()
-    manifest = load_manifest(manifest_path)
-    policies = load_policies(policies_path)
-    return manifest, policies
\ No newline at end of file
+    snapshot = _load_snapshot(manifest_path, policies_path)
+    register_schemas(manifest_path.parent, snapshot.schemas if snapshot else {})
+    if snapshot is not None:
+        return snapshot.manifest, snapshot.policies
+
+    manifest_bytes = _read_bytes(manifest_path)
+    policies_bytes = _read_bytes(policies_path)
+
+    cache_dir = config_cache_dir()
+    cache_key = _cache_key(manifest_bytes, policies_bytes)
+    cache_path = cache_dir / f"{cache_key}.json" if cache_dir else None
+    if cache_path is not None:
+        cached = _read_cache(cache_path, cache_key)
+        if cached is not None:
+            return cached
+
+    manifest = DomainManifest.model_validate(_parse_yaml(manifest_bytes, manifest_path))
+    policies = DomainPolicies.model_validate(_parse_yaml(policies_bytes, policies_path))
+    if cache_path is not None:
+        _write_cache(cache_path, cache_key, manifest, policies)
+    return manifest, policies
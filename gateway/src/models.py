@@ -1,14 +1,29 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class TransportConfig(BaseModel):
-    type: str
-    base_url: str
+    type: Literal["http", "uds", "local"] = "http"
+    base_url: str = ""
     endpoint: str
+    replicas: list[str] = Field(default_factory=list)
+    # uds: path of the worker's Unix socket.
+    socket_path: str | None = None
+    # local: "module:attribute" of the worker's ASGI app, extra import paths
+    # and the number of worker processes.
+    app: str | None = None
+    pythonpath: list[str] = Field(default_factory=list)
+    processes: int | None = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def _check_target(self) -> "TransportConfig":
+        required = {"http": "base_url", "uds": "socket_path", "local": "app"}[self.type]
+        if not getattr(self, required):
+            raise ValueError(f"transport.{required} is required for type {self.type!r}")
+        return self
 
 
 class ToolConfig(BaseModel):
@@ -48,11 +63,85 @@ class LoggingConfig(BaseModel):
     include_request_body: bool = False
 
 
+class ResultsConfig(BaseModel):
+    ttl_sec: int = 600
+    max_page_size: int = 1000
+    dir: str | None = None
+
+
+class JournalConfig(BaseModel):
+    enabled: bool = False
+    dir: str | None = None
+    max_file_bytes: int = 64 * 1024 * 1024
+    max_files: int = 10
+    batch_size: int = 256
+    flush_interval_ms: int = 500
+    queue_size: int = 10_000
+
+
+class HealthConfig(BaseModel):
+    enabled: bool = True
+    interval_sec: float = Field(default=10.0, gt=0)
+    jitter_sec: float = Field(default=2.0, ge=0)
+    timeout_sec: float = Field(default=2.0, gt=0)
+    unhealthy_after: int = Field(default=2, ge=1)
+    healthy_after: int = Field(default=1, ge=1)
+    fail_fast: bool = True
+
+
+class HedgePolicy(BaseModel):
+    percentile: float = Field(default=95.0, gt=0, lt=100)
+    budget_ratio: float = Field(default=0.05, ge=0, le=1)
+    min_delay_ms: int = Field(default=50, ge=0)
+    min_samples: int = Field(default=20, ge=1)
+    window: int = Field(default=200, ge=1)
+    max_burst: float = Field(default=10.0, ge=1)
+
+
+class HedgingConfig(BaseModel):
+    per_tool: dict[str, HedgePolicy] = Field(default_factory=dict)
+
+
+class BackpressureConfig(BaseModel):
+    # Longest a run waits for a tool's backoff window to pass before the
+    # gateway answers RATE_LIMITED itself.
+    max_admission_wait_ms: int = Field(default=1000, ge=0)
+    max_retry_after_ms: int = Field(default=60_000, ge=0)
+
+
+class SearchConfig(BaseModel):
+    enabled: bool = True
+    default_limit: int = Field(default=10, ge=1)
+    max_limit: int = Field(default=100, ge=1)
+
+
+class PipelineConfig(BaseModel):
+    enabled: bool = True
+    max_steps: int = Field(default=16, ge=1)
+
+
+class ResponseLimitsConfig(BaseModel):
+    # Worker response bodies: a read past the tool's limit stops with
+    # OUTPUT_TOO_LARGE, and bodies above spill_bytes are buffered in a temp
+    # file instead of memory (0 keeps them all in memory).
+    max_bytes: int = Field(default=64 * 1024 * 1024, ge=1)
+    per_tool_max_bytes: dict[str, int] = Field(default_factory=dict)
+    spill_bytes: int = Field(default=8 * 1024 * 1024, ge=0)
+
+
 class DomainPolicies(BaseModel):
     concurrency: ConcurrencyConfig = Field(default_factory=ConcurrencyConfig)
     timeouts: TimeoutConfig = Field(default_factory=TimeoutConfig)
     network: NetworkConfig = Field(default_factory=NetworkConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    results: ResultsConfig = Field(default_factory=ResultsConfig)
+    journal: JournalConfig = Field(default_factory=JournalConfig)
+    health: HealthConfig = Field(default_factory=HealthConfig)
+    hedging: HedgingConfig = Field(default_factory=HedgingConfig)
+    backpressure: BackpressureConfig = Field(default_factory=BackpressureConfig)
+    search: SearchConfig = Field(default_factory=SearchConfig)
+    pipelines: PipelineConfig = Field(default_factory=PipelineConfig)
+    responses: ResponseLimitsConfig = Field(default_factory=ResponseLimitsConfig)
 
 
 class DomainIdentity(BaseModel):
@@ -60,6 +149,13 @@ class DomainIdentity(BaseModel):
     version: str
 
 
+class ToolHealth(BaseModel):
+    status: Literal["healthy", "unhealthy", "unknown"]
+    checked_at_ms: int | None = None
+    latency_ms: int | None = None
+    error: str | None = None
+
+
 class ToolCatalogItem(BaseModel):
     tool_id: str
     kind: str
@@ -72,6 +168,7 @@ class ToolCatalogItem(BaseModel):
     transport_endpoint: str | None = None
     input_schema_ref: str | None = None
     output_schema_ref: str | None = None
+    health: ToolHealth | None = None
 
 
 class ToolCatalog(BaseModel):
@@ -80,6 +177,51 @@ class ToolCatalog(BaseModel):
     tools: list[ToolCatalogItem]
 
 
+class ToolSearchHit(ToolCatalogItem):
+    score: float
+
+
+class ToolSearchResult(BaseModel):
+    domain_id: str
+    version: str
+    query: str
+    total: int
+    tools: list[ToolSearchHit]
+
+
+class OutputOptions(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    fields: list[str] | None = None
+    max_items: int | None = Field(default=None, ge=1)
+    max_item_bytes: int | None = Field(default=None, ge=1)
+    max_total_bytes: int | None = Field(default=None, ge=1)
+    page_size: int | None = Field(default=None, ge=1)
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        if isinstance(value, str):
+            return [f.strip() for f in value.split(",") if f.strip()]
+        return value
+
+
+class PipelineStep(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: str = Field(pattern=r"^[A-Za-z_][\w-]*$", max_length=64)
+    tool_id: str
+    input: dict[str, Any]
+    options: dict[str, Any] | None = None
+
+
+class PipelineRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    steps: list[PipelineStep] = Field(min_length=1)
+    outputs: list[str] | None = None
+
+
 class WorkerError(BaseModel):
     code: str
     message: str
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any
+
+import ax_common.offload as shared
+from ax_common.offload import RawJSON, dump_bytes, run_cpu
+
+
+def split_envelope(data: bytes) -> Any:
+    # Runs in the process pool: only the small envelope fields come back as
+    # Python objects, the output travels as pre-encoded bytes.
+    envelope = json.loads(data)
+    if isinstance(envelope, dict) and "output" in envelope:
+        envelope["output"] = RawJSON(dump_bytes(envelope["output"]))
+    return envelope
+
+
+class SpooledBody:
+    # A response body kept in a temp file instead of memory. Only the path
+    # crosses process boundaries; the pool process that parses it reads the
+    # file itself.
+    def __init__(self, path: str, size: int) -> None:
+        self.path = path
+        self.size = size
+
+    @classmethod
+    def write(cls, data: bytes) -> "SpooledBody":
+        with tempfile.NamedTemporaryFile(prefix="ax-body-", suffix=".json", delete=False) as handle:
+            handle.write(data)
+        return cls(handle.name, len(data))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as handle:
+            return handle.read()
+
+    def close(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def split_envelope_file(path: str) -> Any:
+    with open(path, "rb") as handle:
+        return split_envelope(handle.read())
+
+
+def materialize(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, RawJSON) else value
+
+
+async def loads_envelope(data: bytes | SpooledBody) -> Any:
+    if isinstance(data, SpooledBody):
+        try:
+            return await run_cpu(data.size, split_envelope_file, data.path)
+        finally:
+            data.close()
+    if len(data) < shared.OFFLOAD_MIN_BYTES:
+        return json.loads(data)
+    return await run_cpu(len(data), split_envelope, data)
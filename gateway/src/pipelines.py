@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
+
+from ax_common.offload import RawJSON, loads_sized
+from src.models import PipelineRequest, PipelineStep
+
+# JSONPath subset for step references: `$.<step>` followed by `.name`,
+# `['name']`, `[index]` (negative counts from the end) or `[*]`, which maps
+# the rest of the path over a list.
+_SEGMENT = re.compile(r"\.([A-Za-z_][\w-]*)|\[(\*|-?\d+)\]|\[(?:'([^']*)'|\"([^\"]*)\")\]")
+WILDCARD = object()
+REF_KEY = "$ref"
+
+
+class PipelineError(ValueError):
+    pass
+
+
+def parse_path(path: str) -> tuple[str, list[Any]]:
+    if not path.startswith("$"):
+        raise PipelineError(f"Reference must start with '$': {path}")
+    segments: list[Any] = []
+    pos = 1
+    while pos < len(path):
+        match = _SEGMENT.match(path, pos)
+        if match is None:
+            raise PipelineError(f"Invalid reference {path!r} at offset {pos}")
+        name, index, quoted_single, quoted_double = match.groups()
+        if index == "*":
+            segments.append(WILDCARD)
+        elif index is not None:
+            segments.append(int(index))
+        else:
+            segments.append(name if name is not None else quoted_single if quoted_single is not None else quoted_double)
+        pos = match.end()
+    if not segments or not isinstance(segments[0], str):
+        raise PipelineError(f"Reference must name a step: {path}")
+    return segments[0], segments[1:]
+
+
+def resolve_path(value: Any, segments: list[Any], path: str) -> Any:
+    for position, segment in enumerate(segments):
+        if segment is WILDCARD:
+            if not isinstance(value, list):
+                raise PipelineError(f"{path}: [*] applied to a non-list")
+            rest = segments[position + 1 :]
+            return [resolve_path(item, rest, path) for item in value]
+        try:
+            if isinstance(segment, int):
+                if not isinstance(value, list):
+                    raise TypeError
+                value = value[segment]
+            else:
+                if not isinstance(value, dict):
+                    raise TypeError
+                value = value[segment]
+        except (IndexError, KeyError, TypeError):
+            raise PipelineError(f"{path}: no value at segment {segment!r}") from None
+    return value
+
+
+def _ref(value: Any) -> str | None:
+    if isinstance(value, dict) and len(value) == 1 and isinstance(value.get(REF_KEY), str):
+        return value[REF_KEY]
+    return None
+
+
+def find_refs(value: Any) -> Iterator[str]:
+    ref = _ref(value)
+    if ref is not None:
+        yield ref
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from find_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from find_refs(item)
+
+
+def substitute(value: Any, resolved: dict[str, Any]) -> Any:
+    ref = _ref(value)
+    if ref is not None:
+        return resolved[ref]
+    if isinstance(value, dict):
+        return {key: substitute(item, resolved) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute(item, resolved) for item in value]
+    return value
+
+
+@dataclass
+class PlannedStep:
+    step: PipelineStep
+    refs: dict[str, tuple[str, list[Any]]]
+    depends_on: set[str]
+
+
+@dataclass
+class StepResult:
+    ok: bool
+    output: Any = None
+    error: dict[str, Any] | None = None
+    tool_run_id: str | None = None
+    duration_ms: int = 0
+    skipped: bool = False
+    page: dict[str, Any] | None = None
+
+    def summary(self) -> dict[str, Any]:
+        summary: dict[str, Any] = {"ok": self.ok, "duration_ms": self.duration_ms}
+        if self.tool_run_id is not None:
+            summary["tool_run_id"] = self.tool_run_id
+        if self.skipped:
+            summary["skipped"] = True
+        if self.error is not None:
+            summary["error"] = self.error
+        if self.page is not None:
+            summary["page"] = self.page
+        return summary
+
+
+def plan(request: PipelineRequest, known_tools: set[str], max_steps: int) -> tuple[list[PlannedStep], list[str]]:
+    if len(request.steps) > max_steps:
+        raise PipelineError(f"Pipeline has {len(request.steps)} steps; at most {max_steps} are allowed")
+    steps: dict[str, PlannedStep] = {}
+    for step in request.steps:
+        if step.id in steps:
+            raise PipelineError(f"Duplicate step id: {step.id}")
+        if step.tool_id not in known_tools:
+            raise PipelineError(f"Step {step.id}: unknown tool_id {step.tool_id}")
+        refs = {path: parse_path(path) for path in find_refs(step.input)}
+        steps[step.id] = PlannedStep(step=step, refs=refs, depends_on={target for target, _ in refs.values()})
+
+    for planned in steps.values():
+        for target in planned.depends_on:
+            if target not in steps:
+                raise PipelineError(f"Step {planned.step.id} references unknown step {target}")
+
+    # Kahn's algorithm: the order is only used to validate the graph and to
+    # start tasks; each step then waits on its own dependencies.
+    dependents: dict[str, list[str]] = defaultdict(list)
+    for step_id, planned in steps.items():
+        for target in planned.depends_on:
+            dependents[target].append(step_id)
+    indegree = {step_id: len(planned.depends_on) for step_id, planned in steps.items()}
+    ready = deque(step_id for step_id, count in indegree.items() if count == 0)
+    order: list[PlannedStep] = []
+    while ready:
+        step_id = ready.popleft()
+        order.append(steps[step_id])
+        for other in dependents[step_id]:
+            indegree[other] -= 1
+            if indegree[other] == 0:
+                ready.append(other)
+    if len(order) != len(steps):
+        cycle = sorted(step_id for step_id, count in indegree.items() if count)
+        raise PipelineError(f"Pipeline has a cycle through steps: {', '.join(cycle)}")
+
+    outputs = request.outputs
+    if outputs is None:
+        # Default to the sinks: steps nothing else reads from.
+        used = {target for planned in steps.values() for target in planned.depends_on}
+        outputs = [step_id for step_id in steps if step_id not in used]
+    for step_id in outputs:
+        if step_id not in steps:
+            raise PipelineError(f"Unknown output step: {step_id}")
+    for planned in steps.values():
+        options = planned.step.options or {}
+        if options.get("page_size") is not None and planned.step.id not in outputs:
+            raise PipelineError(f"Step {planned.step.id}: options.page_size is only allowed on output steps")
+    return order, outputs
+
+
+async def _value(result: StepResult) -> Any:
+    # Outputs of large envelopes arrive as pre-encoded bytes; decode them
+    # only if a later step actually reads from them.
+    if isinstance(result.output, RawJSON):
+        result.output = await loads_sized(bytes(result.output))
+    return result.output
+
+
+async def execute(
+    order: list[PlannedStep],
+    invoke: Callable[[PipelineStep, dict[str, Any]], Awaitable[StepResult]],
+) -> dict[str, StepResult]:
+    tasks: dict[str, asyncio.Task[StepResult]] = {}
+
+    async def run(planned: PlannedStep) -> StepResult:
+        dependencies = {step_id: await tasks[step_id] for step_id in planned.depends_on}
+        failed = sorted(step_id for step_id, result in dependencies.items() if not result.ok)
+        if failed:
+            return StepResult(
+                ok=False,
+                skipped=True,
+                error={"code": "SKIPPED", "message": f"Dependency failed: {', '.join(failed)}", "retryable": False},
+            )
+        try:
+            resolved = {
+                path: resolve_path(await _value(dependencies[target]), segments, path)
+                for path, (target, segments) in planned.refs.items()
+            }
+        except PipelineError as exc:
+            return StepResult(ok=False, error={"code": "VALIDATION_ERROR", "message": str(exc), "retryable": False})
+        return await invoke(planned.step, substitute(planned.step.input, resolved))
+
+    # Dependencies come first in `order`, so every task a step awaits exists
+    # before the step starts running.
+    for planned in order:
+        tasks[planned.step.id] = asyncio.ensure_future(run(planned))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return {planned.step.id: tasks[planned.step.id].result() for planned in order}
+
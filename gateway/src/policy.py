@@ -1,29 +1,50 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 
+from src.coordinator import SharedLimiter, coordinator_socket
 from src.models import DomainPolicies, ToolConfig
 
 
 @dataclass
 class PolicyEnforcer:
-    tool_limiters: dict[str, asyncio.Semaphore]
+    tool_limiters: dict[str, asyncio.Semaphore | SharedLimiter]
     default_tool_timeout_sec: int
+    max_retry_after_ms: int = 60_000
+    paused_until: dict[str, float] = field(default_factory=dict)
 
     @classmethod
     def from_config(cls, policies: DomainPolicies, tools: list[ToolConfig]) -> "PolicyEnforcer":
-        tool_limiters: dict[str, asyncio.Semaphore] = {}
+        # In multi-process mode the limits are enforced by the shared coordinator
+        # so that adding processes does not multiply per_tool_max_inflight.
+        socket_path = coordinator_socket()
+        tool_limiters: dict[str, asyncio.Semaphore | SharedLimiter] = {}
         for tool in tools:
             tool_limit = policies.concurrency.per_tool_max_inflight.get(tool.tool_id, 1)
-            tool_limiters[tool.tool_id] = asyncio.Semaphore(max(1, tool_limit))
+            if socket_path:
+                tool_limiters[tool.tool_id] = SharedLimiter(socket_path, tool.tool_id, tool_limit)
+            else:
+                tool_limiters[tool.tool_id] = asyncio.Semaphore(max(1, tool_limit))
         return cls(
             tool_limiters=tool_limiters,
             default_tool_timeout_sec=max(1, policies.timeouts.default_tool_timeout_sec),
+            max_retry_after_ms=policies.backpressure.max_retry_after_ms,
         )
 
-    def limiter_for(self, tool_id: str) -> asyncio.Semaphore:
+    def limiter_for(self, tool_id: str) -> asyncio.Semaphore | SharedLimiter:
         return self.tool_limiters.setdefault(tool_id, asyncio.Semaphore(1))
 
     def timeout_for(self, tool: ToolConfig) -> int:
-        return max(1, tool.timeout_sec or self.default_tool_timeout_sec)
\ No newline at end of file
+        return max(1, tool.timeout_sec or self.default_tool_timeout_sec)
+
+    def note_backpressure(self, tool_id: str, retry_after_ms: int) -> None:
+        # A worker asked us to back off: hold new admissions for this tool
+        # until the hint expires (capped, so a bad hint cannot stall a tool).
+        retry_after_ms = min(max(0, retry_after_ms), self.max_retry_after_ms)
+        until = time.monotonic() + retry_after_ms / 1000
+        self.paused_until[tool_id] = max(self.paused_until.get(tool_id, 0.0), until)
+
+    def admission_delay(self, tool_id: str) -> float:
+        return max(0.0, self.paused_until.get(tool_id, 0.0) - time.monotonic())
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def ensure_private_dir(path: str | Path) -> Path:
+    # For files other local users must neither read nor plant (journals,
+    # stored results). A directory we did not create is refused unless this
+    # user owns it and nobody else has access.
+    path = Path(path)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = path.stat()
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} must be owned by uid {os.getuid()} with mode 0700")
+    return path
+
+
+def state_dir(name: str) -> Path:
+    base = os.getenv("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return Path(base) / "ax-gateway" / name
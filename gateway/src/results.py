@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import json
+import os
+import secrets
+import struct
+import time
+from pathlib import Path
+from typing import Any
+
+from ax_common.offload import OFFLOAD_MIN_BYTES, RawJSON, dump_bytes, run_cpu
+from src.offload import SpooledBody
+from src.private_dir import ensure_private_dir, state_dir
+
+_OFFSET = struct.Struct("<Q")
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(run_id: str, offset: int, page_size: int) -> str:
+    raw = json.dumps({"r": run_id, "o": offset, "n": page_size}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        run_id, offset, page_size = str(data["r"]), int(data["o"]), int(data["n"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise CursorError("Malformed cursor") from exc
+    if offset < 0 or page_size < 1:
+        raise CursorError("Malformed cursor")
+    return run_id, offset, page_size
+
+
+def _path(root: Path, run_id: str) -> Path:
+    # Run ids come from the gateway or worker; keep them from escaping root.
+    safe = "".join(c for c in run_id if c.isalnum() or c in "-_")
+    return root / f"{safe}.items"
+
+
+# File layout: items as JSON lines, then a fixed-width offset index (one entry
+# per item plus the end), then a small JSON meta block and a footer pointing
+# at both. Everything lives in one file that is renamed into place, so a run
+# written twice (e.g. by both legs of a hedge) is never seen half old, half new.
+_FOOTER = struct.Struct("<QQQ")
+
+
+def _write_items(path: Path, items: list[Any], meta: dict[str, Any]) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            offsets = []
+            for item in items:
+                offsets.append(f.tell())
+                f.write(dump_bytes(item) + b"\n")
+            offsets.append(f.tell())
+            index_offset = f.tell()
+            f.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+            meta_bytes = dump_bytes(meta)
+            f.write(meta_bytes)
+            f.write(_FOOTER.pack(index_offset, len(items), len(meta_bytes)))
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _open_private(path: Path):
+    # Only files this user wrote are served; anything else in the directory
+    # is treated as missing.
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+    st = os.fstat(fd)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        os.close(fd)
+        raise PermissionError(f"{path} is not private to this user")
+    return os.fdopen(fd, "rb")
+
+
+def _read_footer(f) -> tuple[int, int, dict[str, Any]]:
+    f.seek(-_FOOTER.size, os.SEEK_END)
+    index_offset, count, meta_length = _FOOTER.unpack(f.read(_FOOTER.size))
+    f.seek(-_FOOTER.size - meta_length, os.SEEK_END)
+    return index_offset, count, json.loads(f.read(meta_length))
+
+
+def spill_output(
+    root: str, run_id: str, tool_id: str, output: Any, page_size: int, ttl_sec: int
+) -> tuple[RawJSON, dict[str, Any]] | None:
+    items = output.get("items") if isinstance(output, dict) else None
+    if not isinstance(items, list) or len(items) <= page_size:
+        return None
+    path = _path(ensure_private_dir(root), run_id)
+    _write_items(path, items, {"tool_id": tool_id, "expires_at": time.time() + ttl_sec})
+    first_page = RawJSON(dump_bytes({**output, "items": items[:page_size]}))
+    return first_page, {
+        "total_items": len(items),
+        "page_size": page_size,
+        "next_cursor": encode_cursor(run_id, page_size, page_size),
+    }
+
+
+def split_paged_envelope(
+    source: bytes | str, root: str, tool_id: str, run_id: str, page_size: int, ttl_sec: int
+) -> Any:
+    # Runs in the offload pool for large bodies, reading a spilled body from
+    # its file: a paged output goes straight to disk and only the first page
+    # travels back, so the gateway process never holds the whole output.
+    if isinstance(source, str):
+        with open(source, "rb") as handle:
+            source = handle.read()
+    envelope = json.loads(source)
+    if not isinstance(envelope, dict) or "output" not in envelope:
+        return envelope
+    envelope.pop("page", None)
+    output = envelope["output"]
+    if envelope.get("ok") is True:
+        meta = envelope.get("meta") if isinstance(envelope.get("meta"), dict) else {}
+        try:
+            paged = spill_output(root, str(meta.get("tool_run_id") or run_id), tool_id, output, page_size, ttl_sec)
+        except OSError:
+            # Storage trouble: return the output unpaged instead of failing the run.
+            paged = None
+        if paged is not None:
+            envelope["output"], envelope["page"] = paged
+            return envelope
+    envelope["output"] = RawJSON(dump_bytes(output))
+    return envelope
+
+
+def read_page(root: str, run_id: str, offset: int, page_size: int) -> tuple[str, RawJSON, dict[str, Any]] | None:
+    try:
+        path = _path(ensure_private_dir(root), run_id)
+        with _open_private(path) as f:
+            index_offset, total, meta = _read_footer(f)
+            if meta["expires_at"] < time.time():
+                return None
+            start, end = min(offset, total), min(offset + page_size, total)
+            f.seek(index_offset + start * _OFFSET.size)
+            (start_byte,) = _OFFSET.unpack(f.read(_OFFSET.size))
+            f.seek(index_offset + end * _OFFSET.size)
+            (end_byte,) = _OFFSET.unpack(f.read(_OFFSET.size))
+            f.seek(start_byte)
+            lines = f.read(end_byte - start_byte).splitlines()
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+    return str(meta.get("tool_id", "")), RawJSON(b"[" + b",".join(lines) + b"]"), {
+        "total_items": total,
+        "page_size": page_size,
+        "next_cursor": encode_cursor(run_id, end, page_size) if end < total else None,
+    }
+
+
+def purge_expired(root: str) -> int:
+    removed = 0
+    now = time.time()
+    for path in Path(root).glob("*.items"):
+        try:
+            with _open_private(path) as f:
+                expired = _read_footer(f)[2]["expires_at"] < now
+        except PermissionError:
+            continue
+        except (OSError, ValueError, KeyError, struct.error):
+            expired = True
+        if expired:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+class ResultStore:
+    def __init__(self, root: str | None, ttl_sec: int, purge_interval_sec: int = 60) -> None:
+        self.root = root or os.getenv("GATEWAY_RESULTS_DIR") or str(state_dir("results"))
+        self.ttl_sec = ttl_sec
+        self.purge_interval_sec = purge_interval_sec
+        self._last_purge = 0.0
+
+    async def load_envelope(self, content: bytes | SpooledBody, tool_id: str, run_id: str, page_size: int) -> Any:
+        args = (self.root, tool_id, run_id, page_size, self.ttl_sec)
+        if isinstance(content, SpooledBody):
+            try:
+                envelope = await run_cpu(content.size, split_paged_envelope, content.path, *args)
+            finally:
+                content.close()
+        elif len(content) < OFFLOAD_MIN_BYTES:
+            # Small enough to parse in-process, but still file IO.
+            envelope = await asyncio.to_thread(split_paged_envelope, content, *args)
+        else:
+            envelope = await run_cpu(len(content), split_paged_envelope, content, *args)
+        if time.time() - self._last_purge > self.purge_interval_sec:
+            self._last_purge = time.time()
+            await asyncio.to_thread(purge_expired, self.root)
+        return envelope
+
+    async def page(self, run_id: str, offset: int, page_size: int) -> tuple[str, RawJSON, dict[str, Any]] | None:
+        # Reads are bounded by one page, so a thread is enough.
+        return await asyncio.to_thread(read_page, self.root, run_id, offset, page_size)
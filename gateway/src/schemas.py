@@ -1,31 +1,73 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from jsonschema import ValidationError, validate
-
 from src.models import ToolConfig
 
 
+# jsonschema is imported on first use: it is one of the slowest imports on the
+# startup path and nothing needs it before the first validation or warm-up.
+class InputValidationError(ValueError):
+    def __init__(self, details: dict[str, Any]) -> None:
+        super().__init__(details.get("message", "Input schema validation failed"))
+        self.details = details
+
+
+# Schemas that came with a domain snapshot, keyed by domain directory; they
+# take precedence over (and may stand in for) the files on disk.
+_snapshot_schemas: dict[Path, Mapping[str, dict[str, Any]]] = {}
+
+
+def register_schemas(domain_dir: Path, schemas: Mapping[str, dict[str, Any]]) -> None:
+    if schemas:
+        _snapshot_schemas[domain_dir] = schemas
+    else:
+        _snapshot_schemas.pop(domain_dir, None)
+    compiled_validator.cache_clear()
+
+
 def load_schema(domain_dir: Path, schema_ref: str | None) -> dict[str, Any] | None:
     if not schema_ref:
         return None
+    preloaded = _snapshot_schemas.get(domain_dir, {}).get(schema_ref)
+    if preloaded is not None:
+        return preloaded
     schema_path = domain_dir / schema_ref
     if not schema_path.exists():
         return None
     return json.loads(schema_path.read_text(encoding="utf-8"))
 
 
-def validate_tool_input(domain_dir: Path, tool: ToolConfig, payload: dict[str, Any]) -> None:
-    schema = load_schema(domain_dir, tool.input_schema_ref)
+@lru_cache(maxsize=256)
+def compiled_validator(domain_dir: Path, schema_ref: str | None):
+    # Checking the schema against its metaschema costs far more than validating
+    # a typical input, so do it once per schema instead of on every run.
+    schema = load_schema(domain_dir, schema_ref)
     if schema is None:
+        return None
+    from jsonschema import validators
+
+    cls = validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def validate_tool_input(domain_dir: Path, tool: ToolConfig, payload: dict[str, Any]) -> None:
+    validator = compiled_validator(domain_dir, tool.input_schema_ref)
+    if validator is None:
         return
-    validate(instance=payload, schema=schema)
+    from jsonschema import exceptions
+
+    error = exceptions.best_match(validator.iter_errors(payload))
+    if error is not None:
+        raise InputValidationError(validation_error_details(error))
 
 
-def validation_error_details(exc: ValidationError) -> dict[str, Any]:
+def validation_error_details(exc) -> dict[str, Any]:
     return {
         "path": [str(p) for p in exc.path],
         "message": exc.message,
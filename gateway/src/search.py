@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import defaultdict
+
+from src.models import ToolConfig
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Field weights for BM25F-style scoring: a term in the name or a capability
+# says more about a tool than the same term somewhere in its description.
+FIELD_WEIGHTS = {
+    "tool_id": 2.0,
+    "display_name": 2.0,
+    "capabilities": 1.5,
+    "description": 1.0,
+}
+
+
+def tokenize(text: str) -> list[str]:
+    # Splits on anything that is not a letter or digit, so "web_crawl" and
+    # "firecrawl.crawl" match a search for "crawl".
+    return _TOKEN.findall(text.lower())
+
+
+def _fields(tool: ToolConfig) -> dict[str, str]:
+    return {
+        "tool_id": tool.tool_id,
+        "display_name": tool.display_name,
+        "capabilities": " ".join(tool.capabilities),
+        "description": tool.description,
+    }
+
+
+class ToolIndex:
+    # Inverted index over the catalog, built once per loaded config. A query
+    # only touches the postings of its own terms, so cost tracks matches, not
+    # catalog size.
+    def __init__(self, tools: list[ToolConfig], k1: float = 1.2, b: float = 0.75) -> None:
+        self.tools = list(tools)
+        postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        lengths: list[float] = []
+        for doc, tool in enumerate(self.tools):
+            frequencies: dict[str, float] = defaultdict(float)
+            for field, text in _fields(tool).items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    frequencies[term] += weight
+            for term, tf in frequencies.items():
+                postings[term].append((doc, tf))
+            lengths.append(sum(frequencies.values()))
+
+        count = len(self.tools)
+        average = (sum(lengths) / count) if count else 0.0
+        # Everything but the sum over query terms is known here, so each
+        # posting stores its finished idf * BM25 weight.
+        norm = [k1 * (1 - b + b * (length / average if average else 0.0)) for length in lengths]
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        for term, docs in postings.items():
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._postings[term] = [(doc, idf * tf * (k1 + 1) / (tf + norm[doc])) for doc, tf in docs]
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+    def search(self, query: str, limit: int = 10) -> tuple[int, list[tuple[ToolConfig, float]]]:
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for doc, weight in self._postings.get(term, ()):
+                scores[doc] += weight
+        # Ties keep catalog order.
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return len(scores), [(self.tools[doc], score) for doc, score in best]
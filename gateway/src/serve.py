@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from src.coordinator import COORDINATOR_SOCKET_ENV, start_coordinator_thread
+
+
+def main() -> None:
+    host = os.getenv("GATEWAY_HOST", "0.0.0.0")
+    port = int(os.getenv("GATEWAY_PORT", "8000"))
+    workers = max(1, int(os.getenv("GATEWAY_WORKERS", "1")))
+    # uvicorn waits for open requests on shutdown; this bounds the wait.
+    grace = int(float(os.getenv("GATEWAY_DRAIN_GRACE_SEC", "30")))
+
+    if workers == 1:
+        uvicorn.run("src.main:app", host=host, port=port, timeout_graceful_shutdown=grace)
+        return
+
+    # Worker processes inherit the socket path and talk to the coordinator that
+    # lives in this supervisor process.
+    socket_path = os.getenv(COORDINATOR_SOCKET_ENV) or str(
+        Path(tempfile.gettempdir()) / f"ax-gateway-limiter-{os.getpid()}.sock"
+    )
+    os.environ[COORDINATOR_SOCKET_ENV] = socket_path
+    start_coordinator_thread(socket_path)
+    try:
+        uvicorn.run("src.main:app", host=host, port=port, workers=workers, timeout_graceful_shutdown=grace)
+    finally:
+        Path(socket_path).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
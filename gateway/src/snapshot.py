@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.models import DomainManifest, DomainPolicies
+
+# File layout: a fixed preamble (magic, format version, header length and the
+# sha256 of the body), a small JSON header, then the body. The body starts with
+# the validated manifest and policies as one compact JSON document, followed by
+# each referenced schema as its own JSON section; the header holds the
+# (offset, length) of every section. Loading is one read, one hash check and
+# json.loads of the config section. Schemas are decoded on first use, which for
+# large domains is most of the bytes and happens during warm-up, not boot.
+MAGIC = b"AXSNAP"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<6sHI32s")
+
+DEFAULT_SNAPSHOT_NAME = "domain.snapshot"
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class SnapshotSchemas(Mapping[str, dict[str, Any]]):
+    def __init__(self, body: bytes, sections: dict[str, list[int]]) -> None:
+        self._body = body
+        self._sections = sections
+        self._decoded: dict[int, dict[str, Any]] = {}
+
+    def __getitem__(self, ref: str) -> dict[str, Any]:
+        # Refs that share a section share the decoded schema.
+        offset, length = self._sections[ref]
+        schema = self._decoded.get(offset)
+        if schema is None:
+            schema = self._decoded[offset] = json.loads(self._body[offset : offset + length])
+        return schema
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+
+@dataclass
+class DomainSnapshot:
+    header: dict[str, Any]
+    manifest: DomainManifest
+    policies: DomainPolicies
+    schemas: SnapshotSchemas
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def source_stamp(path: Path, data: bytes) -> dict[str, Any]:
+    stat = path.stat()
+    return {"sha256": file_digest(data), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def source_changed(path: str | Path, stamp: dict[str, Any] | None) -> bool:
+    # Same size and mtime as at build time is taken as unchanged, like git's
+    # index; otherwise (e.g. after a fresh checkout) the contents decide.
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    if stamp is None:
+        return True
+    if stat.st_size == stamp.get("size") and stat.st_mtime_ns == stamp.get("mtime_ns"):
+        return False
+    return file_digest(Path(path).read_bytes()) != stamp.get("sha256")
+
+
+def schema_refs(manifest: DomainManifest) -> list[str]:
+    refs = {ref for tool in manifest.tools for ref in (tool.input_schema_ref, tool.output_schema_ref) if ref}
+    return sorted(refs)
+
+
+def _compact(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def encode_snapshot(
+    manifest: DomainManifest,
+    policies: DomainPolicies,
+    schemas: dict[str, dict[str, Any]],
+    sources: dict[str, dict[str, Any]],
+) -> bytes:
+    config = _compact({"manifest": manifest.model_dump(mode="json"), "policies": policies.model_dump(mode="json")})
+    chunks = [config]
+    offset = len(config)
+    sections: dict[str, list[int]] = {}
+    seen: dict[bytes, list[int]] = {}
+    for ref, schema in sorted(schemas.items()):
+        data = _compact(schema)
+        # Tools often share a schema; store each distinct one once.
+        if data not in seen:
+            seen[data] = [offset, len(data)]
+            chunks.append(data)
+            offset += len(data)
+        sections[ref] = seen[data]
+    body = b"".join(chunks)
+    header = _compact(
+        {
+            "format_version": FORMAT_VERSION,
+            "domain_id": manifest.domain_id,
+            "version": manifest.version,
+            "built_at_ms": int(time.time() * 1000),
+            "tools": len(manifest.tools),
+            "body_sha256": file_digest(body),
+            "config": [0, len(config)],
+            "schemas": sections,
+            "sources": sources,
+        }
+    )
+    return _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header), hashlib.sha256(body).digest()) + header + body
+
+
+def _split(data: bytes) -> tuple[dict[str, Any], bytes]:
+    if len(data) < _PREAMBLE.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, format_version, header_length, body_digest = _PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a domain snapshot")
+    if format_version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {format_version} (expected {FORMAT_VERSION})")
+    header_end = _PREAMBLE.size + header_length
+    body = data[header_end:]
+    if hashlib.sha256(body).digest() != body_digest:
+        raise SnapshotError("Snapshot body hash mismatch")
+    return json.loads(data[_PREAMBLE.size : header_end]), body
+
+
+def read_header(path: str | Path) -> dict[str, Any]:
+    header, _body = _split(Path(path).read_bytes())
+    return header
+
+
+def decode_snapshot(data: bytes) -> DomainSnapshot:
+    header, body = _split(data)
+    offset, length = header["config"]
+    # The config was validated when it was built; validating again is cheap
+    # next to YAML and keeps an old snapshot honest against newer models.
+    document = json.loads(body[offset : offset + length])
+    return DomainSnapshot(
+        header=header,
+        manifest=DomainManifest.model_validate(document["manifest"]),
+        policies=DomainPolicies.model_validate(document["policies"]),
+        schemas=SnapshotSchemas(body, header.get("schemas") or {}),
+    )
+
+
+def read_snapshot(path: str | Path) -> DomainSnapshot:
+    return decode_snapshot(Path(path).read_bytes())
+
+
+def write_snapshot(path: str | Path, data: bytes) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from src.manifest import build_domain_snapshot, resolve_domain_paths, snapshot_path
+
+    parser = argparse.ArgumentParser(prog="python -m src.snapshot", description="AX gateway domain snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="compile manifest, policies and schemas into one snapshot")
+    build.add_argument("--output", "-o", help=f"defaults to {DEFAULT_SNAPSHOT_NAME} next to the manifest")
+
+    show = commands.add_parser("inspect", help="verify a snapshot and print its header")
+    show.add_argument("path", nargs="?")
+
+    args = parser.parse_args(argv)
+    _domain_id, manifest_path, policies_path = resolve_domain_paths()
+    if args.command == "build":
+        output = Path(args.output) if args.output else manifest_path.parent / DEFAULT_SNAPSHOT_NAME
+        header = build_domain_snapshot(manifest_path, policies_path, output)
+        print(f"wrote {output} ({header['tools']} tools, {len(header['sources'])} sources)")
+    else:
+        path = args.path or snapshot_path(manifest_path) or manifest_path.parent / DEFAULT_SNAPSHOT_NAME
+        print(json.dumps(read_header(path), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Protocol
+
+import httpx
+
+from src.models import TransportConfig
+from src.offload import SpooledBody
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+ResponseBody = bytes | SpooledBody
+
+
+class ResponseTooLarge(Exception):
+    def __init__(self, limit: int, received: int) -> None:
+        super().__init__(limit, received)
+        self.limit = limit
+        self.received = received
+
+    def __str__(self) -> str:
+        return f"Response body exceeds {self.limit} bytes"
+
+
+class Transport(Protocol):
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        timeout: float,
+        max_bytes: int | None = None,
+        spill_bytes: int | None = None,
+    ) -> tuple[int, ResponseBody]: ...
+
+    async def aclose(self) -> None: ...
+
+
+def transport_key(config: TransportConfig) -> str:
+    # Identifies one worker: tools that share it share a transport, a health
+    # status and a warm-up probe.
+    if config.type == "uds":
+        return f"unix:{config.socket_path}"
+    if config.type == "local":
+        return f"local:{config.app}"
+    return config.base_url.rstrip("/")
+
+
+async def read_body(response: httpx.Response, max_bytes: int | None, spill_bytes: int | None) -> ResponseBody:
+    # The limit is checked as chunks arrive, so an oversized body is never
+    # held in full. Past `spill_bytes` the body goes to a temp file.
+    length = response.headers.get("Content-Length")
+    if max_bytes is not None and length and length.isdigit() and "Content-Encoding" not in response.headers:
+        if int(length) > max_bytes:
+            raise ResponseTooLarge(max_bytes, int(length))
+    chunks: list[bytes] = []
+    size = 0
+    spool = None
+    try:
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise ResponseTooLarge(max_bytes, size)
+            if spool is not None:
+                spool.write(chunk)
+                continue
+            chunks.append(chunk)
+            if spill_bytes is not None and size > spill_bytes:
+                spool = tempfile.NamedTemporaryFile(prefix="ax-body-", suffix=".json", delete=False)
+                spool.writelines(chunks)
+                chunks = []
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            SpooledBody(spool.name, size).close()
+        raise
+    if spool is None:
+        return b"".join(chunks)
+    spool.close()
+    return SpooledBody(spool.name, size)
+
+
+class HttpTransport:
+    def __init__(self, client: httpx.AsyncClient, base_url: str, owns_client: bool = False) -> None:
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+        self._owns_client = owns_client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        timeout: float,
+        max_bytes: int | None = None,
+        spill_bytes: int | None = None,
+    ) -> tuple[int, ResponseBody]:
+        async with self.client.stream(
+            method,
+            f"{self.base_url}{path}",
+            content=body,
+            headers=_JSON_HEADERS if body is not None else None,
+            timeout=timeout,
+        ) as response:
+            return response.status_code, await read_body(response, max_bytes, spill_bytes)
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+
+def uds_transport(config: TransportConfig) -> HttpTransport:
+    # Same HTTP/1.1 exchange as "http", minus TCP: no port, no Nagle, no
+    # loopback checksum work. The host part of the URL is ignored.
+    client = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            uds=config.socket_path,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=64, keepalive_expiry=60.0),
+        )
+    )
+    return HttpTransport(client, "http://worker", owns_client=True)
+
+
+# Per child process: one event loop, an ASGI client per imported worker app,
+# and the apps' entered lifespans.
+_local_loop: asyncio.AbstractEventLoop | None = None
+_local_apps: dict[str, httpx.AsyncClient] = {}
+_local_lifespans = contextlib.AsyncExitStack()
+
+
+def _close_local_apps() -> None:
+    # Runs as the pool child exits, so the worker's shutdown hooks close its
+    # clients and background tasks.
+    if _local_loop is None:
+        return
+    for client in _local_apps.values():
+        _local_loop.run_until_complete(client.aclose())
+    _local_loop.run_until_complete(_local_lifespans.aclose())
+    _local_loop.close()
+
+
+def _local_request(
+    app_path: str,
+    pythonpath: list[str],
+    method: str,
+    path: str,
+    body: bytes | None,
+    max_bytes: int | None = None,
+    spill_bytes: int | None = None,
+) -> tuple[int, ResponseBody]:
+    global _local_loop
+    if _local_loop is None:
+        _local_loop = asyncio.new_event_loop()
+        multiprocessing.util.Finalize(None, _close_local_apps, exitpriority=10)
+    client = _local_apps.get(app_path)
+    if client is None:
+        for entry in pythonpath:
+            if entry not in sys.path:
+                sys.path.insert(0, entry)
+        # This process is already off the gateway's event loop, so the
+        # worker's own offload pool would only add a second hop.
+        os.environ.setdefault("OFFLOAD_MIN_BYTES", str(1 << 62))
+        os.environ.setdefault("OFFLOAD_PROCESSES", "0")
+        module_name, _, attr = app_path.partition(":")
+        app = getattr(importlib.import_module(module_name), attr or "app")
+        # ASGITransport sends no lifespan events, so run the app's startup
+        # hooks (upstream gate, page store, pooled clients) here.
+        router = getattr(app, "router", None)
+        if hasattr(router, "lifespan_context"):
+            _local_loop.run_until_complete(_local_lifespans.enter_async_context(router.lifespan_context(app)))
+        client = _local_apps[app_path] = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://local",
+            headers={"Accept-Encoding": "identity"},
+        )
+    response = _local_loop.run_until_complete(
+        client.request(method, path, content=body, headers=_JSON_HEADERS if body is not None else None)
+    )
+    # The limits are applied here so an oversized or spilled body is not
+    # pickled back to the gateway process.
+    content = response.content
+    if max_bytes is not None and len(content) > max_bytes:
+        raise ResponseTooLarge(max_bytes, len(content))
+    if spill_bytes is not None and len(content) > spill_bytes:
+        return response.status_code, SpooledBody.write(content)
+    return response.status_code, content
+
+
+class LocalTransport:
+    # Runs a Python worker's ASGI app inside a pool of child processes and
+    # calls its handlers directly, so a co-located worker costs one pickle
+    # round trip per call instead of an HTTP exchange. The envelope is the
+    # same JSON either way. Each child runs the worker's startup hooks on
+    # first use and its shutdown hooks when the pool shuts down, and handles
+    # one call at a time.
+    def __init__(self, config: TransportConfig) -> None:
+        self.app_path = config.app
+        self.pythonpath = [os.path.abspath(entry) for entry in config.pythonpath]
+        self.pool = ProcessPoolExecutor(
+            max_workers=max(1, config.processes or min(4, os.cpu_count() or 1)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        timeout: float,
+        max_bytes: int | None = None,
+        spill_bytes: int | None = None,
+    ) -> tuple[int, ResponseBody]:
+        future = self.pool.submit(
+            _local_request, self.app_path, self.pythonpath, method, path, body, max_bytes, spill_bytes
+        )
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except BaseException as exc:
+            # A call already running in a child cannot be interrupted; it
+            # finishes in the background, and a body it spilled is removed then.
+            future.add_done_callback(_discard_late_body)
+            if isinstance(exc, asyncio.TimeoutError):
+                # Match the http transports so run_tool maps it to TIMEOUT.
+                raise httpx.TimeoutException("Local worker call timed out") from exc
+            raise
+
+    async def aclose(self) -> None:
+        # Queued calls are dropped and calls still running are not waited for.
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def close_body(content: ResponseBody) -> None:
+    # For callers that only need the status; a spilled body is removed.
+    if isinstance(content, SpooledBody):
+        content.close()
+
+
+def _discard_late_body(future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    _status_code, content = future.result()
+    close_body(content)
+
+
+def build_transport(config: TransportConfig, http_client: httpx.AsyncClient) -> Transport:
+    if config.type == "http":
+        return HttpTransport(http_client, config.base_url)
+    if config.type == "uds":
+        return uds_transport(config)
+    if config.type == "local":
+        return LocalTransport(config)
+    raise ValueError(f"Unsupported transport type: {config.type}")
+
+
+class TransportRegistry:
+    def __init__(self, http_client: httpx.AsyncClient) -> None:
+        self.http_client = http_client
+        self._transports: dict[tuple[str, str], Transport] = {}
+
+    def for_config(self, config: TransportConfig) -> Transport:
+        key = (config.type, transport_key(config))
+        transport = self._transports.get(key)
+        if transport is None:
+            transport = self._transports[key] = build_transport(config, self.http_client)
+        return transport
+
+    async def request(
+        self,
+        config: TransportConfig,
+        method: str,
+        path: str,
+        body: bytes | None,
+        timeout: float,
+        max_bytes: int | None = None,
+        spill_bytes: int | None = None,
+    ) -> tuple[int, ResponseBody]:
+        return await self.for_config(config).request(method, path, body, timeout, max_bytes, spill_bytes)
+
+    async def aclose(self) -> None:
+        transports, self._transports = list(self._transports.values()), {}
+        await asyncio.gather(*(transport.aclose() for transport in transports), return_exceptions=True)
@@ -0,0 +1,9 @@
+import pytest
+
+
+# Keep the gateway's on-disk state out of the real home and state directories.
+@pytest.fixture(autouse=True)
+def _private_state_dirs(monkeypatch, tmp_path):
+    monkeypatch.setenv("GATEWAY_CONFIG_CACHE_DIR", str(tmp_path / "config-cache"))
+    monkeypatch.setenv("GATEWAY_RESULTS_DIR", str(tmp_path / "results"))
+    monkeypatch.setenv("GATEWAY_JOURNAL_DIR", str(tmp_path / "journal"))
@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src.main import app
+from tools.firecrawl.src.backpressure import Backpressure, UpstreamGate, parse_retry_after
+from tools.firecrawl.src.firecrawl_client import FirecrawlClient, FirecrawlClientError
+
+
+def test_parse_retry_after_forms():
+    assert parse_retry_after("2", 1000) == 2000
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", 1000) == 0
+    assert parse_retry_after("soon", 1000) == 1000
+    assert parse_retry_after(None, 750) == 750
+
+
+@pytest.mark.asyncio
+async def test_upstream_429_defers_later_calls(monkeypatch):
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "dummy")
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(429, headers={"Retry-After": "2"}, json={"error": "slow down"})
+
+    gate = UpstreamGate(max_concurrency=2, max_wait_ms=100)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = FirecrawlClient(http_client=http_client, gate=gate)
+        with pytest.raises(FirecrawlClientError) as first:
+            await client.run({"url": "https://example.com", "mode": "scrape"})
+        with pytest.raises(FirecrawlClientError) as second:
+            await client.run({"url": "https://example.com", "mode": "scrape"})
+
+    assert calls == ["/v1/scrape"]
+    assert first.value.code == "RATE_LIMITED"
+    assert first.value.retryable is True
+    assert first.value.details["retry_after_ms"] == 2000
+    assert first.value.details["upstream"] == {"error": "slow down"}
+    assert second.value.details["reason"] == "upstream_retry_after"
+    assert 0 < second.value.details["retry_after_ms"] <= 2000
+
+
+@pytest.mark.asyncio
+async def test_gate_rejects_when_slots_stay_busy():
+    gate = UpstreamGate(max_concurrency=1, max_wait_ms=50, default_retry_after_ms=300)
+    release = asyncio.Event()
+
+    async def hold():
+        async with gate.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    with pytest.raises(Backpressure) as exc:
+        async with gate.slot():
+            pass
+    release.set()
+    await holder
+
+    assert exc.value.reason == "worker_busy"
+    assert exc.value.retry_after_ms == 300
+    assert gate.snapshot()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_busy_rejection_refunds_rate_token():
+    gate = UpstreamGate(max_concurrency=1, rate_per_sec=1, burst=2, max_wait_ms=50)
+    release = asyncio.Event()
+
+    async def hold():
+        async with gate.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    with pytest.raises(Backpressure) as exc:
+        async with gate.slot():
+            pass
+    release.set()
+    await holder
+
+    assert exc.value.reason == "worker_busy"
+    # The rejected call did not use the remaining token.
+    async with gate.slot():
+        pass
+
+
+@pytest.mark.asyncio
+async def test_gate_rate_limit_spaces_starts():
+    gate = UpstreamGate(max_concurrency=4, rate_per_sec=20, burst=1, max_wait_ms=1000)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(3):
+        async with gate.slot():
+            pass
+    assert loop.time() - started >= 0.09
+
+
+def test_gateway_backs_off_after_worker_backpressure(monkeypatch):
+    calls = []
+
+    async def fake_call_worker(tool, payload, timeout_sec):
+        calls.append(1)
+        return 200, {
+            "ok": False,
+            "meta": payload["meta"],
+            "error": {
+                "code": "RATE_LIMITED",
+                "message": "slow down",
+                "retryable": True,
+                "details": {"backpressure": True, "reason": "upstream_429", "retry_after_ms": 5000},
+            },
+        }
+
+    monkeypatch.setattr("gateway.src.main.call_worker", fake_call_worker)
+    body = {"input": {"url": "https://example.com"}}
+
+    with TestClient(app) as client:
+        first = client.post("/v1/tools/firecrawl.crawl:run", json=body)
+        second = client.post("/v1/tools/firecrawl.crawl:run", json=body)
+
+    assert calls == [1]
+    assert first.json()["error"]["code"] == "RATE_LIMITED"
+    assert first.json()["error"]["details"]["retry_after_ms"] == 5000
+    assert second.status_code == 429
+    assert second.json()["error"]["code"] == "RATE_LIMITED"
+    assert second.json()["error"]["retryable"] is True
+    assert int(second.headers["Retry-After"]) == 5
@@ -0,0 +1,124 @@
+import gzip
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from ax_common.compression import CompressionMiddleware, choose_encoding
+from gateway.src.main import app
+
+
+def _large_worker(tool, payload, timeout_sec):
+    async def fake():
+        return 200, {
+            "ok": True,
+            "meta": {"trace_id": payload["meta"]["trace_id"], "tool_run_id": payload["meta"]["tool_run_id"]},
+            "output": {
+                "source_url": payload["input"]["url"],
+                "items": [{"url": "https://example.com", "title": "t", "content": "# page\n" * 2000, "format": "markdown"}],
+                "stats": {"pages": 1},
+            },
+        }
+
+    return fake()
+
+
+def test_choose_encoding_respects_q_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") is not None
+    assert choose_encoding("") is None
+
+
+def test_large_run_response_is_gzip_encoded(monkeypatch):
+    monkeypatch.setattr("gateway.src.main.call_worker", _large_worker)
+
+    with TestClient(app) as client:
+        resp = client.post(
+            "/v1/tools/firecrawl.crawl:run",
+            json={"input": {"url": "https://example.com"}},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert resp.json()["output"]["items"][0]["content"].startswith("# page")
+
+
+def test_small_response_skips_compression():
+    with TestClient(app) as client:
+        resp = client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+
+
+def test_gzip_request_body_is_decoded(monkeypatch):
+    monkeypatch.setattr("gateway.src.main.call_worker", _large_worker)
+    body = gzip.compress(json.dumps({"input": {"url": "https://example.com"}}).encode("utf-8"))
+
+    with TestClient(app) as client:
+        resp = client.post(
+            "/v1/tools/firecrawl.crawl:run",
+            content=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        unsupported = client.post(
+            "/v1/tools/firecrawl.crawl:run",
+            content=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "compress"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["ok"] is True
+    assert unsupported.status_code == 415
+
+
+def _echo_client(max_request_bytes: int) -> TestClient:
+    async def echo(request: Request) -> Response:
+        return Response(str(len(await request.body())))
+
+    echo_app = Starlette(routes=[Route("/", echo, methods=["POST"])])
+    return TestClient(CompressionMiddleware(echo_app, max_request_bytes=max_request_bytes))
+
+
+def test_request_bodies_over_cap_are_refused():
+    headers = {"Content-Encoding": "gzip"}
+    with _echo_client(1000) as client:
+        small = client.post("/", content=gzip.compress(b"x" * 1000), headers=headers)
+        bomb = client.post("/", content=gzip.compress(b"x" * 100_000), headers=headers)
+        oversized = client.post("/", content=gzip.compress(os.urandom(2000)), headers=headers)
+
+    assert small.status_code == 200 and small.text == "1000"
+    assert bomb.status_code == 400
+    assert oversized.status_code == 413
+
+
+def test_truncated_gzip_is_refused_and_members_are_joined():
+    headers = {"Content-Encoding": "gzip"}
+    with _echo_client(1000) as client:
+        truncated = client.post("/", content=gzip.compress(b"x" * 500)[:-8], headers=headers)
+        members = client.post("/", content=gzip.compress(b"x" * 300) + gzip.compress(b"y" * 300), headers=headers)
+        too_many = client.post("/", content=gzip.compress(b"x" * 600) * 2, headers=headers)
+
+    assert truncated.status_code == 400
+    assert members.status_code == 200 and members.text == "600"
+    assert too_many.status_code == 400
+
+
+def test_brotli_bomb_stops_near_limit():
+    brotli = pytest.importorskip("brotli")
+    from ax_common.compression import _brotli_decode
+
+    data = b"x" * 5000
+    assert _brotli_decode(brotli.compress(data), 5000) == data
+    with pytest.raises(ValueError):
+        _brotli_decode(brotli.compress(os.urandom(5000))[:-100], 5000)
+    with pytest.raises(ValueError):
+        _brotli_decode(brotli.compress(b"\0" * (16 * 1024 * 1024), quality=1), 1024)
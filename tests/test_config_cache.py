@@ -0,0 +1,101 @@
+import shutil
+from pathlib import Path
+
+from gateway.src import manifest as manifest_module
+from gateway.src.manifest import load_domain_config
+
+DOMAIN = Path(__file__).resolve().parents[1] / "domain" / "example_domain"
+
+
+def _use_domain(monkeypatch, tmp_path):
+    domain = tmp_path / "domain"
+    shutil.copytree(DOMAIN, domain)
+    monkeypatch.setenv("DOMAIN_MANIFEST_PATH", str(domain / "manifest.yaml"))
+    monkeypatch.setenv("DOMAIN_POLICIES_PATH", str(domain / "policies.yaml"))
+    monkeypatch.setenv("GATEWAY_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+    return domain
+
+
+def test_second_load_skips_yaml(monkeypatch, tmp_path):
+    _use_domain(monkeypatch, tmp_path)
+    manifest, policies = load_domain_config()
+
+    def no_yaml(data, path):
+        raise AssertionError("YAML parsed on a cache hit")
+
+    monkeypatch.setattr(manifest_module, "_parse_yaml", no_yaml)
+    cached_manifest, cached_policies = load_domain_config()
+
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+    assert cached_manifest == manifest
+    assert cached_policies == policies
+
+
+def test_edited_yaml_misses_cache(monkeypatch, tmp_path):
+    domain = _use_domain(monkeypatch, tmp_path)
+    load_domain_config()
+    policies_path = domain / "policies.yaml"
+    policies_path.write_text(
+        policies_path.read_text(encoding="utf-8").replace("max_inflight: 8", "max_inflight: 3"), encoding="utf-8"
+    )
+
+    _manifest, policies = load_domain_config()
+
+    assert policies.concurrency.max_inflight == 3
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+
+
+def test_cache_can_be_disabled(monkeypatch, tmp_path):
+    _use_domain(monkeypatch, tmp_path)
+    monkeypatch.setenv("GATEWAY_CONFIG_CACHE_DIR", "off")
+
+    load_domain_config()
+
+    assert not (tmp_path / "cache").exists()
+
+
+def _count_yaml_parses(monkeypatch):
+    parses = []
+    parse = manifest_module._parse_yaml
+
+    def counting(data, path):
+        parses.append(path)
+        return parse(data, path)
+
+    monkeypatch.setattr(manifest_module, "_parse_yaml", counting)
+    return parses
+
+
+def test_default_cache_dir_is_private(monkeypatch, tmp_path):
+    _use_domain(monkeypatch, tmp_path)
+    monkeypatch.delenv("GATEWAY_CONFIG_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+
+    load_domain_config()
+
+    cache_dir = tmp_path / "xdg" / "ax-gateway" / "config"
+    assert manifest_module.config_cache_dir() == cache_dir
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert [entry.stat().st_mode & 0o777 for entry in cache_dir.glob("*.json")] == [0o600]
+
+
+def test_untrusted_or_mismatched_entries_are_ignored(monkeypatch, tmp_path):
+    domain = _use_domain(monkeypatch, tmp_path)
+    load_domain_config()
+    cache_dir = tmp_path / "cache"
+    (entry,) = cache_dir.glob("*.json")
+    parses = _count_yaml_parses(monkeypatch)
+
+    cache_dir.chmod(0o777)
+    load_domain_config()
+    assert len(parses) == 2
+
+    # An entry that does not carry its own key is not used.
+    cache_dir.chmod(0o700)
+    policies_path = domain / "policies.yaml"
+    policies_path.write_text(policies_path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    load_domain_config()
+    (other,) = set(cache_dir.glob("*.json")) - {entry}
+    other.write_bytes(entry.read_bytes())
+    load_domain_config()
+    assert len(parses) == 6
@@ -0,0 +1,100 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src import manifest as manifest_module
+from gateway.src.main import app
+from gateway.src.manifest import SnapshotError, build_domain_snapshot, load_domain_config, read_header
+
+DOMAIN = Path(__file__).resolve().parents[1] / "domain" / "example_domain"
+
+
+def _use_domain(monkeypatch, tmp_path):
+    domain = tmp_path / "domain"
+    shutil.copytree(DOMAIN, domain)
+    monkeypatch.setenv("DOMAIN_MANIFEST_PATH", str(domain / "manifest.yaml"))
+    monkeypatch.setenv("DOMAIN_POLICIES_PATH", str(domain / "policies.yaml"))
+    monkeypatch.setenv("GATEWAY_CONFIG_CACHE_DIR", "off")
+    monkeypatch.delenv("GATEWAY_DOMAIN_SNAPSHOT", raising=False)
+    return domain
+
+
+def _build(domain):
+    return build_domain_snapshot(domain / "manifest.yaml", domain / "policies.yaml", domain / "domain.snapshot")
+
+
+def _no_yaml(monkeypatch):
+    def no_yaml(data, path):
+        raise AssertionError("YAML parsed although a snapshot is present")
+
+    monkeypatch.setattr(manifest_module, "_parse_yaml", no_yaml)
+
+
+def test_snapshot_replaces_yaml_and_schema_files(monkeypatch, tmp_path):
+    domain = _use_domain(monkeypatch, tmp_path)
+    expected = load_domain_config()
+    header = _build(domain)
+    (domain / "manifest.yaml").unlink()
+    (domain / "policies.yaml").unlink()
+    shutil.rmtree(domain / "schemas")
+    _no_yaml(monkeypatch)
+
+    manifest, policies = load_domain_config()
+
+    assert (manifest, policies) == expected
+    assert header["domain_id"] == "example_domain"
+    assert sorted(header["sources"]) == [
+        "manifest",
+        "policies",
+        "schema:schemas/firecrawl_crawl_input.json",
+        "schema:schemas/firecrawl_crawl_output.json",
+    ]
+
+    with TestClient(app) as client:
+        invalid = client.post("/v1/tools/firecrawl.crawl:run", json={"input": {}})
+
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "VALIDATION_ERROR"
+
+
+def test_edited_source_falls_back_to_yaml(monkeypatch, tmp_path):
+    domain = _use_domain(monkeypatch, tmp_path)
+    _build(domain)
+    policies_path = domain / "policies.yaml"
+    policies_path.write_text(
+        policies_path.read_text(encoding="utf-8").replace("max_inflight: 8", "max_inflight: 3"), encoding="utf-8"
+    )
+
+    _manifest, policies = load_domain_config()
+
+    assert policies.concurrency.max_inflight == 3
+
+
+def test_corrupt_snapshot(monkeypatch, tmp_path):
+    domain = _use_domain(monkeypatch, tmp_path)
+    _build(domain)
+    snapshot = domain / "domain.snapshot"
+    data = bytearray(snapshot.read_bytes())
+    data[-2] ^= 0xFF
+    snapshot.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotError):
+        read_header(snapshot)
+    assert load_domain_config()[1].concurrency.max_inflight == 8
+
+    (domain / "manifest.yaml").unlink()
+    with pytest.raises(SnapshotError):
+        load_domain_config()
+
+
+def test_snapshot_can_be_disabled(monkeypatch, tmp_path):
+    domain = _use_domain(monkeypatch, tmp_path)
+    _build(domain)
+    monkeypatch.setenv("GATEWAY_DOMAIN_SNAPSHOT", "off")
+    (domain / "domain.snapshot").write_bytes(b"garbage")
+
+    manifest, _policies = load_domain_config()
+
+    assert manifest.domain_id == "example_domain"
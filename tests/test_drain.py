@@ -0,0 +1,108 @@
+import asyncio
+import signal
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from ax_common.drain import RunRegistry, drain_on_signal
+from gateway.src.main import app
+from tools.firecrawl.src.api import app as worker_app
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition never held"
+        time.sleep(0.01)
+
+
+def test_registry_tracks_runs_and_drain_state():
+    registry = RunRegistry(grace_sec=0.05)
+
+    with registry.track(tool_run_id="r1") as entry:
+        entry["tool_id"] = "t"
+        registry.drain()
+        run = registry.snapshot()["runs"][0]
+        assert run["tool_run_id"] == "r1" and run["tool_id"] == "t"
+        assert "_started" not in run
+
+    assert len(registry) == 0
+    assert registry.snapshot()["draining"] is True
+    registry.resume()
+    assert registry.snapshot()["draining"] is False
+
+
+def test_sigterm_drains_before_the_server_handler_runs():
+    registry = RunRegistry()
+    seen = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: seen.append(registry.draining))
+    try:
+        drain_on_signal(registry, (signal.SIGTERM,))
+        signal.raise_signal(signal.SIGTERM)
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+    assert seen == [True]
+
+
+def test_gateway_drain_lets_inflight_run_finish(monkeypatch):
+    release = threading.Event()
+
+    async def slow_worker(tool, payload, timeout_sec):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        meta = {"trace_id": payload["meta"]["trace_id"], "tool_run_id": payload["meta"]["tool_run_id"]}
+        return 200, {"ok": True, "meta": meta, "output": {"items": []}}
+
+    monkeypatch.setattr("gateway.src.main.call_worker", slow_worker)
+    body = {"input": {"url": "https://example.com"}}
+    responses = []
+
+    with TestClient(app) as client:
+        thread = threading.Thread(
+            target=lambda: responses.append(client.post("/v1/tools/firecrawl.crawl:run", json=body))
+        )
+        thread.start()
+        _wait_for(lambda: client.get("/admin/runs").json()["inflight"] == 1)
+
+        runs = client.get("/admin/runs").json()["runs"]
+        assert runs[0]["tool_id"] == "firecrawl.crawl"
+        assert runs[0]["elapsed_ms"] >= 0
+
+        assert client.post("/admin/drain").json()["draining"] is True
+        ready = client.get("/readyz")
+        assert ready.status_code == 503 and ready.json()["draining"] is True
+
+        rejected = client.post("/v1/tools/firecrawl.crawl:run", json=body)
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "1"
+        error = rejected.json()["error"]
+        assert error["code"] == "RATE_LIMITED" and error["details"]["reason"] == "draining"
+
+        release.set()
+        thread.join(5)
+        assert responses[0].status_code == 200 and responses[0].json()["ok"] is True
+        assert client.get("/admin/runs").json()["inflight"] == 0
+
+        client.delete("/admin/drain")
+        assert "draining" not in client.get("/readyz").json()
+
+
+def test_worker_rejects_runs_while_draining():
+    envelope = {"meta": {"trace_id": "trace-1", "tool_run_id": "run-1"}, "input": {"url": "https://example.com"}}
+
+    with TestClient(worker_app) as client:
+        client.post("/admin/drain")
+        resp = client.post("/run", json=envelope)
+        assert client.get("/readyz").json()["draining"] is True
+
+    body = resp.json()
+    assert body["ok"] is False
+    assert body["meta"]["tool_run_id"] == "run-1"
+    assert body["error"]["code"] == "RATE_LIMITED"
+    assert body["error"]["details"] == {"backpressure": True, "reason": "draining", "retry_after_ms": 1000}
+
+    # A fresh start is not draining.
+    with TestClient(worker_app) as client:
+        assert client.get("/admin/runs").json()["draining"] is False
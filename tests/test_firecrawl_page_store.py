@@ -0,0 +1,92 @@
+import os
+
+from fastapi.testclient import TestClient
+
+from tools.firecrawl.src.api import app
+from tools.firecrawl.src.store import PageStore
+
+
+def _output(content: str) -> dict:
+    return {
+        "source_url": "https://example.com",
+        "items": [{"url": "https://example.com", "title": "t", "content": content, "format": "markdown"}],
+        "stats": {"pages": 1},
+    }
+
+
+def test_page_store_round_trip_and_shared_blobs(tmp_path):
+    store = PageStore(tmp_path, mmap_min_bytes=16)
+    payload = {"url": "https://Example.com/#top", "mode": "scrape", "formats": ["markdown"]}
+    big = "# Title\n" + "body " * 100
+
+    blobs = store.put(payload, _output(big))
+    store.put({"url": "https://example.com/other", "mode": "scrape"}, _output(big))
+    cached = store.get({"url": "https://example.com/", "mode": "scrape", "formats": ["markdown"]})
+
+    assert cached is not None
+    assert cached.fresh is True
+    assert cached.blobs == blobs
+    assert cached.output["items"][0]["content"] == big
+    assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+
+def test_page_store_domain_ttl_and_eviction(tmp_path):
+    store = PageStore(tmp_path, default_ttl_sec=60, domain_ttls={"news.example.com": 0}, max_bytes=300)
+
+    assert store.ttl_for("https://a.news.example.com/x") == 0
+    assert store.put({"url": "https://news.example.com/"}, _output("x")) == []
+
+    for i in range(5):
+        store.put({"url": f"https://example.com/{i}"}, _output(str(i) * 100))
+
+    assert store.get({"url": "https://example.com/0"}) is None
+    assert store.get({"url": "https://example.com/4"}) is not None
+
+
+def test_changed_refetch_releases_old_blobs(tmp_path):
+    store = PageStore(tmp_path, max_bytes=600, orphan_grace_sec=0)
+    store.put({"url": "https://example.com/keep"}, _output("k" * 100))
+    for i in range(6):
+        store.put({"url": "https://example.com/"}, _output(str(i) * 200))
+
+    # Old versions are collected instead of pushing live entries out.
+    sizes = [path.stat().st_size for path in (tmp_path / "blobs").glob("*/*")]
+    assert store.get({"url": "https://example.com/"}).output["items"][0]["content"] == "5" * 200
+    assert store.get({"url": "https://example.com/keep"}) is not None
+    assert store._bytes == sum(sizes) <= 600
+    assert len(sizes) <= 3
+
+
+def test_reused_blob_is_refreshed_and_partial_writes_are_not_counted(tmp_path):
+    store = PageStore(tmp_path)
+    [digest] = store.put({"url": "https://example.com/a"}, _output("x" * 100))
+    blob = tmp_path / "blobs" / digest[:2] / digest
+    os.utime(blob, (0, 0))
+    (blob.parent / f"{digest}.123.tmp").write_bytes(b"x" * 50)
+
+    store.put({"url": "https://example.com/b"}, _output("x" * 100))
+
+    assert blob.stat().st_mtime > 0
+    assert PageStore(tmp_path)._bytes == 100
+
+
+def test_worker_serves_fresh_hit_without_upstream_call(monkeypatch, tmp_path):
+    calls = []
+
+    async def fake_run(self, payload):
+        calls.append(payload)
+        return _output("cached body")
+
+    monkeypatch.setenv("FIRECRAWL_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr("tools.firecrawl.src.firecrawl_client.FirecrawlClient.run", fake_run)
+    envelope = {"meta": {"trace_id": "trace-1", "tool_run_id": "run-1"}, "input": {"url": "https://example.com"}}
+
+    with TestClient(app) as client:
+        first = client.post("/run", json=envelope).json()
+        second = client.post("/run", json=envelope).json()
+
+    assert len(calls) == 1
+    assert first["output"]["stats"]["cache"] == "miss"
+    assert second["output"]["stats"]["cache"] == "hit"
+    assert second["output"]["stats"]["age_sec"] >= 0
+    assert second["output"]["items"][0]["content"] == "cached body"
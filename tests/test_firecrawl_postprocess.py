@@ -0,0 +1,93 @@
+import json
+
+from tools.firecrawl.src.firecrawl_client import _parse_output
+from tools.firecrawl.src.postprocess import (
+    DuplicateIndex,
+    Page,
+    PostProcessConfig,
+    PostProcessor,
+    chunk_blocks,
+)
+
+NAV = "[Home](/) | [Docs](/docs) | [Blog](/blog)"
+FOOTER = "(c) Example Inc. All rights reserved."
+
+
+def _body(i: int) -> str:
+    return " ".join(f"topic{i} word{j} detail{(i * 7 + j) % 13}" for j in range(60))
+
+
+def _crawl(pages: list[str]) -> bytes:
+    data = [{"url": f"https://example.com/{i}", "title": f"Page {i}", "markdown": page} for i, page in enumerate(pages)]
+    return json.dumps({"data": data}).encode("utf-8")
+
+
+def test_near_duplicates_are_detected():
+    index = DuplicateIndex(threshold=0.8)
+    original = _body(1)
+
+    assert index.seen(original) is False
+    assert index.seen(original.replace("word5 ", "word5 edited ")) is True
+    assert index.seen(_body(2)) is False
+
+
+def test_boilerplate_is_stripped_from_every_page():
+    pages = [f"{NAV}\n\n{_body(i)}\n\n{FOOTER}" for i in range(12)]
+
+    output = _parse_output(_crawl(pages), "crawl", "https://example.com", None, PostProcessConfig(strip_boilerplate=True))
+
+    assert len(output["items"]) == 12
+    assert all(item["content"] == _body(i) for i, item in enumerate(output["items"]))
+    assert output["stats"]["postprocess"]["boilerplate_blocks"] == 24
+
+
+def test_dedup_and_chunking_in_one_pass():
+    pages = [_body(0), _body(1), _body(0) + " trailing", _body(2) + "\n\n" + _body(3)]
+    config = PostProcessConfig(dedup=True, dedup_threshold=0.8, chunk_bytes=2000)
+
+    output = _parse_output(_crawl(pages), "crawl", "https://example.com", None, config)
+
+    urls = [(item["url"], item["chunk"], item["chunks"]) for item in output["items"]]
+    assert urls == [
+        ("https://example.com/0", 0, 1),
+        ("https://example.com/1", 0, 1),
+        ("https://example.com/3", 0, 2),
+        ("https://example.com/3", 1, 2),
+    ]
+    assert all(len(item["content"].encode("utf-8")) <= 2000 for item in output["items"])
+    assert output["stats"]["pages"] == 4
+    assert output["stats"]["postprocess"]["duplicates"] == 1
+    assert output["stats"]["postprocess"]["chunks"] == 4
+
+
+def test_chunking_splits_oversized_blocks_on_utf8_boundaries():
+    chunks = list(chunk_blocks(["short", "é" * 400, "tail"], 256))
+
+    assert chunks[0] == "short"
+    assert chunks[-1] == "tail"
+    assert "".join(chunks[1:-1]) == "é" * 400
+    assert all(len(chunk.encode("utf-8")) <= 256 for chunk in chunks)
+
+
+def test_processing_streams_pages():
+    seen = []
+
+    def pages():
+        for i in range(20):
+            seen.append(i)
+            yield Page(f"https://example.com/{i}", "", _body(i))
+
+    stream = PostProcessor(PostProcessConfig(dedup=True)).process(pages())
+    next(stream)
+
+    assert seen == [0]
+
+
+def test_invalid_config_is_rejected():
+    for value in ({"chunk_bytes": 10}, {"dedup_threshold": 0}, "yes"):
+        try:
+            PostProcessConfig.from_input(value)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {value!r}")
+    assert PostProcessConfig.from_input({"dedup": False}) is None
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from gateway.src.hedging import Hedger
+from gateway.src.models import HedgePolicy, HedgingConfig, ToolConfig
+
+
+def _tool(replicas=()):
+    return ToolConfig(
+        tool_id="firecrawl.crawl",
+        kind="service_worker",
+        display_name="Firecrawl",
+        description="crawl",
+        transport={
+            "type": "http",
+            "base_url": "http://primary:8080",
+            "endpoint": "/run",
+            "replicas": list(replicas),
+        },
+    )
+
+
+def _hedger(**policy):
+    defaults = {"percentile": 90, "budget_ratio": 1.0, "min_delay_ms": 0, "min_samples": 5}
+    return Hedger(HedgingConfig(per_tool={"firecrawl.crawl": HedgePolicy(**{**defaults, **policy})}))
+
+
+async def _prime(hedger, tool, count=5):
+    async def fast(target, timeout):
+        await asyncio.sleep(0.01)
+        return 200, {"ok": True}
+
+    for _ in range(count):
+        await hedger.call(tool, 5, fast)
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_to_replica():
+    hedger = _hedger()
+    tool = _tool(replicas=["http://primary:8080", "http://replica:8080"])
+    await _prime(hedger, tool)
+    cancelled = []
+
+    async def call(target, timeout):
+        if target.transport.base_url == "http://primary:8080":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(target.transport.base_url)
+                raise
+        return 200, {"ok": True, "served_by": target.transport.base_url}
+
+    status, body = await asyncio.wait_for(hedger.call(tool, 10, call), timeout=2)
+    await asyncio.sleep(0)
+
+    assert (status, body) == (200, {"ok": True, "served_by": "http://replica:8080"})
+    assert cancelled == ["http://primary:8080"]
+    assert hedger.snapshot()["firecrawl.crawl"]["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget_or_samples():
+    calls = []
+
+    async def slow(target, timeout):
+        calls.append(target.transport.base_url)
+        await asyncio.sleep(0.1)
+        return 200, {}
+
+    cold = _hedger()
+    await cold.call(_tool(), 5, slow)
+
+    broke = _hedger(budget_ratio=0.0)
+    await _prime(broke, _tool())
+    await broke.call(_tool(), 5, slow)
+
+    assert calls == ["http://primary:8080", "http://primary:8080"]
+    assert broke.snapshot()["firecrawl.crawl"]["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_mask_primary_success():
+    hedger = _hedger()
+    tool = _tool()
+    await _prime(hedger, tool)
+    attempts = []
+
+    async def call(target, timeout):
+        attempts.append(1)
+        if len(attempts) == 2:
+            return 502, {}
+        await asyncio.sleep(0.2)
+        return 200, {"ok": True}
+
+    assert await hedger.call(tool, 5, call) == (200, {"ok": True})
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_error_envelope_from_hedge_does_not_win():
+    hedger = _hedger()
+    tool = _tool()
+    await _prime(hedger, tool)
+    attempts = []
+
+    async def call(target, timeout):
+        attempts.append(1)
+        if len(attempts) == 2:
+            return 200, {"ok": False, "error": {"code": "RATE_LIMITED"}}
+        await asyncio.sleep(0.2)
+        return 200, {"ok": True}
+
+    assert await hedger.call(tool, 5, call) == (200, {"ok": True})
+    assert hedger.snapshot()["firecrawl.crawl"]["hedge_wins"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_cancels_primary_before_hedge():
+    hedger = _hedger(min_delay_ms=1000)
+    tool = _tool()
+    await _prime(hedger, tool)
+    cancelled = []
+
+    async def call(target, timeout):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return 200, {"ok": True}
+
+    caller = asyncio.ensure_future(hedger.call(tool, 10, call))
+    await asyncio.sleep(0.05)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert cancelled == [1]
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src import policy
+from gateway.src.coordinator import LimiterCoordinator, SharedLimiter
+from gateway.src.journal import RunJournal, read_records
+from gateway.src.main import app
+from gateway.src.models import DomainPolicies, ToolConfig
+from gateway.src.policy import PolicyEnforcer
+
+
+async def _wait_idle(coordinator: LimiterCoordinator) -> None:
+    for _ in range(100):
+        if coordinator.inflight("firecrawl.crawl") == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert coordinator.inflight("firecrawl.crawl") == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_limiter_caps_inflight_across_clients(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+    coordinator = LimiterCoordinator(socket_path)
+    await coordinator.start()
+    # Separate limiter instances stand in for separate gateway processes.
+    limiters = [SharedLimiter(socket_path, "firecrawl.crawl", 2) for _ in range(3)]
+    peak = 0
+    active = 0
+
+    async def run(limiter):
+        nonlocal peak, active
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+    try:
+        await asyncio.gather(*(run(limiters[i % 3]) for i in range(9)))
+    finally:
+        await coordinator.stop()
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_limiter_releases_token_on_disconnect(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+    coordinator = LimiterCoordinator(socket_path)
+    await coordinator.start()
+    limiter = SharedLimiter(socket_path, "firecrawl.crawl", 1)
+
+    try:
+        await limiter.__aenter__()
+        assert coordinator.inflight("firecrawl.crawl") == 1
+        # A crashed process never sends RELEASE; its socket just closes.
+        _reader, writer = limiter._leases.popitem()[1]
+        writer.close()
+        await _wait_idle(coordinator)
+        # The released token can be taken again.
+        await asyncio.wait_for(limiter.__aenter__(), timeout=1)
+        await limiter.__aexit__(None, None, None)
+    finally:
+        await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_limiter_reuses_its_connection(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+    coordinator = LimiterCoordinator(socket_path)
+    await coordinator.start()
+    limiter = SharedLimiter(socket_path, "firecrawl.crawl", 1)
+
+    try:
+        async with limiter:
+            pass
+        (first,) = limiter._idle
+        async with limiter:
+            assert coordinator.inflight("firecrawl.crawl") == 1
+        assert limiter._idle == [first]
+        await _wait_idle(coordinator)
+
+        # A coordinator restart drops idle connections; the next acquire
+        # opens a fresh one.
+        await coordinator.stop()
+        coordinator = LimiterCoordinator(socket_path)
+        await coordinator.start()
+        async with limiter:
+            assert coordinator.inflight("firecrawl.crawl") == 1
+        assert limiter._idle != [first]
+    finally:
+        await coordinator.stop()
+
+
+def test_policy_uses_shared_limiter_when_coordinator_configured(monkeypatch):
+    monkeypatch.setenv("GATEWAY_COORDINATOR_SOCKET", "/tmp/ax-test.sock")
+    tool = ToolConfig.model_validate(
+        {
+            "tool_id": "firecrawl.crawl",
+            "kind": "service_worker",
+            "display_name": "Firecrawl Crawl",
+            "description": "crawl",
+            "transport": {"type": "http", "base_url": "http://worker", "endpoint": "/run"},
+        }
+    )
+    policies = DomainPolicies.model_validate({"concurrency": {"per_tool_max_inflight": {"firecrawl.crawl": 2}}})
+
+    limiter = PolicyEnforcer.from_config(policies, [tool]).limiter_for("firecrawl.crawl")
+
+    # policy imports the class as src.coordinator, like the running app.
+    assert isinstance(limiter, policy.SharedLimiter)
+    assert limiter.limit == 2
+
+
+def test_missing_coordinator_returns_error_envelope(monkeypatch, tmp_path):
+    monkeypatch.setenv("GATEWAY_COORDINATOR_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.setenv("GATEWAY_JOURNAL_DIR", str(tmp_path / "journal"))
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(app.state, "journal", RunJournal(tmp_path / "journal"))
+        resp = client.post("/v1/tools/firecrawl.crawl:run", json={"input": {"url": "https://example.com"}})
+        journal = app.state.journal
+        asyncio.run(journal.flush())
+
+    assert resp.status_code == 503
+    body = resp.json()
+    assert body["ok"] is False
+    assert body["error"]["code"] == "INTERNAL" and body["error"]["retryable"] is True
+    assert [record.error_code for record in read_records(tmp_path / "journal")] == ["INTERNAL"]
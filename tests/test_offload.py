@@ -0,0 +1,45 @@
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ax_common.offload import RawJSON, estimate_size, render_json, run_sized
+from gateway.src.main import app
+from gateway.src.offload import materialize, split_envelope
+
+
+@pytest.mark.asyncio
+async def test_run_sized_keeps_small_work_inline_and_offloads_large():
+    main_thread = threading.get_ident()
+
+    assert await run_sized(10, threading.get_ident) == main_thread
+    assert await run_sized(10 * 1024 * 1024, threading.get_ident) != main_thread
+
+
+def test_estimate_size_stops_at_limit():
+    payload = {"items": [{"content": "x" * 1000} for _ in range(10_000)]}
+
+    estimate = estimate_size(payload, limit=50_000)
+
+    assert 50_000 <= estimate < 60_000
+    assert estimate_size({"a": "b"}) < 100
+
+
+def test_loop_lag_endpoint_reports_samples():
+    with TestClient(app) as client:
+        resp = client.get("/admin/loop-lag")
+
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"samples", "last_ms", "p50_ms", "p99_ms", "max_ms"}
+
+
+def test_split_envelope_keeps_output_encoded_until_render():
+    body = json.dumps({"ok": True, "meta": {"trace_id": "t"}, "output": {"items": [{"content": "é"}]}}).encode()
+
+    envelope = split_envelope(body)
+
+    assert isinstance(envelope["output"], RawJSON)
+    assert materialize(envelope["output"]) == {"items": [{"content": "é"}]}
+    rendered = json.loads(render_json({"ok": True, "output": envelope["output"]}))
+    assert rendered == {"ok": True, "output": {"items": [{"content": "é"}]}}
@@ -0,0 +1,71 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from gateway.src.main import app
+from tools.firecrawl.src.firecrawl_client import _parse_output
+from tools.firecrawl.src.output_controls import TRUNCATION_MARKER
+
+CRAWL = json.dumps(
+    {
+        "data": [
+            {"url": f"https://example.com/{i}", "title": f"Page {i}", "markdown": "é" * 100}
+            for i in range(5)
+        ]
+    }
+).encode("utf-8")
+
+
+def test_field_projection_skips_unselected_fields():
+    output = _parse_output(CRAWL, "crawl", "https://example.com", {"fields": "items.url,items.title"})
+
+    assert set(output) == {"items"}
+    assert output["items"][0] == {"url": "https://example.com/0", "title": "Page 0"}
+
+
+def test_item_and_total_byte_caps_truncate_with_markers():
+    output = _parse_output(
+        CRAWL, "crawl", "https://example.com", {"max_item_bytes": 50, "max_total_bytes": 120}
+    )
+
+    first = output["items"][0]
+    assert first["truncated"] is True
+    assert first["content_bytes"] == 200
+    assert first["content"].endswith(TRUNCATION_MARKER)
+    assert len(first["content"].encode("utf-8")) <= 50
+    assert sum(len(item["content"].encode("utf-8")) for item in output["items"]) <= 120
+    assert output["stats"]["pages"] == 5
+    assert output["stats"]["truncated"] is True
+    assert output["stats"]["omitted_items"] == 5 - len(output["items"])
+
+
+def test_max_items_limits_returned_pages():
+    output = _parse_output(CRAWL, "crawl", "https://example.com", {"max_items": 2})
+
+    assert [item["url"] for item in output["items"]] == ["https://example.com/0", "https://example.com/1"]
+    assert output["stats"]["omitted_items"] == 3
+
+
+def test_gateway_forwards_options_and_rejects_invalid_ones(monkeypatch):
+    seen = []
+
+    async def fake_call_worker(tool, payload, timeout_sec):
+        seen.append(payload.get("options"))
+        return 200, {"ok": True, "meta": payload["meta"], "output": {"items": []}}
+
+    monkeypatch.setattr("gateway.src.main.call_worker", fake_call_worker)
+
+    with TestClient(app) as client:
+        ok = client.post(
+            "/v1/tools/firecrawl.crawl:run",
+            json={"input": {"url": "https://example.com"}, "options": {"fields": "items.url", "max_items": 3}},
+        )
+        bad = client.post(
+            "/v1/tools/firecrawl.crawl:run",
+            json={"input": {"url": "https://example.com"}, "options": {"max_items": 0}},
+        )
+
+    assert ok.status_code == 200
+    assert seen == [{"fields": ["items.url"], "max_items": 3}]
+    assert bad.status_code == 400
+    assert bad.json()["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,120 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src.main import RawJSON, app, dump_bytes
+from gateway.src.models import PipelineRequest
+from gateway.src.pipelines import PipelineError, parse_path, plan, resolve_path
+
+PAGES = {
+    "https://example.com": [
+        {"url": "https://example.com/a", "format": "markdown"},
+        {"url": "https://example.com/b", "format": "text"},
+    ],
+}
+
+
+def _fake_worker(calls, fail_url=None):
+    async def fake_call_worker(tool, payload, timeout_sec):
+        url = payload["input"]["url"]
+        calls.append(payload["input"])
+        meta = {"trace_id": payload["meta"]["trace_id"], "tool_run_id": payload["meta"]["tool_run_id"]}
+        if url == fail_url:
+            return 200, {
+                "ok": False,
+                "meta": meta,
+                "error": {"code": "UPSTREAM_ERROR", "message": "boom", "retryable": True, "details": {}},
+            }
+        # Large envelopes reach the gateway with the output still encoded.
+        output = RawJSON(dump_bytes({"source_url": url, "items": PAGES.get(url, [])}))
+        return 200, {"ok": True, "meta": meta, "output": output}
+
+    return fake_call_worker
+
+
+def _step(step_id, url):
+    return {"id": step_id, "tool_id": "firecrawl.crawl", "input": {"url": url}}
+
+
+def test_parse_and_resolve_paths():
+    step, segments = parse_path("$.crawl.items[*]['url']")
+    value = {"items": [{"url": "a"}, {"url": "b"}]}
+
+    assert step == "crawl"
+    assert resolve_path(value, segments, "p") == ["a", "b"]
+    assert resolve_path(value, parse_path("$.crawl.items[-1].url")[1], "p") == "b"
+    with pytest.raises(PipelineError):
+        resolve_path(value, parse_path("$.crawl.items[5]")[1], "p")
+    with pytest.raises(PipelineError):
+        parse_path("$.crawl..items")
+
+
+@pytest.mark.parametrize(
+    "steps, message",
+    [
+        ([_step("a", {"$ref": "$.b.source_url"}), _step("b", {"$ref": "$.a.source_url"})], "cycle"),
+        ([_step("a", {"$ref": "$.missing.url"})], "unknown step"),
+        ([_step("a", "x"), _step("a", "y")], "Duplicate"),
+    ],
+)
+def test_plan_rejects_bad_graphs(steps, message):
+    with pytest.raises(PipelineError, match=message):
+        plan(PipelineRequest.model_validate({"steps": steps}), {"firecrawl.crawl"}, 16)
+
+
+def test_pipeline_returns_only_final_outputs(monkeypatch):
+    calls = []
+    monkeypatch.setattr("gateway.src.main.call_worker", _fake_worker(calls))
+    pipeline = {
+        "steps": [
+            _step("crawl", "https://example.com"),
+            {
+                "id": "first",
+                "tool_id": "firecrawl.crawl",
+                "input": {
+                    "url": {"$ref": "$.crawl.items[0].url"},
+                    "formats": {"$ref": "$.crawl.items[*].format"},
+                },
+            },
+            _step("second", {"$ref": "$.crawl.items[1].url"}),
+        ]
+    }
+
+    with TestClient(app) as client:
+        resp = client.post("/v1/pipelines:run", json=pipeline)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["ok"] is True
+    assert set(body["outputs"]) == {"first", "second"}
+    assert body["outputs"]["first"]["source_url"] == "https://example.com/a"
+    assert body["outputs"]["second"]["source_url"] == "https://example.com/b"
+    assert set(body["steps"]) == {"crawl", "first", "second"}
+    assert all(step["ok"] and step["tool_run_id"] for step in body["steps"].values())
+    assert calls[0] == {"url": "https://example.com"}
+    assert {"url": "https://example.com/a", "formats": ["markdown", "text"]} in calls
+
+
+def test_failed_step_skips_dependents(monkeypatch):
+    calls = []
+    monkeypatch.setattr("gateway.src.main.call_worker", _fake_worker(calls, fail_url="https://example.com"))
+    pipeline = {
+        "steps": [
+            _step("crawl", "https://example.com"),
+            _step("follow", {"$ref": "$.crawl.items[0].url"}),
+            _step("other", "https://example.org"),
+        ],
+        "outputs": ["follow", "other"],
+    }
+
+    with TestClient(app) as client:
+        resp = client.post("/v1/pipelines:run", json=pipeline)
+        invalid = client.post("/v1/pipelines:run", json={"steps": [_step("a", {"$ref": "$.a.url"})]})
+
+    body = resp.json()
+    assert body["ok"] is False
+    assert body["outputs"] == {"other": {"source_url": "https://example.org", "items": []}}
+    assert body["steps"]["crawl"]["error"]["code"] == "UPSTREAM_ERROR"
+    assert body["steps"]["follow"]["skipped"] is True
+    assert len(calls) == 2
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ax_common.readiness import Readiness
+from gateway.src.main import app
+from tools.firecrawl.src.api import app as worker_app
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_steps_pass():
+    attempts = []
+
+    async def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("refused")
+        return "ok"
+
+    readiness = Readiness(timeout_sec=5, retry_interval_sec=0.01)
+    readiness.start({"worker": flaky})
+    assert readiness.snapshot()["ready"] is False
+    await readiness.wait()
+
+    snapshot = readiness.snapshot()
+    assert snapshot["ready"] is True
+    assert snapshot["checks"]["worker"]["ok"] is True
+    assert snapshot["checks"]["worker"]["attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_ready_after_deadline_with_failing_check_listed():
+    async def down() -> str:
+        raise ConnectionError("refused")
+
+    async def fine() -> str:
+        return "ok"
+
+    readiness = Readiness(timeout_sec=0.2, retry_interval_sec=0.05)
+    readiness.start({"worker": down, "schemas": fine})
+    await readiness.wait()
+
+    snapshot = readiness.snapshot()
+    assert snapshot["ready"] is True
+    assert snapshot["checks"]["worker"]["ok"] is False
+    assert "ConnectionError" in snapshot["checks"]["worker"]["detail"]
+    assert snapshot["checks"]["schemas"]["ok"] is True
+
+
+def _poll_ready(client: TestClient) -> dict:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        resp = client.get("/readyz")
+        if resp.status_code == 200:
+            return resp.json()
+        assert resp.status_code == 503
+        time.sleep(0.05)
+    raise AssertionError("never became ready")
+
+
+def test_gateway_readyz_reports_warmup_checks(monkeypatch):
+    probed = []
+
+    def fake_probe(transport, connections):
+        async def probe() -> str:
+            probed.append((transport.base_url, connections))
+            await asyncio.sleep(0)
+            return f"{connections} connections"
+
+        return probe
+
+    monkeypatch.setattr("gateway.src.main._worker_probe", fake_probe)
+
+    with TestClient(app) as client:
+        body = _poll_ready(client)
+        health = client.get("/healthz")
+
+    assert health.json() == {"ok": True}
+    assert body["checks"]["schemas"]["ok"] is True
+    assert {name for name in body["checks"] if name.startswith("worker:")} == {f"worker:{url}" for url, _ in probed}
+
+
+def test_worker_readyz_probes_upstream(monkeypatch):
+    async def fake_probe(self) -> str:
+        return "HTTP 404"
+
+    monkeypatch.setattr("tools.firecrawl.src.firecrawl_client.FirecrawlClient.probe", fake_probe)
+
+    with TestClient(worker_app) as client:
+        body = _poll_ready(client)
+
+    assert body["checks"]["upstream"]["ok"] is True
+    assert body["checks"]["upstream"]["detail"] == "HTTP 404"
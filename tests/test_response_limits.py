@@ -0,0 +1,124 @@
+import json
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src import main
+from gateway.src.main import app, loads_envelope
+from gateway.src.models import TransportConfig
+from gateway.src.transports import HttpTransport, LocalTransport, ResponseTooLarge, SpooledBody
+
+BENCHMARKS = str(Path(__file__).resolve().parents[1] / "benchmarks")
+
+OUTPUT = {"items": [{"url": f"https://example.com/{i}", "content": "x" * 200} for i in range(50)]}
+ENVELOPE = json.dumps({"ok": True, "meta": {"tool_run_id": "run-1"}, "output": OUTPUT}).encode()
+
+
+def _transport(body: bytes, chunk: int = 1000) -> HttpTransport:
+    # Streamed in chunks without Content-Length, like a chunked worker reply.
+    async def stream():
+        for start in range(0, len(body), chunk):
+            yield body[start : start + chunk]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=stream())
+
+    return HttpTransport(httpx.AsyncClient(transport=httpx.MockTransport(handler)), "http://worker", owns_client=True)
+
+
+@pytest.mark.asyncio
+async def test_body_over_limit_stops_while_streaming():
+    transport = _transport(ENVELOPE)
+    try:
+        with pytest.raises(ResponseTooLarge) as info:
+            await transport.request("POST", "/run", b"{}", 5, max_bytes=4000)
+    finally:
+        await transport.aclose()
+
+    assert info.value.limit == 4000
+    assert 4000 < info.value.received <= 5000
+
+
+@pytest.mark.asyncio
+async def test_large_body_spills_to_disk_and_is_removed_after_parsing():
+    transport = _transport(ENVELOPE)
+    try:
+        _, small = await transport.request("POST", "/run", b"{}", 5, max_bytes=len(ENVELOPE))
+        _, spilled = await transport.request("POST", "/run", b"{}", 5, spill_bytes=2000)
+    finally:
+        await transport.aclose()
+
+    assert small == ENVELOPE
+    assert isinstance(spilled, SpooledBody)
+    assert spilled.read() == ENVELOPE
+    envelope = await loads_envelope(spilled)
+    assert not os.path.exists(spilled.path)
+    assert json.loads(envelope["output"]) == OUTPUT
+
+
+@pytest.mark.asyncio
+async def test_local_transport_applies_limits_in_child_process():
+    transport = LocalTransport(
+        TransportConfig(type="local", app="fake_worker:app", pythonpath=[BENCHMARKS], processes=1, endpoint="/run")
+    )
+    envelope = json.dumps({"meta": {"tool_run_id": "run-1"}, "input": {"url": "https://example.com"}}).encode()
+    try:
+        with pytest.raises(ResponseTooLarge):
+            await transport.request("POST", "/run", envelope, 30, max_bytes=10)
+        _, spilled = await transport.request("POST", "/run", envelope, 30, spill_bytes=10)
+    finally:
+        await transport.aclose()
+
+    assert isinstance(spilled, SpooledBody)
+    assert json.loads(spilled.read())["meta"]["tool_run_id"] == "run-1"
+    spilled.close()
+
+
+def test_oversized_worker_output_maps_to_output_too_large(monkeypatch):
+    async def fake_call_worker(tool, payload, timeout_sec):
+        raise main.ResponseTooLarge(1024, 2048)
+
+    monkeypatch.setattr("gateway.src.main.call_worker", fake_call_worker)
+    with TestClient(app) as client:
+        resp = client.post("/v1/tools/firecrawl.crawl:run", json={"input": {"url": "https://example.com"}})
+
+    assert resp.status_code == 502
+    error = resp.json()["error"]
+    assert error["code"] == "OUTPUT_TOO_LARGE"
+    assert error["retryable"] is False
+    assert error["details"] == {"max_bytes": 1024, "received_bytes": 2048}
+
+
+def test_call_worker_uses_per_tool_limit(monkeypatch):
+    seen = {}
+    bodies = []
+
+    class FakeTransports:
+        async def request(self, config, method, path, body, timeout, max_bytes=None, spill_bytes=None):
+            # Warm-up and health probes also come through here.
+            if path != "/run":
+                return 200, b'{"ok":true}'
+            seen.update(max_bytes=max_bytes, spill_bytes=spill_bytes)
+            if spill_bytes is None:
+                return 200, ENVELOPE
+            bodies.append(SpooledBody.write(ENVELOPE))
+            return 200, bodies[-1]
+
+        async def aclose(self):
+            pass
+
+    with TestClient(app) as client:
+        limits = app.state.policies.responses
+        monkeypatch.setattr(limits, "per_tool_max_bytes", {"firecrawl.crawl": 123456})
+        monkeypatch.setattr(app.state, "transports", FakeTransports())
+        resp = client.post("/v1/tools/firecrawl.crawl:run", json={"input": {"url": "https://example.com"}})
+
+    leaked = [spooled.path for spooled in bodies if os.path.exists(spooled.path)]
+    for spooled in bodies:
+        spooled.close()
+    assert leaked == []
+    assert seen == {"max_bytes": 123456, "spill_bytes": limits.spill_bytes}
+    assert resp.json()["output"] == OUTPUT
@@ -0,0 +1,148 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi.testclient import TestClient
+
+from gateway.src.main import app
+from gateway.src.results import encode_cursor
+from gateway.src.transports import SpooledBody
+
+
+class FakeTransports:
+    # Answers /run with an envelope of `item_count` items. Probes get small
+    # bodies, and /run bodies over spill_bytes are spooled like the HTTP
+    # transport does.
+    def __init__(self, item_count: int) -> None:
+        self.item_count = item_count
+        self.spooled: list[SpooledBody] = []
+
+    async def request(self, config, method, path, body, timeout, max_bytes=None, spill_bytes=None):
+        if path != "/run":
+            return 200, b'{"ok":true}'
+        meta = json.loads(body)["meta"]
+        assert "options" not in json.loads(body)
+        envelope = json.dumps(
+            {
+                "ok": True,
+                "meta": {"trace_id": meta["trace_id"], "tool_run_id": meta["tool_run_id"]},
+                "output": {
+                    "source_url": "https://example.com",
+                    "items": [
+                        {"url": f"https://example.com/{i}", "content": "c", "format": "markdown"}
+                        for i in range(self.item_count)
+                    ],
+                    "stats": {"pages": self.item_count},
+                },
+            }
+        ).encode("utf-8")
+        if spill_bytes is not None and len(envelope) > spill_bytes:
+            self.spooled.append(SpooledBody.write(envelope))
+            return 200, self.spooled[-1]
+        return 200, envelope
+
+    async def aclose(self):
+        pass
+
+
+@contextmanager
+def _client(monkeypatch, tmp_path, item_count: int) -> Iterator[tuple[TestClient, FakeTransports]]:
+    monkeypatch.setenv("GATEWAY_RESULTS_DIR", str(tmp_path / "results"))
+    transports = FakeTransports(item_count)
+    with TestClient(app) as client:
+        monkeypatch.setattr(app.state, "transports", transports)
+        yield client, transports
+
+
+def _run(client, page_size: int) -> dict:
+    return client.post(
+        "/v1/tools/firecrawl.crawl:run",
+        json={"input": {"url": "https://example.com"}, "options": {"page_size": page_size}},
+    ).json()
+
+
+def test_large_output_is_paged_by_cursor(monkeypatch, tmp_path):
+    with _client(monkeypatch, tmp_path, 5) as (client, _):
+        first = _run(client, 2)
+        run_id = first["tool_run_id"]
+        urls = [item["url"] for item in first["output"]["items"]]
+        cursor = first["page"]["next_cursor"]
+        while cursor:
+            page = client.get(f"/v1/runs/{run_id}/items", params={"cursor": cursor}).json()
+            urls.extend(item["url"] for item in page["items"])
+            cursor = page["page"]["next_cursor"]
+
+    assert first["page"]["total_items"] == 5
+    assert first["output"]["stats"] == {"pages": 5}
+    assert urls == [f"https://example.com/{i}" for i in range(5)]
+    results = tmp_path / "results"
+    assert results.stat().st_mode & 0o777 == 0o700
+    assert [path.stat().st_mode & 0o777 for path in results.iterdir()] == [0o600]
+
+
+def test_spooled_body_is_paged_from_disk(monkeypatch, tmp_path):
+    with _client(monkeypatch, tmp_path, 50) as (client, transports):
+        monkeypatch.setattr(app.state.policies.responses, "spill_bytes", 1000)
+        first = _run(client, 10)
+        last = client.get(
+            f"/v1/runs/{first['tool_run_id']}/items", params={"cursor": encode_cursor(first["tool_run_id"], 40, 10)}
+        ).json()
+
+    assert len(transports.spooled) == 1
+    assert not os.path.exists(transports.spooled[0].path)
+    assert len(first["output"]["items"]) == 10
+    assert first["page"]["total_items"] == 50
+    assert [item["url"] for item in last["items"]][-1] == "https://example.com/49"
+    assert last["page"]["next_cursor"] is None
+
+
+def test_small_output_is_returned_inline(monkeypatch, tmp_path):
+    with _client(monkeypatch, tmp_path, 2) as (client, _):
+        body = _run(client, 2)
+
+    assert "page" not in body
+    assert len(body["output"]["items"]) == 2
+
+
+def test_results_are_only_served_from_a_private_directory(monkeypatch, tmp_path):
+    with _client(monkeypatch, tmp_path, 5) as (client, _):
+        first = _run(client, 2)
+        run_id = first["tool_run_id"]
+        cursor = first["page"]["next_cursor"]
+        (stored,) = (tmp_path / "results").iterdir()
+        os.chown(stored, 54321, -1)
+        planted = client.get(f"/v1/runs/{run_id}/items", params={"cursor": cursor})
+
+        # A directory others can access is refused; the run is answered unpaged.
+        (tmp_path / "results").chmod(0o755)
+        unpaged = _run(client, 2)
+
+    assert planted.status_code == 404
+    assert "page" not in unpaged
+    assert len(unpaged["output"]["items"]) == 5
+
+
+def test_bad_or_unknown_cursor(monkeypatch, tmp_path):
+    monkeypatch.setenv("GATEWAY_RESULTS_DIR", str(tmp_path))
+
+    with TestClient(app) as client:
+        bad = client.get("/v1/runs/run-1/items", params={"cursor": "not-a-cursor"})
+        mismatched = client.get("/v1/runs/run-1/items", params={"cursor": encode_cursor("run-2", 2, 2)})
+        missing = client.get("/v1/runs/run-1/items", params={"cursor": encode_cursor("run-1", 2, 2)})
+
+    assert bad.status_code == 400
+    assert mismatched.status_code == 400
+    assert missing.status_code == 404
+    assert missing.json()["error"]["code"] == "NOT_FOUND"
+
+
+def test_cursor_page_size_is_capped_by_policy(monkeypatch, tmp_path):
+    with _client(monkeypatch, tmp_path, 10) as (client, _):
+        monkeypatch.setattr(app.state.policies.results, "max_page_size", 3)
+        first = _run(client, 2)
+        run_id = first["tool_run_id"]
+        forged = client.get(f"/v1/runs/{run_id}/items", params={"cursor": encode_cursor(run_id, 2, 10**9)}).json()
+
+    assert len(forged["items"]) == 3
+    assert forged["page"]["page_size"] == 3
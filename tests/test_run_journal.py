@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src.journal import RunJournal, RunRecord, read_records, summarize
+from gateway.src.main import app
+
+
+def _record(tool_id: str, duration_ms: int, error_code: str = "") -> RunRecord:
+    return RunRecord(
+        ts_ms=1_700_000_000_000,
+        duration_ms=duration_ms,
+        status_code=200,
+        ok=not error_code,
+        retryable=False,
+        tool_id=tool_id,
+        tool_run_id="run-1",
+        error_code=error_code,
+        worker="http://worker:8080",
+        input_hash="abc",
+        request_body=b'{"input":{"url":"https://example.com"}}',
+    )
+
+
+@pytest.mark.asyncio
+async def test_records_round_trip_and_rotate(tmp_path):
+    journal = RunJournal(tmp_path, max_file_bytes=400, max_files=2, include_request_body=True)
+    for i in range(10):
+        journal.record(_record("firecrawl.crawl", i))
+        await journal.flush()
+
+    records = list(read_records(tmp_path))
+    assert len(list(tmp_path.glob("journal-*.axj"))) == 2
+    assert records[-1].duration_ms == 9
+    assert records[-1].request_body == b'{"input":{"url":"https://example.com"}}'
+    assert records[-1].worker == "http://worker:8080"
+
+
+@pytest.mark.asyncio
+async def test_journals_sharing_a_directory_rotate_only_their_own_files(tmp_path):
+    first = RunJournal(tmp_path, max_file_bytes=400, max_files=1)
+    second = RunJournal(tmp_path, max_file_bytes=400, max_files=1)
+    for i in range(10):
+        first.record(_record("first", i))
+        await first.flush()
+        second.record(_record("second", i))
+        await second.flush()
+
+    assert len(list(tmp_path.glob("journal-*.axj"))) == 2
+    # Neither journal deleted the other's current file, so the last record
+    # of each is still on disk.
+    assert [record.duration_ms for record in read_records(first._current)][-1] == 9
+    assert [record.duration_ms for record in read_records(second._current)][-1] == 9
+
+    first._current.unlink()
+    first.record(_record("first", 10))
+    await first.flush()
+    assert [record.duration_ms for record in read_records(first._current)] == [10]
+
+
+@pytest.mark.asyncio
+async def test_restarted_journal_prunes_files_of_its_slot(tmp_path):
+    for restart in range(5):
+        journal = RunJournal(tmp_path, max_file_bytes=400, max_files=2)
+        for i in range(3):
+            journal.record(_record("firecrawl.crawl", restart * 10 + i))
+            await journal.flush()
+        await journal.stop()
+
+    assert len(list(tmp_path.glob("journal-*.axj"))) == 2
+    assert [record.duration_ms for record in read_records(tmp_path)][-1] == 42
+
+
+@pytest.mark.asyncio
+async def test_journal_refuses_a_directory_others_can_access(tmp_path):
+    root = tmp_path / "journal"
+    root.mkdir(mode=0o755)
+    root.chmod(0o755)
+    journal = RunJournal(root)
+    journal.record(_record("firecrawl.crawl", 1))
+
+    with pytest.raises(PermissionError):
+        await journal.flush()
+    assert not list(root.glob("journal-*.axj"))
+
+
+@pytest.mark.asyncio
+async def test_request_body_is_dropped_unless_enabled(tmp_path):
+    journal = RunJournal(tmp_path)
+    journal.record(_record("firecrawl.crawl", 5))
+    await journal.flush()
+
+    (record,) = read_records(tmp_path)
+    assert record.request_body == b""
+    assert record.input_hash == "abc"
+
+
+@pytest.mark.asyncio
+async def test_summarize_groups_latency_and_errors(tmp_path):
+    journal = RunJournal(tmp_path)
+    journal.start()
+    for duration in (10, 20, 30):
+        journal.record(_record("firecrawl.crawl", duration))
+    journal.record(_record("firecrawl.crawl", 40, "TIMEOUT"))
+    await asyncio.sleep(0)
+    await journal.stop()
+
+    summary = summarize(tmp_path)
+    assert "firecrawl.crawl" in summary
+    assert "TIMEOUT" in summary
+
+
+def test_run_tool_writes_journal_record(monkeypatch, tmp_path):
+    async def fake_call_worker(tool, payload, timeout_sec):
+        return 200, {
+            "ok": False,
+            "meta": {"trace_id": payload["meta"]["trace_id"], "tool_run_id": payload["meta"]["tool_run_id"]},
+            "error": {"code": "UPSTREAM_ERROR", "message": "boom", "retryable": True, "details": {}},
+        }
+
+    monkeypatch.setattr("gateway.src.main.call_worker", fake_call_worker)
+    monkeypatch.setattr("gateway.src.main._build_journal", lambda policies: RunJournal(tmp_path))
+
+    with TestClient(app) as client:
+        client.post("/v1/tools/firecrawl.crawl:run", json={"input": {"url": "https://example.com"}})
+        client.post("/v1/tools/firecrawl.missing:run", json={"input": {}})
+
+    first, second = read_records(tmp_path)
+    assert (first.tool_id, first.error_code, first.retryable) == ("firecrawl.crawl", "UPSTREAM_ERROR", True)
+    assert first.worker
+    assert len(first.input_hash) == 32
+    assert (second.status_code, second.error_code) == (404, "NOT_FOUND")
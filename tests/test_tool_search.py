@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from gateway.src.main import app
+from gateway.src.models import ToolConfig
+from gateway.src.search import ToolIndex, tokenize
+
+
+def _tool(tool_id: str, display_name: str, description: str, capabilities: list[str]) -> ToolConfig:
+    return ToolConfig(
+        tool_id=tool_id,
+        kind="service_worker",
+        display_name=display_name,
+        description=description,
+        capabilities=capabilities,
+        transport={"type": "http", "base_url": "http://worker:8080", "endpoint": "/run"},
+    )
+
+
+TOOLS = [
+    _tool("firecrawl.crawl", "Firecrawl Crawl", "Crawl a URL and return extracted content", ["web_crawl", "extract"]),
+    _tool("pdf.extract", "PDF Extract", "Extract text and tables from a PDF document", ["extract", "pdf"]),
+    _tool("mail.send", "Send Mail", "Send an email; can attach a PDF", ["email"]),
+    _tool("sql.query", "SQL Query", "Run a read-only SQL query", ["database"]),
+]
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("firecrawl.crawl web_crawl PDF-Extract") == ["firecrawl", "crawl", "web", "crawl", "pdf", "extract"]
+
+
+def test_ranks_name_and_capability_matches_first():
+    index = ToolIndex(TOOLS)
+
+    total, hits = index.search("pdf extract")
+
+    assert total == 3
+    assert [tool.tool_id for tool, _score in hits] == ["pdf.extract", "firecrawl.crawl", "mail.send"]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_limit_and_no_match():
+    index = ToolIndex(TOOLS)
+
+    total, hits = index.search("extract", limit=1)
+    assert total == 2
+    assert len(hits) == 1
+    assert index.search("kubernetes") == (0, [])
+    assert ToolIndex([]).search("crawl") == (0, [])
+
+
+def test_search_endpoint():
+    with TestClient(app) as client:
+        found = client.get("/v1/tools:search", params={"q": "web crawl"})
+        missing_query = client.get("/v1/tools:search")
+        app.state.search = None
+        disabled = client.get("/v1/tools:search", params={"q": "crawl"})
+
+    assert found.status_code == 200
+    body = found.json()
+    assert body["domain_id"] == "example_domain"
+    assert body["total"] == 1
+    assert body["tools"][0]["tool_id"] == "firecrawl.crawl"
+    assert body["tools"][0]["score"] > 0
+    assert missing_query.status_code == 400
+    assert missing_query.json()["error"]["code"] == "VALIDATION_ERROR"
+    assert disabled.status_code == 404
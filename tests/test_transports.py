@@ -0,0 +1,113 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pydantic
+import pytest
+import uvicorn
+
+from gateway.src.models import TransportConfig
+from gateway.src.transports import LocalTransport, TransportRegistry, transport_key
+
+ROOT = str(Path(__file__).resolve().parents[1])
+BENCHMARKS = str(Path(__file__).resolve().parents[1] / "benchmarks")
+ENVELOPE = json.dumps(
+    {"meta": {"trace_id": "trace-1", "tool_run_id": "run-1"}, "input": {"url": "https://example.com"}}
+).encode()
+
+
+def test_transport_config_requires_target():
+    with pytest.raises(pydantic.ValidationError):
+        TransportConfig(type="uds", endpoint="/run")
+    with pytest.raises(pydantic.ValidationError):
+        TransportConfig(type="local", endpoint="/run")
+
+    uds = TransportConfig(type="uds", socket_path="/tmp/worker.sock", endpoint="/run")
+    assert transport_key(uds) == "unix:/tmp/worker.sock"
+
+
+@pytest.mark.asyncio
+async def test_local_transport_calls_worker_handler_in_child_process():
+    transport = LocalTransport(
+        TransportConfig(type="local", app="fake_worker:app", pythonpath=[BENCHMARKS], processes=1, endpoint="/run")
+    )
+    try:
+        health_status, _ = await transport.request("GET", "/healthz", None, 30)
+        status_code, content = await transport.request("POST", "/run", ENVELOPE, 30)
+    finally:
+        await transport.aclose()
+
+    body = json.loads(content)
+    assert (health_status, status_code) == (200, 200)
+    assert body["ok"] is True
+    assert body["meta"]["tool_run_id"] == "run-1"
+    assert body["output"]["source_url"] == "https://example.com"
+
+
+@pytest.mark.asyncio
+async def test_local_transport_runs_worker_startup_hooks(monkeypatch):
+    monkeypatch.setenv("FIRECRAWL_BASE_URL", "http://127.0.0.1:9")
+    transport = LocalTransport(
+        TransportConfig(type="local", app="tools.firecrawl.src.api:app", pythonpath=[ROOT], processes=1, endpoint="/run")
+    )
+    try:
+        # The upstream gate only exists once the worker's startup ran.
+        status_code, content = await transport.request("GET", "/admin/upstream", None, 30)
+    finally:
+        await transport.aclose()
+
+    assert status_code == 200
+    assert json.loads(content)["max_concurrency"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_local_transport_removes_body_spilled_after_timeout(monkeypatch, tmp_path):
+    monkeypatch.setenv("FAKE_WORKER_DELAY_MS", "300")
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    transport = LocalTransport(
+        TransportConfig(type="local", app="fake_worker:app", pythonpath=[BENCHMARKS], processes=1, endpoint="/run")
+    )
+    envelope = json.dumps({"meta": {"tool_run_id": "run-1"}, "input": {"url": "https://example.com"}}).encode()
+    try:
+        with pytest.raises(httpx.TimeoutException):
+            await transport.request("POST", "/run", envelope, 0.05, spill_bytes=10)
+        # The single child finishes the abandoned call before this one.
+        status_code, _ = await transport.request("POST", "/run", envelope, 30)
+    finally:
+        await transport.aclose()
+
+    assert status_code == 200
+    assert not list(tmp_path.glob("ax-body-*"))
+
+
+@pytest.mark.asyncio
+async def test_uds_transport_speaks_http_over_socket(tmp_path):
+    sys.path.insert(0, BENCHMARKS)
+    try:
+        from fake_worker import app as fake_app
+    finally:
+        sys.path.remove(BENCHMARKS)
+
+    socket_path = str(tmp_path / "worker.sock")
+    server = uvicorn.Server(uvicorn.Config(fake_app, uds=socket_path, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    config = TransportConfig(type="uds", socket_path=socket_path, endpoint="/run")
+    async with httpx.AsyncClient() as client:
+        transports = TransportRegistry(client)
+        try:
+            status_code, content = await transports.request(config, "POST", config.endpoint, ENVELOPE, 10)
+        finally:
+            await transports.aclose()
+    server.should_exit = True
+    thread.join(timeout=10)
+
+    assert status_code == 200
+    assert json.loads(content)["meta"]["trace_id"] == "trace-1"
@@ -0,0 +1,35 @@
+import pytest
+
+from tools.firecrawl.src.urls import canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "https://Example.com/",
+        "https://example.com",
+        "HTTPS://EXAMPLE.COM:443/#section",
+        "https://example.com/?utm_source=news&utm_medium=email",
+        "https://example.com?fbclid=abc",
+    ],
+)
+def test_equivalent_urls_share_one_canonical_form(raw):
+    assert canonicalize_url(raw) == "https://example.com/"
+
+
+def test_query_is_sorted_and_non_tracking_params_are_kept():
+    url = "http://example.com:8080/a/b?z=1&next=%2Fhome&a=&gclid=x"
+
+    assert canonicalize_url(url) == "http://example.com:8080/a/b?a=&next=%2Fhome&z=1"
+
+
+def test_tracking_params_are_configurable(monkeypatch):
+    monkeypatch.setenv("FIRECRAWL_TRACKING_PARAMS", "ref,session*")
+
+    assert canonicalize_url("https://example.com/?ref=x&sessionid=1&utm_source=y") == (
+        "https://example.com/?utm_source=y"
+    )
+
+
+def test_path_case_and_userinfo_are_preserved():
+    assert canonicalize_url("https://user:pw@Example.com:80/Docs") == "https://user:pw@example.com:80/Docs"
@@ -0,0 +1,86 @@
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from gateway.src.health import HealthChecker
+from gateway.src.main import app
+from gateway.src.models import HealthConfig, ToolConfig
+from gateway.src.transports import SpooledBody, TransportRegistry
+
+
+def _tool(tool_id: str, base_url: str) -> ToolConfig:
+    return ToolConfig(
+        tool_id=tool_id,
+        kind="service_worker",
+        display_name=tool_id,
+        description=tool_id,
+        transport={"type": "http", "base_url": base_url, "endpoint": "/run"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_flips_after_consecutive_results():
+    statuses = iter([500, 500, 200])
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(next(statuses))))
+    transports = TransportRegistry(client)
+    checker = HealthChecker(
+        HealthConfig(unhealthy_after=2),
+        [_tool("a.one", "http://worker-a:8080/"), _tool("a.two", "http://worker-a:8080")],
+        lambda: transports,
+    )
+
+    assert list(checker.targets) == ["http://worker-a:8080"]
+    await checker.check("http://worker-a:8080")
+    assert checker.status_for("a.one").status == "unknown"
+    await checker.check("http://worker-a:8080")
+    assert checker.is_unhealthy("a.two")
+    await checker.check("http://worker-a:8080")
+    assert checker.status_for("a.one").status == "healthy"
+    assert checker.status_for("a.one").consecutive_failures == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_probe_removes_spilled_body():
+    bodies = []
+
+    class FakeTransports:
+        async def request(self, config, method, path, body, timeout):
+            bodies.append(SpooledBody.write(b'{"ok":true}'))
+            return 200, bodies[-1]
+
+    checker = HealthChecker(HealthConfig(), [_tool("a.one", "http://worker-a:8080")], lambda: FakeTransports())
+    await checker.check("http://worker-a:8080")
+
+    assert checker.status_for("a.one").status == "healthy"
+    assert not os.path.exists(bodies[0].path)
+
+
+def test_unhealthy_worker_fails_fast(monkeypatch):
+    calls = []
+
+    async def fake_call_worker(tool, payload, timeout_sec):
+        calls.append(tool.tool_id)
+        return 200, {"ok": True, "meta": payload["meta"], "output": {}}
+
+    monkeypatch.setattr("gateway.src.main.call_worker", fake_call_worker)
+
+    with TestClient(app) as client:
+        health = app.state.health.status_for("firecrawl.crawl")
+        health.status = "unhealthy"
+        health.error = "ConnectError: refused"
+        run = client.post("/v1/tools/firecrawl.crawl:run", json={"input": {"url": "https://example.com"}})
+        catalog = client.get("/v1/tools").json()
+        deep = client.get("/healthz", params={"deep": 1})
+        shallow = client.get("/healthz")
+
+    assert calls == []
+    assert run.status_code == 503
+    assert run.json()["error"]["code"] == "UPSTREAM_ERROR"
+    assert run.json()["error"]["retryable"] is True
+    assert catalog["tools"][0]["health"]["status"] == "unhealthy"
+    assert deep.status_code == 503
+    assert deep.json()["ok"] is False
+    assert shallow.json() == {"ok": True}
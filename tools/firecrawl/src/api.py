@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import time
 
+import httpx
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from src.firecrawl_client import FirecrawlClient, FirecrawlClientError
+from ax_common.compression import CompressionMiddleware
+from ax_common.drain import DRAIN_RETRY_AFTER_MS, RunRegistry, drain_on_signal
+from ax_common.offload import LoopLagMonitor, json_response, loads_sized, warm_pool
+from ax_common.readiness import Readiness
+
+from .backpressure import UpstreamGate
+from .firecrawl_client import FirecrawlClient, FirecrawlClientError
+from .store import PageStore
 
 app = FastAPI(title="AX Firecrawl Worker", version="0.1")
+app.add_middleware(CompressionMiddleware)
+
+app.state.page_store = None
+app.state.upstream_gate = None
+app.state.loop_lag = LoopLagMonitor()
+app.state.http = None
+app.state.readiness = Readiness(float(os.getenv("FIRECRAWL_WARMUP_TIMEOUT_SEC", "30")))
+app.state.runs = RunRegistry(float(os.getenv("FIRECRAWL_DRAIN_GRACE_SEC", "30")))
 
 
 def _error_response(*, trace_id: str, tool_run_id: str, start_ms: int, code: str, message: str, retryable: bool, details: dict | None = None, status_code: int = 200) -> JSONResponse:
@@ -30,17 +48,116 @@ def _error_response(*, trace_id: str, tool_run_id: str, start_ms: int, code: str
     )
 
 
+async def _success_response(*, trace_id: str, tool_run_id: str, start_ms: int, output: dict) -> JSONResponse:
+    return await json_response(
+        {
+            "ok": True,
+            "meta": {
+                "trace_id": trace_id,
+                "tool_run_id": tool_run_id,
+                "duration_ms": max(0, int(time.time() * 1000) - start_ms),
+            },
+            "output": output,
+        }
+    )
+
+
+@app.on_event("startup")
+def startup_page_store() -> None:
+    app.state.page_store = PageStore.from_env()
+    app.state.upstream_gate = UpstreamGate.from_env()
+
+
+@app.on_event("startup")
+def startup_drain() -> None:
+    app.state.runs.resume()
+    drain_on_signal(app.state.runs)
+
+
+@app.on_event("startup")
+async def startup_loop_lag() -> None:
+    app.state.loop_lag.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_loop_lag() -> None:
+    await app.state.loop_lag.stop()
+
+
+async def _warm_offload_pool() -> str:
+    await warm_pool()
+    return "started"
+
+
+@app.on_event("startup")
+async def startup_warmup() -> None:
+    app.state.http = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0))
+    app.state.readiness.start(
+        {
+            "offload_pool": _warm_offload_pool,
+            "upstream": FirecrawlClient(http_client=app.state.http).probe,
+        }
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_warmup() -> None:
+    await app.state.readiness.stop()
+    if app.state.http is not None:
+        await app.state.http.aclose()
+        app.state.http = None
+
+
 @app.get("/healthz")
 def healthz() -> dict[str, bool]:
     return {"ok": True}
 
 
+@app.get("/readyz")
+def readyz() -> JSONResponse:
+    snapshot = app.state.readiness.snapshot()
+    if app.state.runs.draining:
+        snapshot = {**snapshot, "ready": False, "draining": True}
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
+@app.get("/admin/loop-lag")
+def loop_lag() -> dict[str, float]:
+    return app.state.loop_lag.snapshot()
+
+
+@app.get("/admin/upstream")
+def upstream() -> dict:
+    return app.state.upstream_gate.snapshot() if app.state.upstream_gate is not None else {}
+
+
+@app.get("/admin/runs")
+def runs() -> dict:
+    return app.state.runs.snapshot()
+
+
+@app.post("/admin/drain")
+def drain() -> dict:
+    app.state.runs.drain()
+    return app.state.runs.snapshot()
+
+
+@app.delete("/admin/drain")
+def resume() -> dict:
+    app.state.runs.resume()
+    return app.state.runs.snapshot()
+
+
 @app.post("/run")
 async def run(request: Request):
     start_ms = int(time.time() * 1000)
+    with app.state.runs.track() as entry:
+        return await _run(request, start_ms, entry)
+
 
+async def _run(request: Request, start_ms: int, entry: dict):
     try:
-        body = await request.json()
+        body = await loads_sized(await request.body())
     except Exception:
         return _error_response(
             trace_id="",
@@ -64,6 +181,17 @@ async def run(request: Request):
     meta = body.get("meta") if isinstance(body.get("meta"), dict) else {}
     trace_id = str(meta.get("trace_id", ""))
     tool_run_id = str(meta.get("tool_run_id", ""))
+    entry.update(tool_run_id=tool_run_id, trace_id=trace_id)
+    if app.state.runs.draining:
+        return _error_response(
+            trace_id=trace_id,
+            tool_run_id=tool_run_id,
+            start_ms=start_ms,
+            code="RATE_LIMITED",
+            message="Worker is draining and not accepting new runs",
+            retryable=True,
+            details={"backpressure": True, "reason": "draining", "retry_after_ms": DRAIN_RETRY_AFTER_MS},
+        )
 
     input_payload = body.get("input") if isinstance(body.get("input"), dict) else None
     if input_payload is None:
@@ -87,15 +215,27 @@ async def run(request: Request):
             retryable=False,
         )
 
+    entry.update(url=url, mode=input_payload.get("mode", "scrape"))
     normalized_input = {
         "url": url,
         "mode": input_payload.get("mode", "scrape"),
         "max_pages": input_payload.get("max_pages"),
         "formats": input_payload.get("formats"),
+        "postprocess": input_payload.get("postprocess"),
     }
+    options = body.get("options")
+    if isinstance(options, dict):
+        normalized_input["options"] = options
+
+    store: PageStore | None = app.state.page_store
+    cached = await asyncio.to_thread(store.get, normalized_input) if store else None
+    if cached is not None and cached.fresh:
+        output = cached.output
+        output["stats"] = {**output.get("stats", {}), "cache": "hit", "age_sec": cached.age_sec}
+        return await _success_response(trace_id=trace_id, tool_run_id=tool_run_id, start_ms=start_ms, output=output)
 
     try:
-        output = await FirecrawlClient().run(normalized_input)
+        output = await FirecrawlClient(http_client=app.state.http, gate=app.state.upstream_gate).run(normalized_input)
     except FirecrawlClientError as exc:
         return _error_response(
             trace_id=trace_id,
@@ -116,12 +256,18 @@ async def run(request: Request):
             retryable=False,
         )
 
-    return {
-        "ok": True,
-        "meta": {
-            "trace_id": trace_id,
-            "tool_run_id": tool_run_id,
-            "duration_ms": max(0, int(time.time() * 1000) - start_ms),
-        },
-        "output": output,
-    }
\ No newline at end of file
+    if store is not None:
+        try:
+            blobs = await asyncio.to_thread(store.put, normalized_input, output)
+        except OSError:
+            blobs = None
+        # Firecrawl has no conditional requests, so a stale entry is
+        # revalidated by comparing content hashes after the refetch.
+        revalidated = cached is not None and blobs == cached.blobs
+        output["stats"] = {
+            **output.get("stats", {}),
+            "cache": "revalidated" if revalidated else "miss",
+            "age_sec": 0,
+        }
+
+    return await _success_response(trace_id=trace_id, tool_run_id=tool_run_id, start_ms=start_ms, output=output)
\ No newline at end of file
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class Backpressure(Exception):
+    def __init__(self, reason: str, retry_after_ms: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_ms = retry_after_ms
+
+
+def parse_retry_after(value: str | None, default_ms: int) -> int:
+    # Retry-After is either delta-seconds or an HTTP-date.
+    if not value:
+        return default_ms
+    value = value.strip()
+    try:
+        return max(0, int(float(value) * 1000))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default_ms
+    return max(0, int((when.timestamp() - time.time()) * 1000))
+
+
+class UpstreamGate:
+    # Bounds what this worker sends to Firecrawl, independent of how many
+    # /run calls arrive: at most `max_concurrency` requests in flight, at most
+    # `rate_per_sec` starts per second (token bucket, 0 disables), and nothing
+    # at all while a Retry-After from upstream is pending. A call that would
+    # have to wait longer than `max_wait_ms` is rejected with Backpressure so
+    # the caller can back off instead of queueing here.
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        rate_per_sec: float = 0.0,
+        burst: int | None = None,
+        max_wait_ms: int = 2000,
+        default_retry_after_ms: int = 1000,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_per_sec = rate_per_sec
+        self.burst = float(burst or max(1, int(rate_per_sec)))
+        self.max_wait_ms = max_wait_ms
+        self.default_retry_after_ms = default_retry_after_ms
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self.inflight = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "UpstreamGate":
+        burst = os.getenv("FIRECRAWL_RATE_BURST")
+        return cls(
+            max_concurrency=int(os.getenv("FIRECRAWL_MAX_CONCURRENCY", "4")),
+            rate_per_sec=float(os.getenv("FIRECRAWL_RATE_PER_SEC", "0")),
+            burst=int(burst) if burst else None,
+            max_wait_ms=int(os.getenv("FIRECRAWL_MAX_QUEUE_MS", "2000")),
+            default_retry_after_ms=int(os.getenv("FIRECRAWL_DEFAULT_RETRY_AFTER_MS", "1000")),
+        )
+
+    def defer(self, retry_after_ms: int) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after_ms / 1000)
+
+    def _rate_wait(self, now: float) -> float:
+        if self.rate_per_sec <= 0:
+            return 0.0
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_sec)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_sec
+
+    def _refund(self) -> None:
+        if self.rate_per_sec > 0:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def _reject(self, reason: str, wait_sec: float) -> Backpressure:
+        self.rejected += 1
+        return Backpressure(reason, max(1, int(wait_sec * 1000)))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while True:
+            now = time.monotonic()
+            blocked = self._blocked_until - now
+            if blocked > 0:
+                if now + blocked > deadline:
+                    raise self._reject("upstream_retry_after", blocked)
+                await asyncio.sleep(blocked)
+                continue
+            rate_wait = self._rate_wait(now)
+            if rate_wait > 0:
+                if now + rate_wait > deadline:
+                    raise self._reject("rate_limit", rate_wait)
+                await asyncio.sleep(rate_wait)
+                continue
+            break
+        if self.rate_per_sec > 0:
+            self._tokens -= 1
+
+        if self._semaphore.locked():
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.001, deadline - time.monotonic()))
+            except BaseException as exc:
+                # The call never reached upstream, so its rate token is given back.
+                self._refund()
+                if isinstance(exc, asyncio.TimeoutError):
+                    # No better hint than the default: slots free up as calls finish.
+                    raise self._reject("worker_busy", self.default_retry_after_ms / 1000) from None
+                raise
+        else:
+            await self._semaphore.acquire()
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict[str, float | int]:
+        return {
+            "inflight": self.inflight,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_sec": self.rate_per_sec,
+            "blocked_ms": max(0, int((self._blocked_until - time.monotonic()) * 1000)),
+            "rejected": self.rejected,
+        }
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import contextlib
+import json
 import os
 from typing import Any
 
 import httpx
 
+from ax_common.offload import run_cpu
+
+from .backpressure import Backpressure, UpstreamGate, parse_retry_after
+from .output_controls import OutputBuilder, OutputControls
+from .postprocess import Page, PostProcessConfig, PostProcessError, PostProcessor
+from .urls import canonicalize_url
+
 
 class FirecrawlClientError(Exception):
     def __init__(self, code: str, message: str, retryable: bool, details: dict[str, Any] | None = None):
@@ -16,9 +25,23 @@ class FirecrawlClientError(Exception):
 
 
 class FirecrawlClient:
-    def __init__(self) -> None:
+    def __init__(self, http_client: httpx.AsyncClient | None = None, gate: UpstreamGate | None = None) -> None:
         self.base_url = os.getenv("FIRECRAWL_BASE_URL", "https://api.firecrawl.dev").rstrip("/")
         self.api_key = os.getenv("FIRECRAWL_API_KEY", "")
+        self.http_client = http_client
+        self.gate = gate
+
+    async def probe(self) -> str:
+        # Opens (and pools) the TLS connection; any non-5xx answer means the
+        # upstream is reachable.
+        response = await self.http_client.get(f"{self.base_url}/", timeout=5.0)
+        if response.status_code >= 500:
+            raise FirecrawlClientError(
+                code="UPSTREAM_ERROR",
+                message=f"Firecrawl probe returned {response.status_code}",
+                retryable=True,
+            )
+        return f"HTTP {response.status_code}"
 
     async def run(self, payload: dict[str, Any]) -> dict[str, Any]:
         if not self.api_key:
@@ -36,10 +59,15 @@ class FirecrawlClient:
                 retryable=False,
             )
 
+        try:
+            postprocess = PostProcessConfig.from_input(payload.get("postprocess"))
+        except PostProcessError as exc:
+            raise FirecrawlClientError(code="VALIDATION_ERROR", message=str(exc), retryable=False) from exc
+
         endpoint = f"/v1/{mode}"
         url = f"{self.base_url}{endpoint}"
 
-        request_body: dict[str, Any] = {"url": payload["url"]}
+        request_body: dict[str, Any] = {"url": canonicalize_url(payload["url"])}
         # Firecrawl scrape endpoint can reject crawl-only params.
         if mode == "crawl" and payload.get("max_pages") is not None:
             request_body["maxPages"] = payload["max_pages"]
@@ -52,8 +80,14 @@ class FirecrawlClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=request_body, headers=headers)
+            async with self.gate.slot() if self.gate is not None else contextlib.nullcontext():
+                if self.http_client is None:
+                    async with httpx.AsyncClient(timeout=30.0) as client:
+                        response = await client.post(url, json=request_body, headers=headers)
+                else:
+                    response = await self.http_client.post(url, json=request_body, headers=headers, timeout=30.0)
+        except Backpressure as exc:
+            raise _rate_limited(exc.reason, exc.retry_after_ms) from exc
         except httpx.TimeoutException as exc:
             raise FirecrawlClientError(
                 code="TIMEOUT",
@@ -74,6 +108,14 @@ class FirecrawlClient:
             except Exception:
                 details = {"body": response.text}
             status_code = response.status_code
+            retry_after = response.headers.get("Retry-After") if status_code in (429, 503) else None
+            if status_code == 429 or retry_after is not None:
+                default_ms = self.gate.default_retry_after_ms if self.gate is not None else 1000
+                retry_after_ms = parse_retry_after(retry_after, default_ms)
+                if self.gate is not None:
+                    # Hold every later call on this worker until upstream is ready.
+                    self.gate.defer(retry_after_ms)
+                raise _rate_limited(f"upstream_{status_code}", retry_after_ms, upstream=details)
             if status_code == 401:
                 retryable = True
             elif 400 <= status_code < 500:
@@ -88,7 +130,15 @@ class FirecrawlClient:
             )
 
         try:
-            data = response.json()
+            return await run_cpu(
+                len(response.content),
+                _parse_output,
+                response.content,
+                mode,
+                payload["url"],
+                payload.get("options"),
+                postprocess,
+            )
         except ValueError as exc:
             raise FirecrawlClientError(
                 code="UPSTREAM_ERROR",
@@ -96,40 +146,63 @@ class FirecrawlClient:
                 retryable=True,
             ) from exc
 
-        items: list[dict[str, Any]] = []
-        source_url = payload["url"]
-        pages = 0
-
-        if isinstance(data, dict):
-            if "url" in data and isinstance(data["url"], str):
-                source_url = data["url"]
-            if mode == "scrape":
-                # Firecrawl scrape responses commonly return content under data.markdown.
-                scrape_payload = data.get("data") if isinstance(data.get("data"), dict) else data
-                item = {
-                    "url": source_url,
-                    "title": str(scrape_payload.get("title", "")),
-                    "content": str(scrape_payload.get("markdown") or scrape_payload.get("content") or ""),
-                    "format": "markdown",
-                }
-                items = [item]
-                pages = 1 if item["content"] else 0
-            else:
-                raw_items = data.get("data") if isinstance(data.get("data"), list) else []
-                for raw in raw_items:
-                    if isinstance(raw, dict):
-                        items.append(
-                            {
-                                "url": str(raw.get("url", source_url)),
-                                "title": str(raw.get("title", "")),
-                                "content": str(raw.get("markdown") or raw.get("content") or ""),
-                                "format": "markdown",
-                            }
-                        )
-                pages = len(items)
-
-        return {
-            "source_url": source_url,
-            "items": items,
-            "stats": {"pages": pages},
-        }
+
+def _rate_limited(reason: str, retry_after_ms: int, upstream: dict[str, Any] | None = None) -> FirecrawlClientError:
+    details: dict[str, Any] = {"backpressure": True, "reason": reason, "retry_after_ms": retry_after_ms}
+    if upstream is not None:
+        details["upstream"] = upstream
+    return FirecrawlClientError(
+        code="RATE_LIMITED",
+        message=f"Firecrawl is rate limiting ({reason}); retry after {retry_after_ms} ms",
+        retryable=True,
+        details=details,
+    )
+
+
+def _parse_output(
+    content: bytes,
+    mode: str,
+    source_url: str,
+    options: dict[str, Any] | None = None,
+    postprocess: PostProcessConfig | None = None,
+) -> dict[str, Any]:
+    data = json.loads(content)
+    builder = OutputBuilder(OutputControls.from_options(options))
+    pages = 0
+    raw_pages: list[dict[str, Any]] = []
+
+    if isinstance(data, dict):
+        if "url" in data and isinstance(data["url"], str):
+            source_url = data["url"]
+        if mode == "scrape":
+            # Firecrawl scrape responses commonly return content under data.markdown.
+            scrape_payload = data.get("data") if isinstance(data.get("data"), dict) else data
+            raw_content = scrape_payload.get("markdown") or scrape_payload.get("content") or ""
+            raw_pages = [{"url": source_url, "title": scrape_payload.get("title", ""), "markdown": raw_content}]
+            pages = 1 if raw_content else 0
+        else:
+            raw_items = data.get("data") if isinstance(data.get("data"), list) else []
+            raw_pages = [raw for raw in raw_items if isinstance(raw, dict)]
+            pages = len(raw_pages)
+
+    if postprocess is None:
+        for raw in raw_pages:
+            builder.add(
+                str(raw.get("url", source_url)),
+                lambda raw=raw: str(raw.get("title", "")),
+                lambda raw=raw: str(raw.get("markdown") or raw.get("content") or ""),
+            )
+        return builder.output(source_url, pages)
+
+    processor = PostProcessor(postprocess)
+    stream = (
+        Page(
+            url=str(raw.get("url", source_url)),
+            title=str(raw.get("title", "")),
+            content=str(raw.get("markdown") or raw.get("content") or ""),
+        )
+        for raw in raw_pages
+    )
+    for page, extra in processor.process(stream):
+        builder.add(page.url, lambda page=page: page.title, lambda page=page: page.content, extra)
+    return builder.output(source_url, pages, {"postprocess": processor.stats()})
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+TRUNCATION_MARKER = "\n\n[truncated]"
+_MARKER_BYTES = len(TRUNCATION_MARKER.encode("utf-8"))
+
+
+@dataclass(frozen=True)
+class OutputControls:
+    fields: tuple[str, ...] | None = None
+    max_items: int | None = None
+    max_item_bytes: int | None = None
+    max_total_bytes: int | None = None
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any] | None) -> "OutputControls":
+        options = options or {}
+        fields = options.get("fields")
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        return cls(
+            fields=tuple(fields) if fields else None,
+            max_items=options.get("max_items"),
+            max_item_bytes=options.get("max_item_bytes"),
+            max_total_bytes=options.get("max_total_bytes"),
+        )
+
+    def keeps(self, name: str) -> bool:
+        if self.fields is None:
+            return True
+        return any(f == name or f.startswith(f"{name}.") for f in self.fields)
+
+    def item_fields(self) -> frozenset[str] | None:
+        # None means whole items: no fields given, or a bare "items".
+        if self.fields is None or "items" in self.fields:
+            return None
+        return frozenset(f.split(".", 1)[1] for f in self.fields if f.startswith("items."))
+
+
+def _truncate(content: str, limit: int) -> tuple[str, int | None]:
+    # UTF-8 is at most 4 bytes per char, so short strings skip the encode.
+    if len(content) * 4 <= limit:
+        return content, None
+    encoded = content.encode("utf-8")
+    if len(encoded) <= limit:
+        return content, None
+    # The marker counts against the limit; below its size the cut is bare.
+    marker = TRUNCATION_MARKER if limit >= _MARKER_BYTES else ""
+    keep = limit - len(marker.encode("utf-8"))
+    return encoded[:keep].decode("utf-8", "ignore") + marker, len(encoded)
+
+
+class OutputBuilder:
+    def __init__(self, controls: OutputControls) -> None:
+        self.controls = controls
+        self.items: list[dict[str, Any]] = []
+        self._item_fields = controls.item_fields()
+        self._want_items = controls.keeps("items")
+        self._content_bytes = 0
+        self.omitted = 0
+        self.truncated = False
+
+    def _wants(self, name: str) -> bool:
+        return self._item_fields is None or name in self._item_fields
+
+    def _budget_left(self) -> int | None:
+        if self.controls.max_total_bytes is None:
+            return None
+        return self.controls.max_total_bytes - self._content_bytes
+
+    @property
+    def full(self) -> bool:
+        budget = self._budget_left()
+        return (
+            not self._want_items
+            or (self.controls.max_items is not None and len(self.items) >= self.controls.max_items)
+            or (budget is not None and budget <= 0)
+        )
+
+    def add(
+        self,
+        url: str,
+        title: Callable[[], str],
+        content: Callable[[], str],
+        extra: dict[str, Any] | None = None,
+    ) -> None:
+        # Values are passed as callables so unselected fields are never built.
+        if self.full:
+            self.omitted += 1
+            return
+        budget = self._budget_left()
+
+        item: dict[str, Any] = {}
+        if self._wants("url"):
+            item["url"] = url
+        if self._wants("title"):
+            item["title"] = title()
+        if self._wants("content"):
+            text = content()
+            limits = [v for v in (self.controls.max_item_bytes, budget) if v is not None]
+            original_bytes = None
+            if limits:
+                text, original_bytes = _truncate(text, min(limits))
+            if original_bytes is not None:
+                item["truncated"] = True
+                item["content_bytes"] = original_bytes
+                self.truncated = True
+            item["content"] = text
+            if budget is not None:
+                self._content_bytes += len(text.encode("utf-8"))
+        if self._wants("format"):
+            item["format"] = "markdown"
+        for name, value in (extra or {}).items():
+            if self._wants(name):
+                item[name] = value
+        self.items.append(item)
+
+    def output(self, source_url: str, pages: int, extra_stats: dict[str, Any] | None = None) -> dict[str, Any]:
+        stats: dict[str, Any] = {"pages": pages, **(extra_stats or {})}
+        if self.omitted or self.truncated:
+            stats["truncated"] = True
+            stats["omitted_items"] = self.omitted
+        output = {"source_url": source_url, "items": self.items, "stats": stats}
+        if self.controls.fields is None:
+            return output
+        return {key: value for key, value in output.items() if self.controls.keeps(key)}
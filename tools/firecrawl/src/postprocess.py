@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+# Near-duplicates: one-permutation MinHash over 4-word shingles. Each page is
+# reduced to SKETCH_BINS minimum hashes (one per hash bin); pages whose
+# sketches agree on enough bins are near-duplicates. Banded LSH keeps the
+# lookup close to O(1) per page instead of comparing against every page.
+SHINGLE_WORDS = 4
+SKETCH_BINS = 32
+BAND_BINS = 4
+
+# Boilerplate: a paragraph block is dropped once it has been seen on at least
+# BOILERPLATE_MIN_PAGES pages and on at least BOILERPLATE_RATIO of the pages
+# seen so far. The first WARMUP_PAGES pages are held back until the counts are
+# meaningful, so nav and footer blocks are stripped from them too.
+BOILERPLATE_MIN_PAGES = 3
+BOILERPLATE_RATIO = 0.5
+WARMUP_PAGES = 8
+MAX_TRACKED_BLOCKS = 200_000
+
+
+class PostProcessError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class PostProcessConfig:
+    dedup: bool = False
+    dedup_threshold: float = 0.9
+    strip_boilerplate: bool = False
+    chunk_bytes: int | None = None
+
+    @classmethod
+    def from_input(cls, value: Any) -> "PostProcessConfig | None":
+        if value is None:
+            return None
+        if not isinstance(value, dict):
+            raise PostProcessError("input.postprocess must be an object")
+        threshold = value.get("dedup_threshold", 0.9)
+        chunk_bytes = value.get("chunk_bytes")
+        if not isinstance(threshold, (int, float)) or not 0 < threshold <= 1:
+            raise PostProcessError("postprocess.dedup_threshold must be in (0, 1]")
+        if chunk_bytes is not None and (not isinstance(chunk_bytes, int) or chunk_bytes < 256):
+            raise PostProcessError("postprocess.chunk_bytes must be an integer >= 256")
+        config = cls(
+            dedup=bool(value.get("dedup", False)),
+            dedup_threshold=float(threshold),
+            strip_boilerplate=bool(value.get("strip_boilerplate", False)),
+            chunk_bytes=chunk_bytes,
+        )
+        return config if config.dedup or config.strip_boilerplate or config.chunk_bytes else None
+
+
+@dataclass
+class Page:
+    url: str
+    title: str
+    content: str
+
+
+def _blocks(content: str) -> list[str]:
+    return [block for block in content.split("\n\n") if block.strip()]
+
+
+def sketch(text: str) -> tuple[int | None, ...]:
+    # hash() is salted per process, which is fine: sketches are only compared
+    # within one crawl. Sorting once lets the first hash seen in each bin be
+    # its minimum, and the scan stops as soon as every bin is filled.
+    words = text.lower().split()
+    if len(words) >= SHINGLE_WORDS:
+        shingles: Iterable[Any] = zip(*(words[i:] for i in range(SHINGLE_WORDS)))
+    else:
+        shingles = words
+    bins: list[int | None] = [None] * SKETCH_BINS
+    filled = 0
+    for value in sorted(set(map(hash, shingles))):
+        slot = value % SKETCH_BINS
+        if bins[slot] is None:
+            bins[slot] = value
+            filled += 1
+            if filled == SKETCH_BINS:
+                break
+    return tuple(bins)
+
+
+def similarity(left: tuple[int | None, ...], right: tuple[int | None, ...]) -> float:
+    used = same = 0
+    for a, b in zip(left, right):
+        if a is None and b is None:
+            continue
+        used += 1
+        same += a == b
+    return same / used if used else 1.0
+
+
+class DuplicateIndex:
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        self._sketches: list[tuple[int | None, ...]] = []
+        self._bands: dict[tuple[int, tuple[int | None, ...]], list[int]] = {}
+
+    def _keys(self, signature: tuple[int | None, ...]) -> Iterator[tuple[int, tuple[int | None, ...]]]:
+        for start in range(0, SKETCH_BINS, BAND_BINS):
+            band = signature[start : start + BAND_BINS]
+            if any(value is not None for value in band):
+                yield start, band
+
+    def seen(self, text: str) -> bool:
+        # Returns True for a near-duplicate of an earlier page; otherwise
+        # remembers this page and returns False.
+        signature = sketch(text)
+        keys = list(self._keys(signature))
+        checked: set[int] = set()
+        for key in keys:
+            for index in self._bands.get(key, ()):
+                if index not in checked:
+                    checked.add(index)
+                    if similarity(signature, self._sketches[index]) >= self.threshold:
+                        return True
+        index = len(self._sketches)
+        self._sketches.append(signature)
+        for key in keys:
+            self._bands.setdefault(key, []).append(index)
+        return False
+
+
+class BoilerplateFilter:
+    def __init__(self) -> None:
+        self.pages = 0
+        self.removed = 0
+        self._counts: dict[int, int] = {}
+
+    def observe(self, blocks: list[str]) -> None:
+        self.pages += 1
+        counts = self._counts
+        for key in {hash(block.strip()) for block in blocks}:
+            if key in counts:
+                counts[key] += 1
+            elif len(counts) < MAX_TRACKED_BLOCKS:
+                counts[key] = 1
+
+    def strip(self, blocks: list[str]) -> list[str]:
+        floor = max(BOILERPLATE_MIN_PAGES, BOILERPLATE_RATIO * self.pages)
+        kept = [block for block in blocks if self._counts.get(hash(block.strip()), 0) < floor]
+        self.removed += len(blocks) - len(kept)
+        return kept
+
+
+def _split_oversized(block: str, limit: int) -> Iterator[str]:
+    # Lines first, then hard cuts on a UTF-8 boundary for a single huge line.
+    pending = ""
+    for line in block.split("\n"):
+        candidate = f"{pending}\n{line}" if pending else line
+        if len(candidate.encode("utf-8")) <= limit:
+            pending = candidate
+            continue
+        if pending:
+            yield pending
+        encoded = line.encode("utf-8")
+        while len(encoded) > limit:
+            cut = encoded[:limit].decode("utf-8", "ignore")
+            yield cut
+            encoded = encoded[len(cut.encode("utf-8")) :]
+        pending = encoded.decode("utf-8")
+    if pending:
+        yield pending
+
+
+def chunk_blocks(blocks: list[str], limit: int) -> Iterator[str]:
+    # Packs whole paragraph blocks into chunks of at most `limit` UTF-8 bytes.
+    current: list[str] = []
+    size = 0
+    for block in blocks:
+        block_bytes = len(block.encode("utf-8"))
+        if block_bytes > limit:
+            if current:
+                yield "\n\n".join(current)
+                current, size = [], 0
+            yield from _split_oversized(block, limit)
+            continue
+        added = block_bytes + (2 if current else 0)
+        if current and size + added > limit:
+            yield "\n\n".join(current)
+            current, size = [], 0
+            added = block_bytes
+        current.append(block)
+        size += added
+    if current:
+        yield "\n\n".join(current)
+
+
+class PostProcessor:
+    # Pages go through one at a time: boilerplate is stripped first so the
+    # shared nav and footer do not make unrelated pages look alike, then
+    # duplicates are dropped, then what is left is chunked. Memory grows with
+    # the number of distinct pages (one sketch each) and tracked blocks, not
+    # with page content.
+    def __init__(self, config: PostProcessConfig) -> None:
+        self.config = config
+        self.duplicates = DuplicateIndex(config.dedup_threshold) if config.dedup else None
+        self.boilerplate = BoilerplateFilter() if config.strip_boilerplate else None
+        self.duplicate_pages = 0
+        self.chunks = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _emit(self, page: Page, blocks: list[str]) -> Iterator[tuple[Page, dict[str, Any]]]:
+        if self.boilerplate is not None:
+            blocks = self.boilerplate.strip(blocks)
+        content = "\n\n".join(blocks)
+        if self.duplicates is not None and self.duplicates.seen(content):
+            self.duplicate_pages += 1
+            return
+        if self.config.chunk_bytes is None:
+            self.bytes_out += len(content.encode("utf-8"))
+            yield Page(page.url, page.title, content), {}
+            return
+        chunks = list(chunk_blocks(blocks, self.config.chunk_bytes)) or [""]
+        self.chunks += len(chunks)
+        for index, chunk in enumerate(chunks):
+            self.bytes_out += len(chunk.encode("utf-8"))
+            yield Page(page.url, page.title, chunk), {"chunk": index, "chunks": len(chunks)}
+
+    def process(self, pages: Iterable[Page]) -> Iterator[tuple[Page, dict[str, Any]]]:
+        held: deque[tuple[Page, list[str]]] = deque()
+        for page in pages:
+            self.bytes_in += len(page.content.encode("utf-8"))
+            blocks = _blocks(page.content)
+            if self.boilerplate is not None:
+                self.boilerplate.observe(blocks)
+                if self.boilerplate.pages <= WARMUP_PAGES:
+                    held.append((page, blocks))
+                    continue
+                while held:
+                    yield from self._emit(*held.popleft())
+            yield from self._emit(page, blocks)
+        while held:
+            yield from self._emit(*held.popleft())
+
+    def stats(self) -> dict[str, int]:
+        stats = {"bytes_in": self.bytes_in, "bytes_out": self.bytes_out}
+        if self.duplicates is not None:
+            stats["duplicates"] = self.duplicate_pages
+        if self.boilerplate is not None:
+            stats["boilerplate_blocks"] = self.boilerplate.removed
+        if self.config.chunk_bytes is not None:
+            stats["chunks"] = self.chunks
+        return stats
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import contextlib
+import copy
+import hashlib
+import json
+import mmap
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from .urls import canonicalize_url
+
+
+def _parse_domain_ttls(raw: str) -> dict[str, int]:
+    ttls: dict[str, int] = {}
+    for entry in raw.split(","):
+        domain, sep, ttl = entry.partition("=")
+        if sep and domain.strip() and ttl.strip().isdigit():
+            ttls[domain.strip().lower()] = int(ttl.strip())
+    return ttls
+
+
+@dataclass
+class StoredResult:
+    output: dict[str, Any]
+    stored_at: float
+    fresh: bool
+    blobs: list[str] = field(default_factory=list)
+
+    @property
+    def age_sec(self) -> int:
+        return max(0, int(time.time() - self.stored_at))
+
+
+# Page bodies are written once under the sha256 of their content and shared
+# between entries; an index entry only keeps the output skeleton and blob refs.
+class PageStore:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        default_ttl_sec: int = 3600,
+        domain_ttls: dict[str, int] | None = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        mmap_min_bytes: int = 64 * 1024,
+        orphan_grace_sec: float = 60.0,
+    ) -> None:
+        self.root = Path(root)
+        self.default_ttl_sec = default_ttl_sec
+        self.domain_ttls = domain_ttls or {}
+        self.max_bytes = max_bytes
+        self.mmap_min_bytes = mmap_min_bytes
+        self.orphan_grace_sec = orphan_grace_sec
+        self._index_dir = self.root / "index"
+        self._blob_dir = self.root / "blobs"
+        self._index_dir.mkdir(parents=True, exist_ok=True)
+        self._blob_dir.mkdir(parents=True, exist_ok=True)
+        # Leftover .tmp files are partial writes, not stored blobs.
+        self._bytes = sum(p.stat().st_size for p in self._blob_dir.glob("*/*") if p.suffix != ".tmp")
+
+    @classmethod
+    def from_env(cls) -> "PageStore | None":
+        root = os.getenv("FIRECRAWL_STORE_DIR", "")
+        if not root:
+            return None
+        return cls(
+            root,
+            default_ttl_sec=int(os.getenv("FIRECRAWL_STORE_TTL_SEC", "3600")),
+            domain_ttls=_parse_domain_ttls(os.getenv("FIRECRAWL_STORE_DOMAIN_TTLS", "")),
+            max_bytes=int(os.getenv("FIRECRAWL_STORE_MAX_BYTES", str(512 * 1024 * 1024))),
+        )
+
+    def key_for(self, payload: dict[str, Any]) -> str:
+        key = {
+            "url": canonicalize_url(payload["url"]),
+            "mode": payload.get("mode", "scrape"),
+            "formats": sorted(payload.get("formats") or []),
+            "max_pages": payload.get("max_pages"),
+            "options": payload.get("options"),
+            "postprocess": payload.get("postprocess"),
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> int:
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            if host in self.domain_ttls:
+                return self.domain_ttls[host]
+            _, _, host = host.partition(".")
+        return self.default_ttl_sec
+
+    def get(self, payload: dict[str, Any]) -> StoredResult | None:
+        index_path = self._index_dir / f"{self.key_for(payload)}.json"
+        try:
+            entry = json.loads(index_path.read_text(encoding="utf-8"))
+            output = entry["output"]
+            for item in output.get("items", []):
+                if "content_blob" in item:
+                    item["content"] = self._read_blob(item.pop("content_blob"))
+        except (OSError, ValueError, KeyError):
+            return None
+        # Index mtime doubles as last-access time for eviction. An entry
+        # evicted since it was read is still returned.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(index_path)
+        stored_at = float(entry["stored_at"])
+        return StoredResult(
+            output=output,
+            stored_at=stored_at,
+            fresh=time.time() - stored_at < self.ttl_for(payload["url"]),
+            blobs=list(entry.get("blobs", [])),
+        )
+
+    def put(self, payload: dict[str, Any], output: dict[str, Any]) -> list[str]:
+        if self.ttl_for(payload["url"]) <= 0:
+            return []
+        skeleton = copy.copy(output)
+        skeleton["items"] = []
+        if "items" not in output:
+            skeleton.pop("items")
+        blobs: list[str] = []
+        for item in output.get("items", []):
+            stored_item = dict(item)
+            if "content" in stored_item:
+                digest = self._write_blob(str(stored_item.pop("content")).encode("utf-8"))
+                stored_item["content_blob"] = digest
+                blobs.append(digest)
+            skeleton["items"].append(stored_item)
+        entry = {"url": payload["url"], "stored_at": time.time(), "blobs": blobs, "output": skeleton}
+        index_path = self._index_dir / f"{self.key_for(payload)}.json"
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+        tmp_path.replace(index_path)
+        if self._bytes > self.max_bytes:
+            self.evict()
+        return blobs
+
+    def evict(self) -> None:
+        entries = sorted(self._index_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        referenced: dict[str, int] = {}
+        blob_lists: dict[Path, list[str]] = {}
+        for path in entries:
+            try:
+                blob_lists[path] = json.loads(path.read_text(encoding="utf-8")).get("blobs", [])
+            except (OSError, ValueError):
+                blob_lists[path] = []
+            for digest in blob_lists[path]:
+                referenced[digest] = referenced.get(digest, 0) + 1
+
+        # A refetch with changed content replaces its index entry and leaves
+        # the old blobs behind; collect those before evicting live entries.
+        # Recent blobs are kept, since a put may not have written its index yet.
+        cutoff = time.time() - self.orphan_grace_sec
+        for blob_path in self._blob_dir.glob("*/*"):
+            if blob_path.suffix == ".tmp" or blob_path.name in referenced:
+                continue
+            try:
+                stat = blob_path.stat()
+                if stat.st_mtime <= cutoff:
+                    blob_path.unlink()
+                    self._bytes -= stat.st_size
+            except OSError:
+                pass
+
+        # Drop least recently used entries until the unreferenced blobs bring
+        # the store back under three quarters of the cap.
+        target = self.max_bytes * 3 // 4
+        for path in entries:
+            if self._bytes <= target:
+                break
+            path.unlink(missing_ok=True)
+            for digest in blob_lists[path]:
+                referenced[digest] -= 1
+                if referenced[digest] == 0:
+                    blob_path = self._blob_path(digest)
+                    try:
+                        self._bytes -= blob_path.stat().st_size
+                        blob_path.unlink()
+                    except OSError:
+                        pass
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._blob_dir / digest[:2] / digest
+
+    def _write_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        try:
+            # A reused blob counts as new for the orphan sweep until the
+            # index that refers to it is written.
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        self._bytes += len(data)
+        return digest
+
+    def _read_blob(self, digest: str) -> str:
+        path = self._blob_path(digest)
+        with path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.mmap_min_bytes:
+                return f.read().decode("utf-8")
+            # Decode straight from the mapping to skip an intermediate bytes copy.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+DEFAULT_TRACKING_PARAMS = "utm_*,gclid,dclid,fbclid,msclkid,yclid,mc_cid,mc_eid,_ga,_gl,igshid,ref_src"
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@lru_cache(maxsize=8)
+def _tracking_rules(raw: str) -> tuple[frozenset[str], tuple[str, ...]]:
+    # Entries ending in "*" match by prefix, everything else by exact name.
+    names = [entry.strip().lower() for entry in raw.split(",") if entry.strip()]
+    exact = frozenset(name for name in names if not name.endswith("*"))
+    prefixes = tuple(name[:-1] for name in names if name.endswith("*"))
+    return exact, prefixes
+
+
+def tracking_params() -> str:
+    return os.getenv("FIRECRAWL_TRACKING_PARAMS", DEFAULT_TRACKING_PARAMS)
+
+
+def canonicalize_url(url: str, tracking: str | None = None) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or "").rstrip(".")
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username if parts.password is None else f"{parts.username}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+
+    query = parts.query
+    if query:
+        exact, prefixes = _tracking_rules(tracking if tracking is not None else tracking_params())
+        # Pairs are sorted as written so their percent-encoding is left alone.
+        kept = []
+        for pair in query.split("&"):
+            if not pair:
+                continue
+            key = unquote_plus(pair.partition("=")[0]).lower()
+            if key not in exact and not key.startswith(prefixes):
+                kept.append(pair)
+        kept.sort()
+        query = "&".join(kept)
+
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))